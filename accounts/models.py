@@ -44,6 +44,7 @@ class User(AbstractBaseUser, PermissionsMixin):
     
     # Profile fields
     avatar = models.ImageField(upload_to='avatars/', null=True, blank=True)
+    avatar_variants = models.JSONField(default=dict, blank=True, editable=False)  # see core.images
     bio = models.TextField(_('bio'), blank=True)
     date_of_birth = models.DateField(null=True, blank=True)
     address = models.TextField(_('address'), blank=True)
@@ -54,6 +55,7 @@ class User(AbstractBaseUser, PermissionsMixin):
     # Location for mapping
     latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
     longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    geohash = models.CharField(max_length=12, blank=True, db_index=True, editable=False)
     
     # Status fields
     is_active = models.BooleanField(_('active'), default=False)
@@ -94,6 +96,20 @@ class User(AbstractBaseUser, PermissionsMixin):
     def __str__(self):
         return self.get_full_name() or self.email
     
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or {'latitude', 'longitude'} & set(update_fields):
+            self.geohash = self.compute_geohash()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'geohash'}
+        super().save(*args, **kwargs)
+    
+    def compute_geohash(self):
+        if self.latitude is None or self.longitude is None:
+            return ''
+        from apps.core.geo import encode
+        return encode(self.latitude, self.longitude)
+    
     def get_full_name(self):
         return f"{self.first_name} {self.last_name}".strip()
     
@@ -0,0 +1,74 @@
+# apps/api/auth.py
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import ApiKey, hash_key
+
+CLIENT_CACHE_TIMEOUT = getattr(settings, 'API_CLIENT_CACHE_TIMEOUT', 60)
+DEFAULT_RATE_PER_MINUTE = getattr(settings, 'API_DEFAULT_RATE_PER_MINUTE', 600)
+DEFAULT_BURST = getattr(settings, 'API_DEFAULT_BURST', 100)
+
+
+@dataclass(frozen=True)
+class ApiClient:
+    key_id: str
+    business_id: str
+    has_api_access: bool
+    rate_per_minute: int
+    burst: int
+
+
+def _client_cache_key(key_hash):
+    return f'api:client:{key_hash}'
+
+
+def invalidate_client(key_hash):
+    cache.delete(_client_cache_key(key_hash))
+
+
+def plan_limits(features):
+    """Rate limits from ``Plan.features``, falling back to the settings."""
+    features = features or {}
+    return (
+        int(features.get('api_rate_per_minute', DEFAULT_RATE_PER_MINUTE)),
+        int(features.get('api_burst', DEFAULT_BURST)),
+    )
+
+
+def load_client(key_hash):
+    from apps.subscriptions.models import Subscription
+    
+    key = ApiKey.objects.filter(key_hash=key_hash, is_active=True).values('pk', 'business_id').first()
+    if key is None:
+        return None
+    # Expired trials whose status was never flipped don't count as active
+    subscription = (
+        Subscription.objects.filter(business_id=key['business_id'], **Subscription.active_lookups())
+        .values('plan__has_api_access', 'plan__features')
+        .first()
+    )
+    has_access = bool(subscription and subscription['plan__has_api_access'])
+    rate, burst = plan_limits(subscription['plan__features'] if subscription else None)
+    return ApiClient(str(key['pk']), str(key['business_id']), has_access, rate, burst)
+
+
+def authenticate(request):
+    """
+    Resolve the ``Authorization: Bearer <key>`` header to an ``ApiClient``.
+    The key, business and plan limits are cached, so an authenticated
+    request costs one cache read.
+    """
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    scheme, _, raw_key = header.partition(' ')
+    if scheme.lower() != 'bearer' or not raw_key:
+        return None
+    
+    key_hash = hash_key(raw_key.strip())
+    cache_key = _client_cache_key(key_hash)
+    client = cache.get(cache_key)
+    if client is None:
+        client = load_client(key_hash) or False  # cache misses too
+        cache.set(cache_key, client, CLIENT_CACHE_TIMEOUT)
+    return client or None
@@ -0,0 +1,67 @@
+# apps/api/http.py
+import hashlib
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from uuid import UUID
+
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _json_default(obj):
+    # Money stays exact on the wire: decimals are sent as strings
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, (date, datetime, time)):
+        return obj.isoformat()
+    if isinstance(obj, UUID):
+        return str(obj)
+    raise TypeError(f'{type(obj).__name__} is not JSON serializable')
+
+
+def dumps(payload):
+    if orjson is not None:
+        # orjson handles UUIDs and datetimes natively
+        return orjson.dumps(payload, default=_json_default)
+    return json.dumps(payload, default=_json_default, separators=(',', ':')).encode()
+
+
+def etag_for(body):
+    return 'W/"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def json_response(request, payload, status=200, cache_control='private, max-age=0, must-revalidate'):
+    """
+    Serialize ``payload`` and tag it with a weak ETag. A matching
+    ``If-None-Match`` gets an empty 304, so polling clients only pay for
+    the query, not the transfer.
+    """
+    body = dumps(payload)
+    etag = etag_for(body)
+    
+    if status == 200 and request.method in ('GET', 'HEAD'):
+        candidates = [tag.strip() for tag in request.META.get('HTTP_IF_NONE_MATCH', '').split(',')]
+        if etag in candidates or '*' in candidates:
+            response = HttpResponseNotModified()
+            response['ETag'] = etag
+            response['Cache-Control'] = cache_control
+            patch_vary_headers(response, ['Authorization'])
+            return response
+    
+    response = HttpResponse(body, status=status, content_type='application/json')
+    response['ETag'] = etag
+    response['Cache-Control'] = cache_control
+    patch_vary_headers(response, ['Authorization'])
+    return response
+
+
+def error_response(status, message, **extra):
+    response = HttpResponse(dumps({'error': message, **extra}), status=status, content_type='application/json')
+    response['Cache-Control'] = 'no-store'
+    return response
@@ -0,0 +1,82 @@
+# apps/api/management/commands/api_load_test.py
+import asyncio
+import threading
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from apps.api.ratelimit import TokenBucket
+from apps.core.loadtest import run_load
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure rate-limiter accuracy against the configured cache, and optionally '
+        'API throughput over HTTP with a real key (--url, --key)'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--rate', type=float, default=600, help='Tokens per minute')
+        parser.add_argument('--burst', type=int, default=100)
+        parser.add_argument('--threads', type=int, default=32)
+        parser.add_argument('--duration', type=float, default=10.0)
+        parser.add_argument('--url', help='API endpoint, e.g. http://127.0.0.1:8000/api/v1/services/')
+        parser.add_argument('--key', help='API key for --url')
+        parser.add_argument('--concurrency', type=int, default=100)
+    
+    def handle(self, *args, **options):
+        self.limiter_accuracy(options)
+        if options['url']:
+            self.http_throughput(options)
+    
+    def expected(self, rate_per_minute, burst, elapsed):
+        return burst + rate_per_minute / 60 * elapsed
+    
+    def limiter_accuracy(self, options):
+        bucket = TokenBucket(options['rate'] / 60, options['burst'])
+        key = f'api:rl:loadtest:{time.time_ns()}'
+        counts = {'allowed': 0, 'denied': 0}
+        lock = threading.Lock()
+        deadline = time.perf_counter() + options['duration']
+        
+        def hammer():
+            allowed = denied = 0
+            while time.perf_counter() < deadline:
+                if bucket.consume(key)[0]:
+                    allowed += 1
+                else:
+                    denied += 1
+            with lock:
+                counts['allowed'] += allowed
+                counts['denied'] += denied
+        
+        started = time.perf_counter()
+        threads = [threading.Thread(target=hammer) for _ in range(options['threads'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        
+        expected = self.expected(options['rate'], options['burst'], elapsed)
+        total = counts['allowed'] + counts['denied']
+        self.stdout.write(
+            f"limiter ({type(cache).__name__}): {total / elapsed:,.0f} checks/s over {options['threads']} threads, "
+            f"allowed {counts['allowed']} vs expected {expected:.0f} "
+            f"({(counts['allowed'] - expected) / expected:+.1%})"
+        )
+    
+    def http_throughput(self, options):
+        headers = [f"Authorization: Bearer {options['key']}"] if options['key'] else []
+        result = asyncio.run(run_load(options['url'], options['concurrency'], options['duration'], headers))
+        served = result['statuses'].get(200, 0)
+        expected = self.expected(options['rate'], options['burst'], options['duration'])
+        self.stdout.write(
+            f"http: {result['requests_per_second']:,.1f} req/s  p50 {result['p50_ms']} ms  "
+            f"p95 {result['p95_ms']} ms  statuses {result['statuses']}  errors {result['errors']}"
+        )
+        self.stdout.write(
+            f"served {served} vs expected {expected:.0f} for a fresh bucket "
+            f"(--rate/--burst should match the key's plan)"
+        )
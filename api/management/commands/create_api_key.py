@@ -0,0 +1,29 @@
+# apps/api/management/commands/create_api_key.py
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.api.models import ApiKey
+
+
+class Command(BaseCommand):
+    help = 'Issue (or revoke) a public API key for a business'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('business_id', nargs='?')
+        parser.add_argument('--name', default='default')
+        parser.add_argument('--revoke', metavar='PREFIX', help='Revoke the active key with this prefix')
+    
+    def handle(self, *args, **options):
+        if options['revoke']:
+            keys = ApiKey.objects.filter(prefix=options['revoke'], is_active=True)
+            if not keys:
+                raise CommandError(f"No active key with prefix {options['revoke']}.")
+            for key in keys:
+                key.revoke()
+            self.stdout.write(f'Revoked {len(keys)} key(s).')
+            return
+        
+        if not options['business_id']:
+            raise CommandError('business_id is required.')
+        api_key, raw_key = ApiKey.issue(options['business_id'], options['name'])
+        self.stdout.write(f'Key {api_key.prefix}... issued; it will not be shown again:')
+        self.stdout.write(raw_key)
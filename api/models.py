@@ -0,0 +1,56 @@
+# apps/api/models.py
+import hashlib
+import secrets
+import uuid
+
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+KEY_PREFIX = 'bp_'
+
+
+def hash_key(raw_key):
+    return hashlib.sha256(raw_key.encode()).hexdigest()
+
+
+class ApiKey(models.Model):
+    # Only the hash is stored; the raw key is shown once, at creation
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    business = models.ForeignKey('businesses.Business', on_delete=models.CASCADE, related_name='api_keys')
+    
+    name = models.CharField(_('name'), max_length=100)
+    prefix = models.CharField(max_length=12, editable=False)
+    key_hash = models.CharField(max_length=64, unique=True, editable=False)
+    is_active = models.BooleanField(default=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    revoked_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        verbose_name = _('API Key')
+        verbose_name_plural = _('API Keys')
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.name} ({self.prefix}...)"
+    
+    @classmethod
+    def issue(cls, business_id, name):
+        """Create a key and return ``(api_key, raw_key)``."""
+        raw_key = KEY_PREFIX + secrets.token_urlsafe(32)
+        api_key = cls.objects.create(
+            business_id=business_id,
+            name=name,
+            prefix=raw_key[:len(KEY_PREFIX) + 6],
+            key_hash=hash_key(raw_key),
+        )
+        return api_key, raw_key
+    
+    def revoke(self):
+        from django.utils import timezone
+        from .auth import invalidate_client
+        
+        self.is_active = False
+        self.revoked_at = timezone.now()
+        self.save(update_fields=['is_active', 'revoked_at'])
+        invalidate_client(self.key_hash)
@@ -0,0 +1,84 @@
+# apps/api/pagination.py
+import base64
+import json
+from datetime import date, datetime, time
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils.dateparse import parse_date, parse_datetime, parse_time
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _encode_value(value):
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps([_encode_value(value) for value in values]).encode()).decode()
+
+
+def decode_cursor(cursor, fields, model):
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise InvalidCursor('Malformed cursor.')
+    if not isinstance(raw, list) or len(raw) != len(fields):
+        raise InvalidCursor('Malformed cursor.')
+    
+    values = []
+    for field_name, value in zip(fields, raw):
+        # encode_cursor only writes strings; anything else was tampered with
+        if not isinstance(value, str):
+            raise InvalidCursor('Malformed cursor.')
+        field = model._meta.get_field(field_name)
+        parser = {'DateTimeField': parse_datetime, 'DateField': parse_date, 'TimeField': parse_time}.get(
+            field.get_internal_type(), field.to_python,
+        )
+        try:
+            parsed = parser(value)
+        except (ValueError, ValidationError):
+            # Impossible dates and times, or e.g. a malformed UUID
+            parsed = None
+        if parsed is None:
+            raise InvalidCursor('Malformed cursor.')
+        values.append(parsed)
+    return values
+
+
+def _after(fields, values):
+    # Lexicographic "row comes after cursor" for ascending fields
+    condition = Q()
+    for index, field in enumerate(fields):
+        step = Q(**{f'{field}__gt': values[index]})
+        for previous, value in zip(fields[:index], values[:index]):
+            step &= Q(**{previous: value})
+        condition |= step
+    return condition
+
+
+def keyset_page(queryset, fields, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    One page of ``queryset`` (``.values()`` rows) ordered by ``fields``,
+    which must end in a unique column. Seeks past the cursor instead of
+    using OFFSET, so every page costs the same however deep it is.
+    Returns ``(rows, next_cursor)``.
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    queryset = queryset.order_by(*fields)
+    if cursor:
+        queryset = queryset.filter(_after(fields, decode_cursor(cursor, fields, queryset.model)))
+    
+    rows = list(queryset[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1][field] for field in fields])
+    return rows, next_cursor
@@ -0,0 +1,83 @@
+# apps/api/ratelimit.py
+import math
+import time
+
+from django.core.cache import cache as default_cache
+from django.core.cache.backends.redis import RedisCache
+
+# Token bucket, refilled continuously at ``rate`` tokens/second up to ``burst``.
+# Runs atomically inside Redis, so concurrent workers share one exact count.
+TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class TokenBucket:
+    """
+    Rate limiter with counters in the cache, never the database.
+    
+    With the Redis cache backend this is an exact token bucket evaluated
+    in one atomic script. Other backends fall back to a fixed window of
+    ``burst / rate`` seconds allowing ``burst`` requests, built on the
+    atomic ``add``/``incr`` every backend provides: same average rate, but
+    up to twice the burst across a window boundary.
+    """
+    
+    _scripts = {}
+    
+    def __init__(self, rate, burst, cache=None):
+        self.rate = float(rate)
+        self.burst = int(burst)
+        self.cache = cache or default_cache
+    
+    def consume(self, key, cost=1, now=None):
+        """Take ``cost`` tokens; returns ``(allowed, remaining, retry_after_seconds)``."""
+        now = time.time() if now is None else now
+        if isinstance(self.cache, RedisCache):
+            return self._consume_redis(key, cost, now)
+        return self._consume_window(key, cost, now)
+    
+    def _consume_redis(self, key, cost, now):
+        redis_key = self.cache.make_and_validate_key(key)
+        client = self.cache._cache.get_client(redis_key, write=True)
+        script = self._scripts.get(id(client))
+        if script is None:
+            script = self._scripts[id(client)] = client.register_script(TOKEN_BUCKET_LUA)
+        allowed, tokens = script(keys=[redis_key], args=[self.rate, self.burst, now, cost])
+        tokens = float(tokens)
+        retry_after = 0 if allowed else (cost - tokens) / self.rate
+        return bool(allowed), int(tokens), retry_after
+    
+    def _consume_window(self, key, cost, now):
+        window = max(1, round(self.burst / self.rate))
+        slot = int(now // window)
+        slot_key = f'{key}:{slot}'
+        self.cache.add(slot_key, 0, window + 1)
+        try:
+            used = self.cache.incr(slot_key, cost)
+        except ValueError:
+            # Expired between add() and incr()
+            self.cache.set(slot_key, cost, window + 1)
+            used = cost
+        allowed = used <= self.burst
+        retry_after = 0 if allowed else (slot + 1) * window - now
+        return allowed, max(0, self.burst - used), retry_after
+
+
+def retry_after_header(seconds):
+    return str(max(1, math.ceil(seconds)))
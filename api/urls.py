@@ -0,0 +1,14 @@
+# apps/api/urls.py
+from django.urls import path
+from . import views
+
+app_name = 'api_v1'
+
+urlpatterns = [
+    path('services/', views.ServiceListView.as_view(), name='services'),
+    path('services/<uuid:service_id>/availability/', views.ServiceAvailabilityView.as_view(), name='availability'),
+    path('bookings/', views.BookingListView.as_view(), name='bookings'),
+    path('bookings/<uuid:booking_id>/', views.BookingDetailView.as_view(), name='booking_detail'),
+    path('bookings/<uuid:booking_id>/<str:action>/', views.BookingTransitionView.as_view(), name='booking_transition'),
+    path('customers/', views.CustomerListView.as_view(), name='customers'),
+]
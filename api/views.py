@@ -0,0 +1,198 @@
+# apps/api/views.py
+import json
+from datetime import timedelta
+
+from django.db.models import F
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+
+from apps.bookings.models import Booking, Service, TimeSlot
+from apps.bookings.transitions import InvalidTransition, transition
+from apps.businesses.timezones import business_timezone
+from apps.core.tz import isoformat_utc, parse_date_param, to_utc_epoch
+from apps.crm.models import Customer
+
+from .auth import authenticate
+from .http import error_response, json_response
+from .pagination import DEFAULT_PAGE_SIZE, InvalidCursor, keyset_page
+from .ratelimit import TokenBucket, retry_after_header
+
+MAX_AVAILABILITY_DAYS = 31
+
+# Key and subscription lookups when the client isn't cached yet
+AUTH_QUERIES = 2
+
+SERVICE_FIELDS = (
+    'id', 'name', 'name_ar', 'description', 'duration_minutes', 'price',
+    'discounted_price', 'requires_deposit', 'deposit_amount', 'max_bookings_per_slot',
+)
+BOOKING_FIELDS = (
+    'id', 'booking_number', 'service_id', 'time_slot_id', 'provider_id', 'crm_customer_id', 'date',
+    'start_time', 'end_time', 'customer_name', 'customer_email', 'customer_phone',
+    'status', 'payment_status', 'total_amount', 'source', 'created_at',
+)
+CUSTOMER_FIELDS = (
+    'id', 'first_name', 'last_name', 'email', 'phone', 'customer_type',
+    'total_bookings', 'total_spent', 'loyalty_points', 'last_visit', 'created_at',
+)
+
+
+def _json_body(request):
+    # The API takes JSON, not form posts; an empty body is an empty object
+    if not request.body:
+        return {}
+    payload = json.loads(request.body)
+    if not isinstance(payload, dict):
+        raise ValueError('Request body must be a JSON object.')
+    return payload
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class ApiView(View):
+    """
+    Base for the public API: bearer-key authentication, plan gating and
+    per-business rate limiting, all resolved from the cache.
+    
+    Subclasses see the caller as ``request.api_client`` and scope every
+    query to ``request.api_client.business_id``.
+    """
+    http_method_names = ['get', 'head']
+    
+    def dispatch(self, request, *args, **kwargs):
+        client = authenticate(request)
+        if client is None:
+            response = error_response(401, 'Invalid or missing API key.')
+            response['WWW-Authenticate'] = 'Bearer'
+            return response
+        if not client.has_api_access:
+            return error_response(403, 'API access is not included in the current plan.')
+        
+        bucket = TokenBucket(client.rate_per_minute / 60, client.burst)
+        allowed, remaining, retry_after = bucket.consume(f'api:rl:{client.business_id}')
+        if not allowed:
+            response = error_response(429, 'Rate limit exceeded.')
+            response['Retry-After'] = retry_after_header(retry_after)
+        else:
+            request.api_client = client
+            response = super().dispatch(request, *args, **kwargs)
+        response['RateLimit-Limit'] = str(client.burst)
+        response['RateLimit-Remaining'] = str(remaining)
+        return response
+    
+    def paginate(self, request, queryset, fields):
+        try:
+            limit = int(request.GET.get('limit', DEFAULT_PAGE_SIZE))
+            rows, next_cursor = keyset_page(queryset, fields, request.GET.get('cursor'), limit)
+        except (ValueError, InvalidCursor):
+            return error_response(400, 'Invalid cursor or limit.')
+        return json_response(request, {'results': rows, 'next_cursor': next_cursor})
+
+
+class ServiceListView(ApiView):
+    use_replica = True
+    query_budget = AUTH_QUERIES + 2
+    
+    def get(self, request):
+        services = Service.objects.filter(business_id=request.api_client.business_id, is_active=True)
+        return self.paginate(request, services.values(*SERVICE_FIELDS), ('name', 'id'))
+
+
+class ServiceAvailabilityView(ApiView):
+    use_replica = True
+    query_budget = AUTH_QUERIES + 3  # + business timezone on a cache miss
+    
+    def get(self, request, service_id):
+        date_from = parse_date_param(request.GET.get('date'))
+        if date_from is None:
+            return error_response(400, 'date is required (YYYY-MM-DD).')
+        date_to = parse_date_param(request.GET.get('date_to')) if 'date_to' in request.GET else date_from
+        if date_to is None or not date_from <= date_to <= date_from + timedelta(days=MAX_AVAILABILITY_DAYS - 1):
+            return error_response(400, f'date_to must be within {MAX_AVAILABILITY_DAYS} days of date.')
+        
+        slots = (
+            TimeSlot.objects.filter(
+                business_id=request.api_client.business_id,
+                service_id=service_id,
+                date__range=(date_from, date_to),
+                is_available=True,
+                current_bookings__lt=F('max_bookings'),
+            )
+            .annotate(remaining=F('max_bookings') - F('current_bookings'))
+            .order_by('date', 'start_time')
+            .values('id', 'date', 'start_time', 'end_time', 'provider_id', 'remaining')
+        )
+        slots = list(slots)
+        zone_name = business_timezone(request.api_client.business_id)
+        starts_at = isoformat_utc(to_utc_epoch(
+            zone_name, [slot['date'] for slot in slots], [slot['start_time'] for slot in slots],
+        ))
+        for slot, start_utc in zip(slots, starts_at):
+            slot['starts_at'] = start_utc
+        return json_response(request, {'service_id': service_id, 'timezone': zone_name, 'results': slots})
+
+
+class BookingListView(ApiView):
+    use_replica = True
+    query_budget = AUTH_QUERIES + 2
+    
+    def get(self, request):
+        bookings = Booking.objects.filter(business_id=request.api_client.business_id)
+        if 'status' in request.GET:
+            bookings = bookings.filter(status=request.GET['status'])
+        for param, lookup in (('date_from', 'date__gte'), ('date_to', 'date__lte')):
+            if param in request.GET:
+                value = parse_date_param(request.GET[param])
+                if value is None:
+                    return error_response(400, f'{param} must be YYYY-MM-DD.')
+                bookings = bookings.filter(**{lookup: value})
+        return self.paginate(request, bookings.values(*BOOKING_FIELDS), ('date', 'start_time', 'id'))
+
+
+class BookingDetailView(ApiView):
+    use_replica = True
+    query_budget = AUTH_QUERIES + 1
+    
+    def get(self, request, booking_id):
+        booking = (
+            Booking.objects.filter(pk=booking_id, business_id=request.api_client.business_id)
+            .values(*BOOKING_FIELDS)
+            .first()
+        )
+        if booking is None:
+            return error_response(404, 'Booking not found.')
+        return json_response(request, booking)
+
+
+class BookingTransitionView(ApiView):
+    http_method_names = ['post']
+    TARGETS = {'confirm': 'CONFIRMED', 'cancel': 'CANCELLED'}
+    
+    def post(self, request, booking_id, action):
+        if action not in self.TARGETS:
+            return error_response(404, f'Unknown action {action!r}.')
+        booking = Booking.objects.filter(pk=booking_id, business_id=request.api_client.business_id).first()
+        if booking is None:
+            return error_response(404, 'Booking not found.')
+        try:
+            reason = _json_body(request).get('reason', '')
+        except ValueError:
+            return error_response(400, 'Request body must be a JSON object.')
+        if not isinstance(reason, str):
+            return error_response(400, 'reason must be a string.')
+        try:
+            transition(booking, self.TARGETS[action], reason=reason)
+        except InvalidTransition as exc:
+            return error_response(409, str(exc))
+        return json_response(request, {'id': booking.pk, 'status': booking.status})
+
+
+class CustomerListView(ApiView):
+    use_replica = True
+    query_budget = AUTH_QUERIES + 2
+    
+    def get(self, request):
+        customers = Customer.objects.filter(business_id=request.api_client.business_id)
+        if 'customer_type' in request.GET:
+            customers = customers.filter(customer_type=request.GET['customer_type'])
+        return self.paginate(request, customers.values(*CUSTOMER_FIELDS), ('created_at', 'id'))
@@ -1,3 +1,92 @@
-from django.contrib import admin
+# apps/bookings/admin.py
+from django.contrib import admin, messages
+from django.utils.translation import gettext_lazy as _, ngettext
 
-# Register your models here.
+from apps.core.admin import LargeTableAdmin
+
+from .models import Booking, Service, TimeSlot
+from .transitions import bulk_transition
+
+
+@admin.register(Service)
+class ServiceAdmin(LargeTableAdmin):
+    list_display = ('name', 'business', 'price', 'duration_minutes', 'total_bookings', 'is_active')
+    list_filter = ('is_active',)
+    list_select_related = ('business',)
+    list_only = (
+        'id', 'name', 'price', 'duration_minutes', 'total_bookings', 'is_active',
+        'business__id', 'business__name',
+    )
+    search_fields = ('^name',)
+    raw_id_fields = ('business',)
+    export_fields = ('id', 'business_id', 'name', 'price', 'duration_minutes', 'total_bookings', 'is_active')
+    actions = ('export_csv',)
+
+
+@admin.register(TimeSlot)
+class TimeSlotAdmin(LargeTableAdmin):
+    list_display = ('service', 'date', 'start_time', 'end_time', 'current_bookings', 'max_bookings', 'is_available')
+    list_filter = ('is_available', 'date')
+    list_select_related = ('service__business',)
+    list_only = (
+        'id', 'date', 'start_time', 'end_time', 'current_bookings', 'max_bookings', 'is_available',
+        'service__id', 'service__name', 'service__business__id', 'service__business__name',
+    )
+    ordering = ('-date', 'start_time')
+    raw_id_fields = ('business', 'provider')
+    autocomplete_fields = ('service',)
+    export_fields = (
+        'id', 'service_id', 'provider_id', 'date', 'start_time', 'end_time',
+        'current_bookings', 'max_bookings', 'is_available',
+    )
+    actions = ('export_csv',)
+
+
+@admin.register(Booking)
+class BookingAdmin(LargeTableAdmin):
+    list_display = (
+        'booking_number', 'customer_name', 'service_name', 'date', 'start_time',
+        'status', 'payment_status', 'total_amount',
+    )
+    # Choice filters need no query; both lead an index with date
+    list_filter = ('status', 'payment_status', 'date')
+    list_select_related = ('service',)
+    list_only = (
+        'id', 'booking_number', 'customer_name', 'date', 'start_time', 'status',
+        'payment_status', 'total_amount', 'service__id', 'service__name',
+    )
+    ordering = ('-date', '-start_time')
+    # Case-sensitive exact lookups on indexed columns; '=' and '^' compile
+    # to UPPER(...) LIKE, which a plain btree index can't serve
+    search_fields = ('booking_number__exact', 'customer_email__exact')
+    raw_id_fields = ('business', 'time_slot', 'series', 'customer', 'crm_customer', 'provider', 'cancelled_by')
+    autocomplete_fields = ('service',)
+    readonly_fields = ('booking_number', 'status', 'confirmed_at', 'cancelled_at', 'completed_at')
+    export_fields = (
+        'booking_number', 'business_id', 'service__name', 'date', 'start_time', 'end_time',
+        'customer_name', 'customer_email', 'customer_phone', 'status', 'payment_status',
+        'total_amount', 'source', 'created_at',
+    )
+    actions = ('confirm_bookings', 'cancel_bookings', 'export_csv')
+    
+    @admin.display(description=_('service'), ordering='service__name')
+    def service_name(self, booking):
+        return booking.service.name
+    
+    def _transition(self, request, queryset, to_status, **kwargs):
+        # Set-based and batched; bookings that can't reach the status are skipped
+        updated = bulk_transition(queryset.select_related(None), to_status, user=request.user, **kwargs)
+        self.message_user(
+            request,
+            ngettext('%(count)d booking moved to %(status)s.', '%(count)d bookings moved to %(status)s.', updated)
+            % {'count': updated, 'status': to_status},
+            messages.SUCCESS if updated else messages.WARNING,
+        )
+    
+    @admin.action(description=_('Confirm selected bookings'), permissions=['change'])
+    def confirm_bookings(self, request, queryset):
+        self._transition(request, queryset, 'CONFIRMED')
+    
+    @admin.action(description=_('Cancel selected bookings'), permissions=['change'])
+    def cancel_bookings(self, request, queryset):
+        self._transition(request, queryset, 'CANCELLED', reason=_('Cancelled by staff'))
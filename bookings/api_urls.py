@@ -0,0 +1,9 @@
+# apps/bookings/api_urls.py
+from django.urls import path
+from .views import BookingCreateView
+
+app_name = 'bookings_api'
+
+urlpatterns = [
+    path('', BookingCreateView.as_view(), name='create'),
+]
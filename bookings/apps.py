@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def install_db_constraints(sender, using='default', **kwargs):
+    from .conflicts import install_exclusion_constraint
+    install_exclusion_constraint(using)
 
 
 class BookingsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'bookings'
+    
+    def ready(self):
+        from . import signals  # noqa: F401
+        post_migrate.connect(install_db_constraints, sender=self)
@@ -0,0 +1,137 @@
+# apps/bookings/archive.py
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, models, router, transaction
+from django.utils import timezone
+
+from .models import ArchivedBooking, Booking
+
+ARCHIVE_AFTER_DAYS = getattr(settings, 'BOOKING_ARCHIVE_AFTER_DAYS', 365)
+ARCHIVE_BATCH_SIZE = getattr(settings, 'BOOKING_ARCHIVE_BATCH_SIZE', 5000)
+
+# Only bookings that can no longer change are archived
+ARCHIVABLE_STATUSES = ('COMPLETED', 'CANCELLED', 'NO_SHOW')
+
+ARCHIVE_FIELDS = [
+    field.attname
+    for field in ArchivedBooking._meta.concrete_fields
+    if field.name != 'archived_at'
+]
+
+
+def archive_horizon(days=None, today=None):
+    today = today or timezone.localdate()
+    return today - timedelta(days=ARCHIVE_AFTER_DAYS if days is None else days)
+
+
+def archivable_bookings(horizon):
+    # Walks the (status, date) index
+    return Booking.objects.filter(status__in=ARCHIVABLE_STATUSES, date__lt=horizon)
+
+
+def detach_dependents(ids):
+    """
+    Null out nullable references to the bookings in ``ids``, as the ORM's
+    SET_NULL collector would. ``delete_rows`` skips the collector, and the
+    deferred FKs (waitlist entries, loyalty ledger) would fail at commit.
+    """
+    for relation in Booking._meta.related_objects:
+        if relation.on_delete is models.SET_NULL:
+            field = relation.field.name
+            relation.related_model._base_manager.filter(**{f'{field}__in': ids}).update(**{field: None})
+
+
+def delete_rows(ids):
+    """
+    ``DELETE FROM bookings_booking WHERE id IN (...)`` for ``ids``, as one
+    statement. No model is loaded and no delete signal is sent: archived
+    bookings still count towards popularity and must not be decremented.
+    Every reverse relation to Booking is SET_NULL and handled by
+    ``detach_dependents`` first, so there is nothing to cascade.
+    """
+    using = router.db_for_write(Booking)
+    connection = connections[using]
+    pk = Booking._meta.pk
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {connection.ops.quote_name(Booking._meta.db_table)} '
+            f'WHERE {connection.ops.quote_name(pk.column)} IN ({", ".join(["%s"] * len(ids))})',
+            [pk.get_db_prep_value(value, connection) for value in ids],
+        )
+        return cursor.rowcount
+
+
+def archive_batch(horizon, batch_size=ARCHIVE_BATCH_SIZE, exclude=()):
+    """
+    Move one bounded batch of finished bookings older than ``horizon`` into
+    ``ArchivedBooking``. Copy and delete share a transaction, so a booking
+    is always in exactly one of the two tables: rows whose copy is not
+    inserted (e.g. a booking number already used in the archive) stay in
+    the hot table. Returns ``(moved, skipped_ids)``.
+    """
+    with transaction.atomic():
+        rows = list(
+            archivable_bookings(horizon)
+            .exclude(pk__in=list(exclude))
+            .select_for_update(skip_locked=True)
+            .order_by('date')
+            .values(*ARCHIVE_FIELDS)[:batch_size]
+        )
+        if not rows:
+            return 0, []
+        
+        ids = [row['id'] for row in rows]
+        existing = set(ArchivedBooking.objects.filter(pk__in=ids).values_list('pk', flat=True))
+        ArchivedBooking.objects.bulk_create(
+            [ArchivedBooking(**row) for row in rows if row['id'] not in existing],
+            ignore_conflicts=True,
+        )
+        archived = set(ArchivedBooking.objects.filter(pk__in=ids).values_list('pk', flat=True))
+        moved = [pk for pk in ids if pk in archived and pk not in existing]
+        skipped = [pk for pk in ids if pk not in archived or pk in existing]
+        
+        if moved:
+            detach_dependents(moved)
+            delete_rows(moved)
+    return len(moved), skipped
+
+
+def archive_bookings(days=None, batch_size=ARCHIVE_BATCH_SIZE, max_batches=None, log=None):
+    horizon = archive_horizon(days)
+    total = batches = 0
+    skipped = set()
+    while max_batches is None or batches < max_batches:
+        moved, batch_skipped = archive_batch(horizon, batch_size, exclude=skipped)
+        if not moved and not batch_skipped:
+            break
+        skipped.update(batch_skipped)
+        total += moved
+        batches += 1
+        if log:
+            log(f'{total} bookings archived')
+    if log and skipped:
+        log(f'{len(skipped)} bookings could not be archived and were left in place')
+    return total
+
+
+def includes_archive(start_date):
+    # Archived rows are all older than the horizon, so recent ranges skip it
+    return start_date < archive_horizon()
+
+
+def historical_querysets(start_date=None, end_date=None, **filters):
+    """
+    Querysets over hot and (when the range reaches back far enough) archived
+    bookings with the same filters applied. Both tables share column names,
+    so the same values()/annotate() calls work on each.
+    """
+    if start_date is not None:
+        filters['date__gte'] = start_date
+    if end_date is not None:
+        filters['date__lte'] = end_date
+    
+    querysets = [Booking.objects.filter(**filters)]
+    if start_date is None or includes_archive(start_date):
+        querysets.append(ArchivedBooking.objects.filter(**filters))
+    return querysets
@@ -0,0 +1,213 @@
+# apps/bookings/conflicts.py
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+
+from django.core.exceptions import ValidationError
+from django.db import connections, transaction
+from django.utils.translation import gettext_lazy as _
+
+from .models import Booking
+from .transitions import RELEASING_STATUSES
+
+EXCLUSION_CONSTRAINT_NAME = 'booking_provider_slot_no_overlap'
+
+
+class ScheduleConflict(ValidationError):
+    def __init__(self, conflicts):
+        self.conflicts = conflicts
+        super().__init__(
+            _('The provider already has a booking at this time.'),
+            code='schedule_conflict',
+        )
+
+
+def to_seconds(value):
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+
+def _bounds(interval):
+    return interval[0], interval[1]
+
+
+def _pad(interval):
+    # ``(start, end, key[, slot])``; the slot is optional
+    return (*interval, None) if len(interval) == 3 else tuple(interval)
+
+
+class IntervalIndex:
+    """
+    Interval index for one provider-day.
+    
+    Intervals are kept sorted by start with a running maximum of end times,
+    so "does anything overlap [start, end)?" is a bisect plus one lookup,
+    O(log n). ``find`` bisects both arrays and scans only the intervals
+    between the first whose running maximum passes ``start`` and the last
+    that starts before ``end``. ``add`` is a list insertion, O(n) in the
+    worst case, without rebuilding the index; a provider-day holds a few
+    dozen bookings at most, so this is not an interval tree.
+    
+    Intervals may carry the time slot they were booked in: bookings that
+    share a slot are that slot's capacity, not a double booking, so
+    ``find`` ignores them when given the same ``slot``.
+    """
+    
+    def __init__(self, intervals=()):
+        self._intervals = sorted((_pad(interval) for interval in intervals), key=_bounds)
+        self._rebuild()
+    
+    def _rebuild(self):
+        self._starts = [interval[0] for interval in self._intervals]
+        self._max_ends = []
+        running = None
+        for interval in self._intervals:
+            end = interval[1]
+            running = end if running is None else max(running, end)
+            self._max_ends.append(running)
+    
+    def add(self, start, end, key=None, slot=None):
+        index = bisect_right(self._starts, start)
+        self._intervals.insert(index, (start, end, key, slot))
+        self._starts.insert(index, start)
+        self._max_ends.insert(index, max(self._max_ends[index - 1], end) if index else end)
+        # Later running maxima only change while they are below ``end``
+        for position in range(index + 1, len(self._max_ends)):
+            if self._max_ends[position] >= end:
+                break
+            self._max_ends[position] = end
+    
+    def overlaps(self, start, end):
+        # Only intervals starting before ``end`` can overlap
+        count = bisect_left(self._starts, end)
+        return count > 0 and self._max_ends[count - 1] > start
+    
+    def find(self, start, end, slot=None):
+        if not self.overlaps(start, end):
+            return []
+        count = bisect_left(self._starts, end)
+        # Everything before ``first`` ends by ``start``
+        first = bisect_right(self._max_ends, start)
+        return [
+            key for s, e, key, other in self._intervals[first:count]
+            if e > start and (slot is None or other != slot)
+        ]
+    
+    def __len__(self):
+        return len(self._intervals)
+
+
+def _active_bookings():
+    return Booking.objects.exclude(status__in=RELEASING_STATUSES).exclude(provider=None)
+
+
+def _interval(start_time, end_time, buffer_minutes):
+    return to_seconds(start_time), to_seconds(end_time) + (buffer_minutes or 0) * 60
+
+
+def load_schedules(pairs, exclude=()):
+    """
+    Build an ``IntervalIndex`` for every ``(provider_id, date)`` in ``pairs``
+    with a single query over the (provider, date, start_time) index. Each
+    booking occupies its slot plus its service's buffer time, and is
+    tagged with its time slot.
+    """
+    pairs = set(pairs)
+    schedules = defaultdict(IntervalIndex)
+    if not pairs:
+        return schedules
+    
+    rows = (
+        _active_bookings()
+        .filter(
+            provider_id__in={provider_id for provider_id, _ in pairs},
+            date__in={day for _, day in pairs},
+        )
+        .exclude(pk__in=list(exclude))
+        .values_list(
+            'pk', 'provider_id', 'date', 'start_time', 'end_time', 'service__buffer_time_minutes', 'time_slot_id',
+        )
+    )
+    
+    grouped = defaultdict(list)
+    for pk, provider_id, day, start_time, end_time, buffer_minutes, slot_id in rows:
+        if (provider_id, day) in pairs:
+            grouped[(provider_id, day)].append((*_interval(start_time, end_time, buffer_minutes), pk, slot_id))
+    for key, intervals in grouped.items():
+        schedules[key] = IntervalIndex(intervals)
+    return schedules
+
+
+def find_conflicts(bookings):
+    """
+    Check unsaved or rescheduled bookings against the stored schedule and
+    against each other. Returns ``{booking: [conflicting booking pks]}``
+    for every booking that overlaps something. Bookings in the same time
+    slot don't conflict; the slot's capacity is enforced by ``claim_slot``.
+    """
+    bookings = [booking for booking in bookings if booking.provider_id]
+    schedules = load_schedules(
+        ((booking.provider_id, booking.date) for booking in bookings),
+        exclude=[booking.pk for booking in bookings if not booking._state.adding],
+    )
+    
+    conflicts = {}
+    for booking in bookings:
+        schedule = schedules[(booking.provider_id, booking.date)]
+        start, end = _interval(booking.start_time, booking.end_time, booking.service.buffer_time_minutes)
+        found = schedule.find(start, end, booking.time_slot_id)
+        if found:
+            conflicts[booking] = found
+        # Later candidates in the same batch must not overlap this one either
+        schedule.add(start, end, booking.pk, booking.time_slot_id)
+    return conflicts
+
+
+def assert_no_conflict(booking):
+    conflicts = find_conflicts([booking])
+    if conflicts:
+        raise ScheduleConflict(conflicts[booking])
+
+
+def lock_provider(provider_id):
+    # Serializes writers per provider so check-then-insert can't interleave
+    if provider_id is None:
+        return
+    from apps.businesses.models import BusinessStaff
+    list(BusinessStaff.objects.select_for_update().filter(pk=provider_id).values_list('pk'))
+
+
+def save_without_conflict(booking, **save_kwargs):
+    with transaction.atomic():
+        lock_provider(booking.provider_id)
+        assert_no_conflict(booking)
+        booking.save(**save_kwargs)
+    return booking
+
+
+def install_exclusion_constraint(using='default'):
+    """
+    On PostgreSQL, back the application check with an exclusion constraint
+    so overlapping provider bookings are rejected even by raw writes.
+    Bookings sharing a time slot are exempt (a booking without a slot
+    compares by its own id, so it never matches another). The service
+    buffer is enforced by the application check only.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return False
+    
+    table = Booking._meta.db_table
+    statuses = ', '.join(f"'{status}'" for status in RELEASING_STATUSES)
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1 FROM pg_constraint WHERE conname = %s', [EXCLUSION_CONSTRAINT_NAME])
+        if cursor.fetchone():
+            return False
+        cursor.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+        cursor.execute(
+            f'ALTER TABLE {table} ADD CONSTRAINT {EXCLUSION_CONSTRAINT_NAME} '
+            f'EXCLUDE USING gist ('
+            f'provider_id WITH =, '
+            f'COALESCE(time_slot_id, id) WITH <>, '
+            f'tsrange(date + start_time, date + end_time) WITH &&'
+            f') WHERE (provider_id IS NOT NULL AND status NOT IN ({statuses}))'
+        )
+    return True
@@ -0,0 +1,96 @@
+# apps/bookings/creation.py
+from datetime import datetime, timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from apps.crm.linking import link_booking
+
+from .conflicts import assert_no_conflict, lock_provider
+from .models import Booking, BookingNumberSequence, TimeSlot
+from .reschedule import claim_slot
+
+BOOKING_SOURCES = ('WEBSITE', 'MOBILE', 'WALK_IN', 'PHONE')
+
+
+class BookingError(Exception):
+    pass
+
+
+def create_booking(service, customer, date, start_time, time_slot=None, provider=None,
+                   customer_name='', customer_email='', customer_phone='', customer_notes='',
+                   source='WEBSITE', ip_address=None, user_agent='', capacity_held=False):
+    """
+    Create a booking, claiming capacity on ``time_slot`` (if given) with a
+    conditional UPDATE and checking the provider's schedule, all in one
+    transaction. ``capacity_held`` skips the claim for capacity that is
+    already reserved, e.g. by a waitlist offer.
+    """
+    if not service.is_active:
+        raise BookingError(_('This service is not available for booking.'))
+    
+    if time_slot is not None:
+        if time_slot.service_id != service.pk:
+            raise BookingError(_('The time slot does not belong to this service.'))
+        date, start_time = time_slot.date, time_slot.start_time
+        provider = provider or time_slot.provider
+    if date is None or start_time is None:
+        raise BookingError(_('A date and start time are required.'))
+    end_time = (datetime.combine(date, start_time) + timedelta(minutes=service.duration_minutes)).time()
+    
+    booking = Booking(
+        business_id=service.business_id,
+        service=service,
+        time_slot=time_slot,
+        customer=customer,
+        provider=provider,
+        date=date,
+        start_time=start_time,
+        end_time=end_time,
+        customer_name=customer_name or customer.get_full_name(),
+        customer_email=customer_email or customer.email,
+        customer_phone=customer_phone or customer.phone,
+        customer_notes=customer_notes,
+        service_price=service.current_price,
+        source=source if source in BOOKING_SOURCES else 'WEBSITE',
+        ip_address=ip_address,
+        user_agent=user_agent,
+    )
+    booking.total_amount = booking.calculate_total()
+    
+    with transaction.atomic():
+        if time_slot is not None and not capacity_held and not claim_slot(time_slot.pk):
+            raise BookingError(_('The selected time slot is fully booked.'))
+        if provider is not None:
+            lock_provider(booking.provider_id)
+            assert_no_conflict(booking)
+        link_booking(booking)
+        booking.save()
+    return booking
+
+
+def get_time_slot(slot_id, service):
+    try:
+        return TimeSlot.objects.select_related('provider').get(pk=slot_id, service=service)
+    except TimeSlot.DoesNotExist:
+        raise BookingError(_('Time slot not found.'))
+
+
+def allocate_booking_numbers(count, day=None):
+    """
+    Reserve ``count`` consecutive booking numbers for ``day`` with a single
+    counter update. Sequence numbers are zero-padded to six digits, so
+    they never collide with the four-digit random numbers ``Booking.save()``
+    generates.
+    """
+    day = day or timezone.localdate()
+    if count <= 0:
+        return []
+    with transaction.atomic():
+        BookingNumberSequence.objects.get_or_create(day=day)
+        sequence = BookingNumberSequence.objects.select_for_update().get(day=day)
+        first = sequence.last_value + 1
+        BookingNumberSequence.objects.filter(day=day).update(last_value=F('last_value') + count)
+    return [f"BK{day:%Y%m%d}{number:06d}" for number in range(first, first + count)]
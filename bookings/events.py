@@ -0,0 +1,17 @@
+# apps/bookings/events.py
+from django.dispatch import Signal
+
+# Sent once per batch by bulk status changes that bypass Model.save().
+# Arguments: rows, a list of
+# (id, business_id, service_id, time_slot_id, date, previous_status)
+# tuples, and status, the status the rows were moved to.
+bookings_transitioned = Signal()
+
+# Sent once per batch by bulk inserts that bypass Model.save(), such as
+# recurring series. Arguments: rows, a list of
+# (id, business_id, service_id, time_slot_id, date, status) tuples.
+bookings_created = Signal()
+
+# Sent after waitlist backfill makes offers, for notifications.
+# Arguments: entry_ids, the WaitlistEntry pks that now hold an offer.
+waitlist_offers_made = Signal()
@@ -0,0 +1,41 @@
+# apps/bookings/management/commands/apply_booking_transitions.py
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from apps.bookings.transitions import complete_finished, mark_no_shows
+
+
+class Command(BaseCommand):
+    help = 'Apply scheduled bulk status changes (no-shows, completions)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--no-shows', nargs='?', const='', default=None, metavar='DATE',
+            help="Mark unconfirmed bookings on DATE (default: any day) as NO_SHOW once they have ended "
+                 "in their business's timezone",
+        )
+        parser.add_argument(
+            '--complete', action='store_true',
+            help='Complete IN_PROGRESS bookings whose end time has passed',
+        )
+    
+    def handle(self, *args, **options):
+        if options['no_shows'] is not None:
+            day = self.parse_day(options['no_shows']) if options['no_shows'] else None
+            count = mark_no_shows(day)
+            on_day = f' on {day}' if day else ''
+            self.stdout.write(f'{count} booking(s){on_day} marked as no-show.')
+        
+        if options['complete']:
+            count = complete_finished()
+            self.stdout.write(f'{count} booking(s) completed.')
+    
+    def parse_day(self, value):
+        # A bad DATE must not fall back to every day and mark the wrong bookings
+        try:
+            day = parse_date(value)
+        except ValueError:
+            day = None
+        if day is None:
+            raise CommandError(f'Invalid --no-shows date {value!r}; expected YYYY-MM-DD.')
+        return day
@@ -0,0 +1,36 @@
+# apps/bookings/management/commands/archive_bookings.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.bookings.archive import ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE, archivable_bookings, archive_bookings, archive_horizon
+
+
+class Command(BaseCommand):
+    help = 'Move finished bookings older than the archive horizon into the archive table'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=ARCHIVE_AFTER_DAYS,
+                            help='Archive bookings older than this many days')
+        parser.add_argument('--batch-size', type=int, default=ARCHIVE_BATCH_SIZE)
+        parser.add_argument('--max-batches', type=int, help='Stop after this many batches')
+        parser.add_argument('--dry-run', action='store_true')
+    
+    def handle(self, *args, **options):
+        horizon = archive_horizon(options['days'])
+        if options['dry_run']:
+            count = archivable_bookings(horizon).count()
+            self.stdout.write(f'{count} bookings before {horizon} would be archived.')
+            return
+        
+        started = time.perf_counter()
+        total = archive_bookings(
+            days=options['days'],
+            batch_size=options['batch_size'],
+            max_batches=options['max_batches'],
+            log=self.stdout.write,
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {total} bookings before {horizon} in {elapsed:.1f}s.'
+        ))
@@ -0,0 +1,75 @@
+# apps/bookings/management/commands/benchmark_series.py
+import time
+from datetime import time as time_of_day, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.bookings.models import BookingSeries, Service
+from apps.bookings.series import book_series, iter_series_bookings
+from apps.core.instrumentation import record_queries
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Expand and book weekly series for many customers and time each phase (rolled back)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--customers', type=int, default=1000)
+        parser.add_argument('--weeks', type=int, default=52)
+        parser.add_argument('--service', help='Service id; defaults to the first active service')
+    
+    def handle(self, *args, **options):
+        services = Service.objects.filter(is_active=True)
+        if options['service']:
+            services = services.filter(pk=options['service'])
+        service = services.first()
+        if service is None:
+            raise CommandError('No active service found; generate data first.')
+        customers = list(get_user_model().objects.all()[:options['customers']])
+        if not customers:
+            raise CommandError('No users found; generate data first.')
+        
+        # Far in the future so the series only compete with each other
+        start_date = timezone.localdate() + timedelta(days=3650)
+        series_list = [
+            BookingSeries(
+                business_id=service.business_id,
+                service=service,
+                customer=customer,
+                frequency='WEEKLY',
+                count=options['weeks'],
+                start_date=start_date,
+                start_time=time_of_day(10, 0),
+            )
+            for customer in customers
+        ]
+        
+        started = time.perf_counter()
+        occurrences = sum(
+            sum(1 for _ in iter_series_bookings(series, series.occurrences())) for series in series_list
+        )
+        expand_seconds = time.perf_counter() - started
+        
+        try:
+            with transaction.atomic():
+                BookingSeries.objects.bulk_create(series_list)
+                with record_queries() as recorder:
+                    started = time.perf_counter()
+                    booked = sum(len(book_series(series)) for series in series_list)
+                    book_seconds = time.perf_counter() - started
+                raise Rollback
+        except Rollback:
+            pass
+        
+        self.stdout.write(f'series:        {len(series_list)} x {options["weeks"]} weeks')
+        self.stdout.write(f'expansion:     {occurrences} occurrences in {expand_seconds:.2f}s '
+                          f'({occurrences / expand_seconds:,.0f}/s)')
+        self.stdout.write(f'booking:       {booked} bookings in {book_seconds:.2f}s '
+                          f'({booked / book_seconds:,.0f}/s)')
+        self.stdout.write(f'queries:       {recorder.count} ({recorder.count / len(series_list):.1f} per series)')
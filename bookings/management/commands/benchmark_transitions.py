@@ -0,0 +1,72 @@
+# apps/bookings/management/commands/benchmark_transitions.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.bookings.models import Booking
+from apps.bookings.transitions import ALLOWED_TRANSITIONS, bulk_transition, source_statuses
+
+# Statuses some other status can move to
+TARGET_STATUSES = sorted({target for targets in ALLOWED_TRANSITIONS.values() for target in targets})
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Compare bulk status transitions with per-row save() on existing bookings (rolled back)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=100000)
+        parser.add_argument('--per-row-limit', type=int, default=5000,
+                            help='Rows timed with save(); the result is extrapolated to --limit')
+        parser.add_argument('--status', default='CANCELLED', choices=TARGET_STATUSES)
+    
+    def handle(self, *args, **options):
+        to_status = options['status']
+        sources = source_statuses(to_status)
+        # Selected by status and a pk bound rather than a literal id list,
+        # which would overflow SQLite's bound-parameter limit
+        source = Booking.objects.filter(status__in=sources).order_by('pk')
+        pks = source.values_list('pk', flat=True)
+        last_pk = next(iter(pks[options['limit'] - 1:options['limit']]), None) or pks.last()
+        if last_pk is None:
+            raise CommandError(f"No {'/'.join(sources)} bookings to benchmark; generate data first.")
+        candidates = source.filter(pk__lte=last_pk)
+        count = candidates.count()
+        
+        bulk_seconds = self.timed(lambda: bulk_transition(candidates, to_status))
+        
+        # The bulk pass was rolled back, and the status filter guarantees the
+        # timed saves are real transitions rather than no-op rewrites
+        saved = []
+        
+        def per_row():
+            for booking in candidates[:options['per_row_limit']]:
+                booking.status = to_status
+                booking.save()
+                saved.append(booking.pk)
+        
+        per_row_seconds = self.timed(per_row)
+        if not saved:
+            raise CommandError('No untouched bookings left for the per-row pass.')
+        per_row_seconds = per_row_seconds * count / len(saved)
+        
+        self.stdout.write(f'bookings:        {count}')
+        self.stdout.write(f'bulk_transition: {bulk_seconds:.2f}s ({count / bulk_seconds:,.0f} rows/s)')
+        self.stdout.write(f'per-row save():  {per_row_seconds:.2f}s (extrapolated from {len(saved)} rows)')
+        self.stdout.write(f'speedup:         {per_row_seconds / bulk_seconds:.1f}x')
+    
+    def timed(self, func):
+        # Every run is rolled back so the benchmark never changes data
+        started = time.perf_counter()
+        try:
+            with transaction.atomic():
+                func()
+                elapsed = time.perf_counter() - started
+                raise Rollback
+        except Rollback:
+            pass
+        return elapsed
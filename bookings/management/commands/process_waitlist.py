@@ -0,0 +1,31 @@
+# apps/bookings/management/commands/process_waitlist.py
+from django.core.management.base import BaseCommand
+from django.db.models import F
+from django.utils import timezone
+
+from apps.bookings.models import TimeSlot
+from apps.bookings.waitlist import BATCH_SIZE, backfill_slots, expire_offers
+
+
+class Command(BaseCommand):
+    help = 'Expire lapsed waitlist offers and offer any free capacity to waiting customers'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    
+    def handle(self, *args, **options):
+        expired = expire_offers(batch_size=options['batch_size'])
+        
+        # Slots with waiting customers and free capacity, e.g. freed outside a transition
+        slot_ids = set(
+            TimeSlot.objects.filter(
+                date__gte=timezone.localdate(),
+                is_available=True,
+                current_bookings__lt=F('max_bookings'),
+                waitlist_entries__status='WAITING',
+            ).values_list('pk', flat=True)
+        )
+        offered = backfill_slots(slot_ids)
+        self.stdout.write(self.style.SUCCESS(
+            f'Expired {expired} offers, made {len(offered)} new offers.'
+        ))
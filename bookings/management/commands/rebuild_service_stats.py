@@ -0,0 +1,21 @@
+# apps/bookings/management/commands/rebuild_service_stats.py
+from django.core.management.base import BaseCommand
+
+from apps.bookings.stats import rebuild_service_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute service booking counters and daily popularity rollups'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--business', help='Only rebuild stats for this business id')
+        parser.add_argument('--batch-size', type=int, default=1000)
+    
+    def handle(self, *args, **options):
+        business = None
+        if options['business']:
+            from apps.businesses.models import Business
+            business = Business.objects.get(pk=options['business'])
+        
+        rebuild_service_stats(business=business, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS('Service stats rebuilt.'))
@@ -0,0 +1,22 @@
+# apps/bookings/management/commands/send_booking_reminders.py
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from apps.bookings.reminders import REMINDER_LEAD, due_reminders, send_reminders
+
+
+class Command(BaseCommand):
+    help = 'Email reminders for bookings starting within the lead time, in each business\'s timezone'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--lead-hours', type=float, default=REMINDER_LEAD.total_seconds() / 3600)
+        parser.add_argument('--dry-run', action='store_true', help='List due bookings without sending')
+    
+    def handle(self, *args, **options):
+        lead = timedelta(hours=options['lead_hours'])
+        if options['dry_run']:
+            for row in due_reminders(lead=lead):
+                self.stdout.write(f"{row['booking_number']}  {row['date']} {row['start_time']}  {row['customer_email']}")
+            return
+        self.stdout.write(f'Sent {send_reminders(lead=lead)} reminders.')
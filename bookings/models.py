@@ -32,6 +32,7 @@ class Service(models.Model):
     
     # Media
     image = models.ImageField(upload_to='services/', null=True, blank=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)  # see core.images
     
     # Stats
     total_bookings = models.IntegerField(default=0)
@@ -46,6 +47,7 @@ class Service(models.Model):
         ordering = ['name']
         indexes = [
             models.Index(fields=['business', 'is_active']),
+            models.Index(fields=['business', '-total_bookings']),
         ]
     
     def __str__(self):
@@ -88,6 +90,64 @@ class TimeSlot(models.Model):
     def is_bookable(self):
         return self.is_available and self.current_bookings < self.max_bookings
 
+class BookingSeries(models.Model):
+    FREQUENCY_CHOICES = [
+        ('DAILY', _('Daily')),
+        ('WEEKLY', _('Weekly')),
+        ('MONTHLY', _('Monthly')),
+    ]
+    
+    STATUS_CHOICES = [
+        ('ACTIVE', _('Active')),
+        ('ENDED', _('Ended')),
+        ('CANCELLED', _('Cancelled')),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    business = models.ForeignKey('businesses.Business', on_delete=models.CASCADE, related_name='booking_series')
+    service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name='booking_series')
+    customer = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='booking_series')
+    provider = models.ForeignKey('businesses.BusinessStaff', on_delete=models.SET_NULL, null=True, blank=True)
+    
+    # Recurrence rule (a subset of RFC 5545 RRULE)
+    frequency = models.CharField(max_length=10, choices=FREQUENCY_CHOICES, default='WEEKLY')
+    interval = models.PositiveSmallIntegerField(default=1)
+    count = models.PositiveIntegerField(null=True, blank=True)
+    until = models.DateField(null=True, blank=True)
+    weekdays = models.JSONField(default=list, blank=True)  # 0 = Monday, weekly series only
+    
+    start_date = models.DateField()
+    start_time = models.TimeField()
+    
+    customer_notes = models.TextField(blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='ACTIVE')
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = _('Booking Series')
+        verbose_name_plural = _('Booking Series')
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['business', 'status']),
+            models.Index(fields=['customer', 'status']),
+        ]
+    
+    def __str__(self):
+        return f"{self.service.name} - {self.get_frequency_display()} ({self.customer})"
+    
+    def occurrences(self):
+        from .series import iter_occurrences
+        return iter_occurrences(
+            self.start_date,
+            frequency=self.frequency,
+            interval=self.interval,
+            count=self.count,
+            until=self.until,
+            weekdays=self.weekdays,
+        )
+
 class Booking(models.Model):
     STATUS_CHOICES = [
         ('PENDING', _('Pending')),
@@ -111,9 +171,13 @@ class Booking(models.Model):
     business = models.ForeignKey('businesses.Business', on_delete=models.CASCADE, related_name='bookings')
     service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name='bookings')
     time_slot = models.ForeignKey(TimeSlot, on_delete=models.SET_NULL, null=True, related_name='bookings')
+    series = models.ForeignKey(BookingSeries, on_delete=models.SET_NULL, null=True, blank=True, related_name='bookings')
     
     customer = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='bookings')
     provider = models.ForeignKey('businesses.BusinessStaff', on_delete=models.SET_NULL, null=True, blank=True)
+    # CRM record for the customer_* fields below; set by crm.linking
+    crm_customer = models.ForeignKey('crm.Customer', on_delete=models.SET_NULL, null=True, blank=True,
+                                     related_name='bookings')
     
     # Booking details
     date = models.DateField()
@@ -167,11 +231,22 @@ class Booking(models.Model):
             models.Index(fields=['customer', 'status']),
             models.Index(fields=['business', 'date']),
             models.Index(fields=['status', 'date']),
+            models.Index(fields=['business', 'payment_status', 'date']),
+            models.Index(fields=['provider', 'date', 'start_time']),
+            models.Index(fields=['series', 'date']),
+            models.Index(fields=['date', 'start_time']),
+            models.Index(fields=['customer_email']),  # admin search
         ]
     
     def __str__(self):
         return f"{self.booking_number} - {self.customer_name}"
     
+    def clean(self):
+        super().clean()
+        if self.provider_id and self.service_id and self.date and self.start_time and self.end_time:
+            from .conflicts import assert_no_conflict
+            assert_no_conflict(self)
+    
     def save(self, *args, **kwargs):
         if not self.booking_number:
             self.booking_number = self.generate_booking_number()
@@ -187,4 +262,141 @@ class Booking(models.Model):
     
     def calculate_total(self):
         total = self.service_price - self.discount_amount + self.tax_amount
-        return max(total, Decimal('0.00'))
\ No newline at end of file
+        return max(total, Decimal('0.00'))
+
+class WaitlistEntry(models.Model):
+    STATUS_CHOICES = [
+        ('WAITING', _('Waiting')),
+        ('OFFERED', _('Offered')),
+        ('CLAIMED', _('Claimed')),
+        ('EXPIRED', _('Expired')),
+        ('CANCELLED', _('Cancelled')),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    business = models.ForeignKey('businesses.Business', on_delete=models.CASCADE, related_name='waitlist_entries')
+    service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name='waitlist_entries')
+    customer = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='waitlist_entries')
+    
+    # Either one specific slot, or any slot of the service within a date range
+    time_slot = models.ForeignKey(TimeSlot, on_delete=models.CASCADE, null=True, blank=True,
+                                  related_name='waitlist_entries')
+    date_from = models.DateField()
+    date_to = models.DateField()
+    
+    priority = models.IntegerField(default=0, help_text=_('Higher is served first'))
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='WAITING')
+    
+    # Active offer: capacity on offered_slot is held until offer_expires_at
+    offered_slot = models.ForeignKey(TimeSlot, on_delete=models.SET_NULL, null=True, blank=True,
+                                     related_name='waitlist_offers')
+    offered_at = models.DateTimeField(null=True, blank=True)
+    offer_expires_at = models.DateTimeField(null=True, blank=True)
+    booking = models.ForeignKey('Booking', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = _('Waitlist Entry')
+        verbose_name_plural = _('Waitlist Entries')
+        ordering = ['-priority', 'created_at']
+        indexes = [
+            models.Index(fields=['time_slot', 'status', '-priority', 'created_at']),
+            models.Index(fields=['service', 'status', 'date_from', 'date_to']),
+            models.Index(fields=['status', 'offer_expires_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.customer_id} waiting for {self.service_id} ({self.status})"
+
+class ArchivedBooking(models.Model):
+    # Cold storage for finished bookings moved out of the hot Booking table
+    # by bookings.archive; same column names so reports can query both.
+    id = models.UUIDField(primary_key=True, editable=False)
+    booking_number = models.CharField(max_length=20, unique=True)
+    
+    business = models.ForeignKey('businesses.Business', on_delete=models.CASCADE, related_name='archived_bookings')
+    service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name='archived_bookings')
+    customer = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='archived_bookings')
+    provider = models.ForeignKey('businesses.BusinessStaff', on_delete=models.SET_NULL, null=True, blank=True,
+                                 related_name='archived_bookings')
+    time_slot = models.ForeignKey(TimeSlot, on_delete=models.SET_NULL, null=True, blank=True,
+                                  related_name='archived_bookings')
+    series = models.ForeignKey(BookingSeries, on_delete=models.SET_NULL, null=True, blank=True,
+                               related_name='archived_bookings')
+    crm_customer = models.ForeignKey('crm.Customer', on_delete=models.SET_NULL, null=True, blank=True,
+                                     related_name='archived_bookings')
+    
+    date = models.DateField()
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    
+    customer_name = models.CharField(max_length=200)
+    customer_email = models.EmailField()
+    customer_phone = models.CharField(max_length=20)
+    customer_notes = models.TextField(blank=True)
+    
+    status = models.CharField(max_length=20, choices=Booking.STATUS_CHOICES)
+    payment_status = models.CharField(max_length=20, choices=Booking.PAYMENT_STATUS)
+    
+    service_price = models.DecimalField(max_digits=10, decimal_places=2)
+    discount_amount = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
+    tax_amount = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
+    total_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    deposit_paid = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
+    
+    source = models.CharField(max_length=50, default='WEBSITE')
+    
+    created_at = models.DateTimeField()
+    confirmed_at = models.DateTimeField(null=True, blank=True)
+    cancelled_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    cancelled_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL,
+                                     null=True, blank=True, related_name='+')
+    cancellation_reason = models.TextField(blank=True)
+    
+    archived_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = _('Archived Booking')
+        verbose_name_plural = _('Archived Bookings')
+        ordering = ['-date']
+        indexes = [
+            models.Index(fields=['business', 'date']),
+            models.Index(fields=['customer', 'date']),
+        ]
+    
+    def __str__(self):
+        return f"{self.booking_number} - {self.customer_name}"
+
+class ServiceDailyStats(models.Model):
+    # Daily per-service rollup; backs the windowed popularity queries
+    business = models.ForeignKey('businesses.Business', on_delete=models.CASCADE, related_name='service_daily_stats')
+    service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name='daily_stats')
+    date = models.DateField()
+    
+    bookings = models.IntegerField(default=0)
+    
+    class Meta:
+        verbose_name = _('Service Daily Stats')
+        verbose_name_plural = _('Service Daily Stats')
+        ordering = ['-date']
+        unique_together = ['service', 'date']
+        indexes = [
+            models.Index(fields=['business', 'date']),
+        ]
+    
+    def __str__(self):
+        return f"{self.service_id} - {self.date}: {self.bookings}"
+
+class BookingNumberSequence(models.Model):
+    # One counter per day; bulk writers reserve a block of numbers at once
+    day = models.DateField(primary_key=True)
+    last_value = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        verbose_name = _('Booking Number Sequence')
+        verbose_name_plural = _('Booking Number Sequences')
+    
+    def __str__(self):
+        return f"{self.day}: {self.last_value}"
@@ -0,0 +1,91 @@
+# apps/bookings/reminders.py
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from apps.businesses.timezones import business_timezones
+from apps.core.tz import LOCAL_DATE_MARGIN, to_utc_epoch
+
+from .models import Booking
+
+logger = logging.getLogger('apps.bookings.reminders')
+
+REMINDER_LEAD = timedelta(hours=getattr(settings, 'BOOKING_REMINDER_LEAD_HOURS', 24))
+REMINDER_STATUSES = ('PENDING', 'CONFIRMED')
+
+
+def due_reminders(now=None, lead=REMINDER_LEAD):
+    """
+    Bookings starting within ``lead`` of ``now`` that still need a reminder,
+    as ``values()`` rows with a ``starts_at`` epoch added.
+    
+    Candidates are narrowed by date in SQL, then their local start times
+    are converted to UTC per business timezone, a whole group at a time.
+    """
+    now = now or timezone.now()
+    rows = list(
+        Booking.objects.filter(
+            reminder_sent=False,
+            status__in=REMINDER_STATUSES,
+            date__range=((now - LOCAL_DATE_MARGIN).date(), (now + lead + LOCAL_DATE_MARGIN).date()),
+        ).values('id', 'business_id', 'booking_number', 'customer_name', 'customer_email', 'date', 'start_time')
+    )
+    
+    by_business = defaultdict(list)
+    for row in rows:
+        by_business[str(row['business_id'])].append(row)
+    zones = business_timezones(by_business)
+    
+    start, end = now.timestamp(), (now + lead).timestamp()
+    due = []
+    for business_id, group in by_business.items():
+        epochs = to_utc_epoch(zones[business_id], [row['date'] for row in group], [row['start_time'] for row in group])
+        for row, epoch in zip(group, epochs.tolist()):
+            if start <= epoch <= end:
+                row['starts_at'] = epoch
+                due.append(row)
+    return due
+
+
+def reminder_message(row, connection=None):
+    return EmailMessage(
+        _('Reminder: booking %(number)s') % {'number': row['booking_number']},
+        _('Hello %(name)s, this is a reminder of your booking on %(date)s at %(time)s.') % {
+            'name': row['customer_name'],
+            'date': row['date'].isoformat(),
+            'time': row['start_time'].strftime('%H:%M'),
+        },
+        settings.DEFAULT_FROM_EMAIL,
+        [row['customer_email']],
+        connection=connection,
+    )
+
+
+def send_reminders(now=None, lead=REMINDER_LEAD):
+    """
+    Email every due reminder over one connection and flag the bookings
+    that were actually sent with one UPDATE. A failed message is logged
+    and left unflagged, so the next run retries it. Returns the count sent.
+    """
+    now = now or timezone.now()
+    due = [row for row in due_reminders(now, lead) if row['customer_email']]
+    if not due:
+        return 0
+    
+    sent = []
+    with get_connection() as connection:
+        for row in due:
+            try:
+                if reminder_message(row, connection).send():
+                    sent.append(row['id'])
+            except Exception:
+                logger.exception('Reminder for booking %s could not be sent', row['booking_number'])
+    
+    if sent:
+        Booking.objects.filter(pk__in=sent, reminder_sent=False).update(reminder_sent=True, reminder_sent_at=now)
+    return len(sent)
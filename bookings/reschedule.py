@@ -0,0 +1,114 @@
+# apps/bookings/reschedule.py
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from apps.core.tz import get_zone
+
+from .conflicts import assert_no_conflict, lock_provider
+from .models import Booking, TimeSlot
+
+RESCHEDULABLE_STATUSES = ('PENDING', 'CONFIRMED')
+
+
+class RescheduleError(Exception):
+    # The move clashes with the booking's state or the slot's capacity
+    pass
+
+
+class BookingNotFound(RescheduleError):
+    pass
+
+
+class InvalidEventTimes(RescheduleError):
+    pass
+
+
+def parse_event_times(start, end, zone_name=None):
+    """
+    Convert the ISO datetimes sent by the calendar into a local date and
+    naive start/end times as stored on ``Booking``, in the business's
+    ``zone_name`` (default: the current timezone).
+    """
+    try:
+        start_dt = datetime.fromisoformat(start.replace('Z', '+00:00'))
+        end_dt = datetime.fromisoformat(end.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        raise InvalidEventTimes(_('Invalid start or end time.'))
+    
+    zone = get_zone(zone_name) if zone_name else timezone.get_current_timezone()
+    if timezone.is_aware(start_dt):
+        start_dt = start_dt.astimezone(zone)
+    if timezone.is_aware(end_dt):
+        end_dt = end_dt.astimezone(zone)
+    
+    if end_dt <= start_dt:
+        raise InvalidEventTimes(_('The booking must end after it starts.'))
+    if end_dt.date() != start_dt.date():
+        raise InvalidEventTimes(_('A booking cannot span more than one day.'))
+    return start_dt.date(), start_dt.time(), end_dt.time()
+
+
+def claim_slot(slot_id):
+    # Conditional UPDATE: succeeds only while the slot still has capacity
+    return TimeSlot.objects.filter(
+        pk=slot_id,
+        is_available=True,
+        current_bookings__lt=F('max_bookings'),
+    ).update(current_bookings=F('current_bookings') + 1) == 1
+
+
+def release_slot(slot_id):
+    TimeSlot.objects.filter(pk=slot_id, current_bookings__gt=0).update(
+        current_bookings=F('current_bookings') - 1
+    )
+
+
+def reschedule_booking(booking_id, new_date, start_time, end_time, business=None):
+    """
+    Move a booking to a new date/time in one transaction: lock the booking
+    and its provider, claim the matching time slot (if the service uses
+    slots), release the old one, check provider overlap and save.
+    """
+    with transaction.atomic():
+        bookings = Booking.objects.select_for_update(of=('self',)).select_related('service')
+        if business is not None:
+            bookings = bookings.filter(business=business)
+        try:
+            booking = bookings.get(pk=booking_id)
+        except Booking.DoesNotExist:
+            raise BookingNotFound(_('Booking not found.'))
+        
+        if booking.status not in RESCHEDULABLE_STATUSES:
+            raise RescheduleError(_('Only pending or confirmed bookings can be moved.'))
+        
+        lock_provider(booking.provider_id)
+        
+        new_slot_id = (
+            TimeSlot.objects.filter(
+                service_id=booking.service_id,
+                provider_id=booking.provider_id,
+                date=new_date,
+                start_time=start_time,
+            )
+            .values_list('pk', flat=True)
+            .first()
+        )
+        old_slot_id = booking.time_slot_id
+        if new_slot_id != old_slot_id:
+            if new_slot_id is not None and not claim_slot(new_slot_id):
+                raise RescheduleError(_('The selected time slot is fully booked.'))
+            if old_slot_id is not None:
+                release_slot(old_slot_id)
+        
+        booking.date = new_date
+        booking.start_time = start_time
+        booking.end_time = end_time
+        booking.time_slot_id = new_slot_id
+        assert_no_conflict(booking)
+        
+        booking.save(update_fields=['date', 'start_time', 'end_time', 'time_slot', 'updated_at'])
+    return booking
@@ -0,0 +1,320 @@
+# apps/bookings/series.py
+from calendar import monthrange
+from datetime import date as date_cls, datetime, timedelta
+
+from django.db import transaction
+from django.db.models import Case, F, UUIDField, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from apps.crm.linking import link_booking
+
+from .conflicts import find_conflicts, lock_provider
+from .creation import BOOKING_SOURCES, BookingError, allocate_booking_numbers
+from .events import bookings_created
+from .models import Booking, BookingSeries, TimeSlot
+from .reschedule import RESCHEDULABLE_STATUSES
+from .transitions import bulk_transition
+
+FREQUENCIES = ('DAILY', 'WEEKLY', 'MONTHLY')
+
+# Open-ended series (no count or until) stop after this many occurrences
+MAX_OCCURRENCES = 520
+
+BATCH_SIZE = 1000
+
+EDITABLE_FIELDS = ('start_time', 'provider', 'customer_notes')
+
+
+class SeriesUnavailable(BookingError):
+    def __init__(self, dates):
+        self.dates = sorted(dates)
+        super().__init__(_('Some occurrences of the series are not available.'))
+
+
+def _candidate_dates(start_date, frequency, interval, weekdays):
+    if frequency == 'DAILY':
+        step = 0
+        while True:
+            yield start_date + timedelta(days=step * interval)
+            step += 1
+    
+    elif frequency == 'WEEKLY':
+        days = sorted(set(weekdays or ())) or [start_date.weekday()]
+        week = start_date - timedelta(days=start_date.weekday())
+        while True:
+            for weekday in days:
+                day = week + timedelta(days=weekday)
+                if day >= start_date:
+                    yield day
+            week += timedelta(weeks=interval)
+    
+    else:
+        step = 0
+        while True:
+            month_index = start_date.month - 1 + step * interval
+            year, month = start_date.year + month_index // 12, month_index % 12 + 1
+            # Months without the start day (e.g. the 31st) are skipped, as in RRULE
+            if start_date.day <= monthrange(year, month)[1]:
+                yield date_cls(year, month, start_date.day)
+            step += 1
+
+
+def iter_occurrences(start_date, frequency='WEEKLY', interval=1, count=None, until=None,
+                     weekdays=None, limit=MAX_OCCURRENCES):
+    """
+    Yield the dates of a recurrence rule lazily, in order. Supports the
+    RRULE subset used by ``BookingSeries``: FREQ, INTERVAL, COUNT, UNTIL
+    and BYDAY (weekly only).
+    """
+    if frequency not in FREQUENCIES:
+        raise BookingError(_('Unsupported frequency.'))
+    if interval < 1:
+        raise BookingError(_('The interval must be at least 1.'))
+    if any(not isinstance(day, int) or not 0 <= day <= 6 for day in weekdays or ()):
+        raise BookingError(_('Weekdays must be numbers from 0 (Monday) to 6 (Sunday).'))
+    
+    maximum = min(count, limit) if count else limit
+    emitted = 0
+    for day in _candidate_dates(start_date, frequency, interval, weekdays):
+        if emitted >= maximum or (until and day > until):
+            return
+        yield day
+        emitted += 1
+
+
+def _end_time(start_time, duration_minutes):
+    return (datetime.combine(date_cls.min, start_time) + timedelta(minutes=duration_minutes)).time()
+
+
+def iter_series_bookings(series, dates, source='WEBSITE'):
+    """Build (unsaved) bookings for ``series`` on each of ``dates``."""
+    service = series.service
+    customer = series.customer
+    end_time = _end_time(series.start_time, service.duration_minutes)
+    price = service.current_price
+    
+    for day in dates:
+        booking = Booking(
+            business_id=series.business_id,
+            service=service,
+            series=series,
+            customer=customer,
+            provider_id=series.provider_id,
+            date=day,
+            start_time=series.start_time,
+            end_time=end_time,
+            customer_name=customer.get_full_name(),
+            customer_email=customer.email,
+            customer_phone=customer.phone,
+            customer_notes=series.customer_notes,
+            service_price=price,
+            source=source if source in BOOKING_SOURCES else 'WEBSITE',
+        )
+        booking.total_amount = booking.calculate_total()
+        yield booking
+
+
+def find_slots(service_id, dates, start_time, provider_id=None, lock=False):
+    """
+    Look up the time slots for every date in one query. Returns
+    ``(slots, full)``: the bookable slot pk per date, and the dates whose
+    slots have no capacity left. Dates without any slot are in neither.
+    """
+    queryset = TimeSlot.objects.filter(service_id=service_id, date__in=list(dates), start_time=start_time)
+    if provider_id is not None:
+        queryset = queryset.filter(provider_id=provider_id)
+    if lock:
+        queryset = queryset.select_for_update()
+    
+    slots, full = {}, set()
+    rows = queryset.values_list('pk', 'date', 'is_available', 'max_bookings', 'current_bookings')
+    for pk, day, is_available, max_bookings, current_bookings in rows:
+        if day in slots:
+            continue
+        if is_available and current_bookings < max_bookings:
+            slots[day] = pk
+        else:
+            full.add(day)
+    return slots, full - slots.keys()
+
+
+def claim_slots(slot_ids):
+    """Claim one place on each slot with a single UPDATE; all or nothing."""
+    slot_ids = list(slot_ids)
+    if not slot_ids:
+        return True
+    claimed = TimeSlot.objects.filter(
+        pk__in=slot_ids,
+        is_available=True,
+        current_bookings__lt=F('max_bookings'),
+    ).update(current_bookings=F('current_bookings') + 1)
+    return claimed == len(slot_ids)
+
+
+def book_series(series, skip_unavailable=False, source='WEBSITE', batch_size=BATCH_SIZE):
+    """
+    Expand ``series`` into bookings in one transaction.
+    
+    Slot capacity and provider conflicts are checked for every occurrence
+    with one query each, all slots are claimed with one UPDATE, booking
+    numbers are reserved as a block and the bookings are written with
+    ``bulk_create``. Unavailable occurrences raise ``SeriesUnavailable``,
+    or are left out with ``skip_unavailable``.
+    """
+    dates = list(series.occurrences())
+    if not dates:
+        raise BookingError(_('The series has no occurrences.'))
+    
+    with transaction.atomic():
+        slots, unavailable = find_slots(
+            series.service_id, dates, series.start_time, series.provider_id, lock=True
+        )
+        
+        bookings = list(iter_series_bookings(series, dates, source=source))
+        for booking in bookings:
+            # Before the conflict check: bookings sharing a slot don't conflict
+            booking.time_slot_id = slots.get(booking.date)
+        if series.provider_id:
+            lock_provider(series.provider_id)
+            unavailable.update(booking.date for booking in find_conflicts(bookings))
+        
+        if unavailable:
+            if not skip_unavailable:
+                raise SeriesUnavailable(unavailable)
+            bookings = [booking for booking in bookings if booking.date not in unavailable]
+        if not bookings:
+            raise SeriesUnavailable(unavailable)
+        
+        for booking, number in zip(bookings, allocate_booking_numbers(len(bookings))):
+            booking.booking_number = number
+        
+        if not claim_slots(booking.time_slot_id for booking in bookings if booking.time_slot_id):
+            raise BookingError(_('A time slot in the series was booked by someone else.'))
+        
+        # Every occurrence has the same customer details
+        crm_customer_id = link_booking(bookings[0])
+        for booking in bookings:
+            booking.crm_customer_id = crm_customer_id
+        Booking.objects.bulk_create(bookings, batch_size=batch_size)
+        bookings_created.send(sender=Booking, rows=[
+            (booking.pk, booking.business_id, booking.service_id, booking.time_slot_id,
+             booking.date, booking.status)
+            for booking in bookings
+        ])
+    return bookings
+
+
+def create_series(service, customer, start_date, start_time, frequency='WEEKLY', interval=1,
+                  count=None, until=None, weekdays=None, provider=None, customer_notes='',
+                  skip_unavailable=False, source='WEBSITE'):
+    if not service.is_active:
+        raise BookingError(_('This service is not available for booking.'))
+    
+    with transaction.atomic():
+        series = BookingSeries.objects.create(
+            business_id=service.business_id,
+            service=service,
+            customer=customer,
+            provider=provider,
+            frequency=frequency,
+            interval=interval,
+            count=count,
+            until=until,
+            weekdays=weekdays or [],
+            start_date=start_date,
+            start_time=start_time,
+            customer_notes=customer_notes,
+        )
+        bookings = book_series(series, skip_unavailable=skip_unavailable, source=source)
+    return series, bookings
+
+
+def update_following(series, from_date, **changes):
+    """
+    Apply ``changes`` to the occurrence on ``from_date`` and every later
+    one ("this and following") with a single UPDATE. Moving the time or
+    provider re-checks conflicts and swaps slot capacity in bulk.
+    Returns the number of bookings updated.
+    """
+    unknown = set(changes) - set(EDITABLE_FIELDS)
+    if unknown:
+        raise BookingError(_('These fields cannot be changed on a series: %s') % ', '.join(sorted(unknown)))
+    
+    following = Booking.objects.filter(series=series, date__gte=from_date, status__in=RESCHEDULABLE_STATUSES)
+    values = {'updated_at': timezone.now()}
+    if 'customer_notes' in changes:
+        values['customer_notes'] = changes['customer_notes']
+    
+    with transaction.atomic():
+        if 'start_time' in changes or 'provider' in changes:
+            values.update(_move_following(series, following, changes))
+        updated = following.update(**values)
+        
+        for field, value in changes.items():
+            setattr(series, field, value)
+        series.save(update_fields=[*changes, 'updated_at'])
+    return updated
+
+
+def _move_following(series, following, changes):
+    start_time = changes.get('start_time', series.start_time)
+    provider = changes.get('provider', series.provider)
+    provider_id = provider.pk if provider else None
+    end_time = _end_time(start_time, series.service.duration_minutes)
+    
+    rows = list(following.select_for_update().values_list('pk', 'date', 'time_slot_id'))
+    if not rows:
+        return {}
+    
+    # Give back the old slots, then claim the new ones; a failure rolls both back
+    old_slots = [slot_id for _pk, _day, slot_id in rows if slot_id]
+    if old_slots:
+        TimeSlot.objects.filter(pk__in=old_slots).update(
+            current_bookings=Greatest(F('current_bookings') - 1, 0)
+        )
+    slots, full = find_slots(series.service_id, [day for _pk, day, _slot_id in rows], start_time, provider_id, lock=True)
+    if full:
+        raise SeriesUnavailable(full)
+    
+    if provider_id:
+        lock_provider(provider_id)
+        moved = []
+        for pk, day, _slot_id in rows:
+            booking = Booking(pk=pk, service=series.service, provider_id=provider_id, time_slot_id=slots.get(day),
+                              date=day, start_time=start_time, end_time=end_time)
+            booking._state.adding = False
+            moved.append(booking)
+        conflicts = find_conflicts(moved)
+        if conflicts:
+            raise SeriesUnavailable(booking.date for booking in conflicts)
+    
+    if not claim_slots(slots.values()):
+        raise BookingError(_('A time slot in the series was booked by someone else.'))
+    
+    return {
+        'start_time': start_time,
+        'end_time': end_time,
+        'provider_id': provider_id,
+        'time_slot_id': Case(
+            *[When(date=day, then=Value(slot_id)) for day, slot_id in slots.items()],
+            default=Value(None),
+            output_field=UUIDField(),
+        ),
+    }
+
+
+def cancel_following(series, from_date, user=None, reason=''):
+    """Cancel the occurrence on ``from_date`` and every later one."""
+    with transaction.atomic():
+        cancelled = bulk_transition(
+            Booking.objects.filter(series=series, date__gte=from_date), 'CANCELLED', user=user, reason=reason
+        )
+        if from_date <= series.start_date:
+            series.status = 'CANCELLED'
+        else:
+            series.until = from_date - timedelta(days=1)
+            series.status = 'ENDED'
+        series.save(update_fields=['status', 'until', 'updated_at'])
+    return cancelled
@@ -0,0 +1,68 @@
+# apps/bookings/signals.py
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .events import bookings_created, bookings_transitioned
+from .models import Booking
+from .stats import apply_booking_deltas, counts_towards_popularity, stats_key, transition_deltas
+from .transitions import release_slot_capacity
+from .waitlist import backfill_slots, released_slots
+
+
+@receiver(post_init, sender=Booking)
+def remember_loaded_state(sender, instance, **kwargs):
+    instance._stats_key = stats_key(instance)
+
+
+@receiver(post_save, sender=Booking)
+def update_popularity_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    
+    new_key = stats_key(instance)
+    old_key = None if created else getattr(instance, '_stats_key', None)
+    if not created and (old_key is None or None in old_key):
+        # Loaded with deferred fields; nothing reliable to diff against
+        instance._stats_key = new_key
+        return
+    
+    deltas = []
+    if old_key and counts_towards_popularity(old_key[3]):
+        deltas.append((*old_key[:3], -1))
+    if counts_towards_popularity(new_key[3]):
+        deltas.append((*new_key[:3], 1))
+    apply_booking_deltas(deltas)
+    
+    instance._stats_key = new_key
+
+
+@receiver(post_delete, sender=Booking)
+def update_popularity_on_delete(sender, instance, **kwargs):
+    key = getattr(instance, '_stats_key', None) or stats_key(instance)
+    if None not in key and counts_towards_popularity(key[3]):
+        apply_booking_deltas([(*key[:3], -1)])
+
+
+@receiver(bookings_created, sender=Booking)
+def update_popularity_on_bulk_create(sender, rows, **kwargs):
+    apply_booking_deltas(
+        (business_id, service_id, date, 1)
+        for _, business_id, service_id, _, date, status in rows
+        if counts_towards_popularity(status)
+    )
+
+
+@receiver(bookings_transitioned, sender=Booking)
+def update_popularity_on_transition(sender, rows, status, **kwargs):
+    apply_booking_deltas(transition_deltas(rows, status))
+
+
+@receiver(bookings_transitioned, sender=Booking)
+def release_capacity_on_transition(sender, rows, status, **kwargs):
+    release_slot_capacity(rows, status)
+
+
+@receiver(bookings_transitioned, sender=Booking)
+def backfill_waitlist_on_transition(sender, rows, status, **kwargs):
+    # Connected after release_capacity_on_transition, so capacity is free
+    backfill_slots(released_slots(rows, status))
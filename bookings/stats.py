@@ -0,0 +1,180 @@
+# apps/bookings/stats.py
+from collections import Counter
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import ArchivedBooking, Booking, Service, ServiceDailyStats
+
+# Bookings in these statuses no longer count towards a service's popularity
+UNCOUNTED_STATUSES = ('CANCELLED',)
+
+POPULARITY_WINDOWS = (7, 30, 90)
+
+
+def counts_towards_popularity(status):
+    return status is not None and status not in UNCOUNTED_STATUSES
+
+
+def stats_key(instance):
+    # Read from __dict__ so deferred fields are never loaded just for this
+    values = instance.__dict__
+    return (
+        values.get('business_id'),
+        values.get('service_id'),
+        values.get('date'),
+        values.get('status'),
+    )
+
+
+def transition_deltas(rows, status):
+    counted = counts_towards_popularity(status)
+    for _, business_id, service_id, _, date, old_status in rows:
+        was_counted = counts_towards_popularity(old_status)
+        if was_counted != counted:
+            yield business_id, service_id, date, 1 if counted else -1
+
+
+def apply_booking_deltas(deltas):
+    """
+    Apply popularity counter changes for a batch of bookings.
+    
+    ``deltas`` is an iterable of ``(business_id, service_id, date, delta)``.
+    Entries for the same service (and day) are folded together, so a bulk
+    operation costs one UPDATE per distinct service and per distinct day
+    instead of one per booking.
+    """
+    per_service = Counter()
+    per_day = Counter()
+    for business_id, service_id, date, delta in deltas:
+        per_service[service_id] += delta
+        per_day[(business_id, service_id, date)] += delta
+    
+    with transaction.atomic():
+        for service_id, delta in per_service.items():
+            if delta:
+                Service.objects.filter(pk=service_id).update(
+                    total_bookings=F('total_bookings') + delta
+                )
+        for (business_id, service_id, date), delta in per_day.items():
+            if delta:
+                _bump_daily_stats(business_id, service_id, date, delta)
+
+
+def _bump_daily_stats(business_id, service_id, date, delta):
+    rollup = ServiceDailyStats.objects.filter(service_id=service_id, date=date)
+    if rollup.update(bookings=F('bookings') + delta):
+        return
+    try:
+        with transaction.atomic():
+            ServiceDailyStats.objects.create(
+                business_id=business_id,
+                service_id=service_id,
+                date=date,
+                bookings=delta,
+            )
+    except IntegrityError:
+        # Another writer created the row first
+        rollup.update(bookings=F('bookings') + delta)
+
+
+def top_services(business, limit=5):
+    # Served from the (business, -total_bookings) index, no join on bookings
+    return list(
+        Service.objects.filter(business=business)
+        .order_by('-total_bookings')
+        .values('id', 'name', count=F('total_bookings'))[:limit]
+    )
+
+
+def top_services_in_window(business, days, limit=5, today=None):
+    today = today or timezone.now().date()
+    start_date = today - timedelta(days=days - 1)
+    
+    rows = (
+        ServiceDailyStats.objects.filter(business=business, date__range=(start_date, today))
+        .values('service_id', 'service__name')
+        .annotate(count=Sum('bookings'))
+        .filter(count__gt=0)
+        .order_by('-count')[:limit]
+    )
+    return [
+        {'id': row['service_id'], 'name': row['service__name'], 'count': row['count']}
+        for row in rows
+    ]
+
+
+def windowed_popularity(business, windows=POPULARITY_WINDOWS, limit=5, today=None):
+    return {
+        days: top_services_in_window(business, days, limit=limit, today=today)
+        for days in windows
+    }
+
+
+def rebuild_service_stats(business=None, batch_size=1000):
+    """
+    Recompute ``Service.total_bookings`` and the daily rollups from the
+    booking table and its archive. Used for the initial backfill and to
+    repair drift.
+    """
+    services = Service.objects.all()
+    tables = [
+        Booking.objects.exclude(status__in=UNCOUNTED_STATUSES),
+        ArchivedBooking.objects.exclude(status__in=UNCOUNTED_STATUSES),
+    ]
+    rollups = ServiceDailyStats.objects.all()
+    if business is not None:
+        services = services.filter(business=business)
+        tables = [bookings.filter(business=business) for bookings in tables]
+        rollups = rollups.filter(business=business)
+    
+    def service_count(bookings):
+        return Coalesce(Subquery(
+            bookings.filter(service=OuterRef('pk'))
+            .order_by()
+            .values('service')
+            .annotate(count=Count('id'))
+            .values('count')
+        ), Value(0), output_field=IntegerField())
+    
+    def daily(bookings):
+        return (
+            bookings.order_by()
+            .values('business_id', 'service_id', 'date')
+            .annotate(count=Count('id'))
+        )
+    
+    hot, archived = tables
+    # The archive holds old days only, so its rollups are few; hot rows
+    # stream and pick up the archived count for the same day
+    archived_daily = Counter({
+        (row['business_id'], row['service_id'], row['date']): row['count']
+        for row in daily(archived).iterator(chunk_size=batch_size)
+    })
+    
+    def merged():
+        for row in daily(hot).iterator(chunk_size=batch_size):
+            key = (row['business_id'], row['service_id'], row['date'])
+            yield key, row['count'] + archived_daily.pop(key, 0)
+        yield from archived_daily.items()
+    
+    with transaction.atomic():
+        services.update(total_bookings=service_count(hot) + service_count(archived))
+        rollups.delete()
+        
+        batch = []
+        for (business_id, service_id, date), count in merged():
+            batch.append(ServiceDailyStats(
+                business_id=business_id,
+                service_id=service_id,
+                date=date,
+                bookings=count,
+            ))
+            if len(batch) >= batch_size:
+                ServiceDailyStats.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            ServiceDailyStats.objects.bulk_create(batch)
@@ -1,3 +1,209 @@
-from django.test import TestCase
+# apps/bookings/tests.py
+import json
+import random
+import threading
+import uuid
+from datetime import date, datetime, time, timedelta
 
-# Create your tests here.
+from django.contrib import admin
+from django.db import connections
+from django.db.models import Count, Q
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, skipUnlessDBFeature
+
+from apps.accounts.models import User
+from apps.businesses.models import Business, BusinessStaff
+from apps.core.testing import AdminQueryMixin
+
+from .conflicts import IntervalIndex, ScheduleConflict, save_without_conflict
+from .creation import create_booking
+from .models import Booking, Service, TimeSlot
+from .reschedule import RescheduleError, reschedule_booking
+from .transitions import RELEASING_STATUSES
+from .views import BookingCreateView
+
+
+def run_concurrently(target, arguments):
+    """
+    Call ``target`` once per item of ``arguments``, each in its own thread,
+    all released together; returns the results in no particular order.
+    """
+    results, lock = [], threading.Lock()
+    barrier = threading.Barrier(len(arguments))
+    
+    def run(argument):
+        try:
+            barrier.wait()
+            result = target(argument)
+            with lock:
+                results.append(result)
+        finally:
+            # Each thread has its own connection; close it so teardown can drop the database
+            connections.close_all()
+    
+    threads = [threading.Thread(target=run, args=(argument,)) for argument in arguments]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class BookingFixtures:
+    def make_service(self, **fields):
+        owner = User.objects.create_user(f'owner-{uuid.uuid4().hex[:8]}@example.com', first_name='Owner')
+        business = Business.objects.create(owner=owner, name='Test Business')
+        return Service.objects.create(
+            business=business, name='Haircut', description='', duration_minutes=30, price=50, **fields,
+        )
+    
+    def make_slot(self, service, day=None, start=time(10), max_bookings=1):
+        day = day or date.today() + timedelta(days=7)
+        end = (datetime.combine(day, start) + timedelta(minutes=service.duration_minutes)).time()
+        return TimeSlot.objects.create(
+            business_id=service.business_id, service=service, date=day,
+            start_time=start, end_time=end, max_bookings=max_bookings,
+        )
+
+
+@skipUnlessDBFeature('has_select_for_update')
+class IdempotentBookingTests(BookingFixtures, TransactionTestCase):
+    threads = 10
+    
+    def test_same_key_from_many_threads_books_once(self):
+        service = self.make_service()
+        slot = self.make_slot(service, max_bookings=self.threads)
+        user = User.objects.create_user('client@example.com', first_name='Client')
+        body = json.dumps({'service': str(service.pk), 'time_slot': str(slot.pk), 'source': 'MOBILE'})
+        key = str(uuid.uuid4())
+        view = BookingCreateView.as_view()
+        factory = RequestFactory()
+        
+        def attempt(_):
+            request = factory.post('/api/bookings/', body, content_type='application/json',
+                                   HTTP_IDEMPOTENCY_KEY=key)
+            request.user = user
+            return view(request)
+        
+        responses = run_concurrently(attempt, range(self.threads))
+        
+        # The database, not the responses, decides how many bookings there are
+        self.assertEqual(Booking.objects.filter(time_slot=slot).count(), 1)
+        slot.refresh_from_db()
+        self.assertEqual(slot.current_bookings, 1)
+        
+        booking = Booking.objects.get(time_slot=slot)
+        created = [response for response in responses if response.status_code == 201]
+        self.assertTrue(created)
+        self.assertEqual({json.loads(response.content)['id'] for response in created}, {str(booking.pk)})
+        self.assertTrue(all(response.status_code in (201, 409) for response in responses))
+
+
+@skipUnlessDBFeature('has_select_for_update')
+class ConcurrentRescheduleTests(BookingFixtures, TransactionTestCase):
+    threads = 10
+    
+    def test_concurrent_moves_keep_slot_counters_consistent(self):
+        service = self.make_service()
+        target = self.make_slot(service, start=time(15), max_bookings=3)
+        sources = [self.make_slot(service, start=time(9), day=target.date + timedelta(days=i + 1))
+                   for i in range(self.threads)]
+        customer = User.objects.create_user('client@example.com', first_name='Client')
+        bookings = [create_booking(service, customer, None, None, time_slot=slot) for slot in sources]
+        
+        def move(booking):
+            try:
+                reschedule_booking(booking.pk, target.date, target.start_time, target.end_time)
+            except (RescheduleError, ScheduleConflict):
+                return False
+            return True
+        
+        moved = sum(run_concurrently(move, bookings))
+        
+        # No lost updates: every counter equals the bookings actually holding the slot
+        slots = TimeSlot.objects.filter(pk__in=[target.pk, *(slot.pk for slot in sources)]).annotate(
+            held=Count('bookings', filter=~Q(bookings__status__in=RELEASING_STATUSES))
+        )
+        for slot in slots:
+            self.assertEqual(slot.current_bookings, slot.held, slot.date)
+        target.refresh_from_db()
+        self.assertEqual(target.current_bookings, target.max_bookings)
+        self.assertEqual(moved, target.max_bookings)
+
+
+class IntervalIndexTests(SimpleTestCase):
+    def test_find_matches_a_linear_scan(self):
+        rng = random.Random(30)
+        for _ in range(200):
+            intervals = []
+            for key in range(rng.randint(0, 12)):
+                start = rng.randint(0, 100)
+                intervals.append((start, start + rng.randint(1, 30), key, rng.choice([None, 1, 2])))
+            half = len(intervals) // 2
+            index = IntervalIndex(intervals[:half])
+            for interval in intervals[half:]:
+                index.add(*interval)
+            
+            for _ in range(10):
+                start = rng.randint(0, 120)
+                end = start + rng.randint(1, 30)
+                slot = rng.choice([None, 1, 2])
+                expected = [key for s, e, key, other in intervals
+                            if s < end and e > start and (slot is None or other != slot)]
+                self.assertCountEqual(index.find(start, end, slot), expected)
+                self.assertEqual(index.overlaps(start, end), any(s < end and e > start for s, e, *_ in intervals))
+
+
+@skipUnlessDBFeature('has_select_for_update')
+class ProviderConflictTests(BookingFixtures, TransactionTestCase):
+    threads = 10
+    
+    def test_concurrent_overlapping_bookings_accept_one(self):
+        service = self.make_service()
+        staff_user = User.objects.create_user('staff@example.com', first_name='Staff')
+        provider = BusinessStaff.objects.create(business_id=service.business_id, user=staff_user)
+        customer = User.objects.create_user('client@example.com', first_name='Client')
+        day = date.today() + timedelta(days=7)
+        
+        def attempt(minutes):
+            # Starts staggered by a minute, so every pair overlaps
+            start = (datetime.combine(day, time(10)) + timedelta(minutes=minutes)).time()
+            booking = Booking(
+                business_id=service.business_id, service=service, customer=customer, provider=provider,
+                date=day, start_time=start, end_time=(datetime.combine(day, start) + timedelta(minutes=30)).time(),
+                customer_name='Client', customer_email=customer.email, customer_phone='',
+                service_price=service.price, total_amount=service.price,
+            )
+            try:
+                save_without_conflict(booking)
+            except ScheduleConflict:
+                return False
+            return True
+        
+        accepted = run_concurrently(attempt, range(self.threads))
+        
+        self.assertEqual(sum(accepted), 1)
+        self.assertEqual(Booking.objects.filter(provider=provider, date=day).count(), 1)
+
+
+class BookingAdminQueryTests(AdminQueryMixin, BookingFixtures, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.services = [self.make_service(), self.make_service()]
+        for service in self.services:
+            self.make_slot(service)
+        customer = User.objects.create_user('client@example.com', first_name='Client')
+        # One service and day, so per-group counter updates don't vary with the selection
+        day = date.today() + timedelta(days=7)
+        for _ in range(12):
+            create_booking(self.services[0], customer, day, time(10))
+    
+    def test_changelists_stay_within_budget(self):
+        for model in (Service, TimeSlot, Booking):
+            self.assertChangelistWithinBudget(model)
+    
+    def test_bulk_actions_run_constant_queries(self):
+        for model in (Service, TimeSlot, Booking):
+            rows = model.objects.order_by('pk')
+            small = model.objects.filter(pk__in=rows.values_list('pk', flat=True)[:1])
+            for action in admin.site._registry[model].actions:
+                self.assertActionQueriesConstant(model, action, small, rows)
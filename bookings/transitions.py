@@ -0,0 +1,174 @@
+# apps/bookings/transitions.py
+from collections import Counter, defaultdict
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from apps.businesses.timezones import business_timezones
+from apps.core.tz import LOCAL_DATE_MARGIN, to_utc_epoch
+
+from .events import bookings_transitioned
+from .models import Booking, TimeSlot
+from .stats import stats_key
+
+ALLOWED_TRANSITIONS = {
+    'PENDING': {'CONFIRMED', 'CANCELLED', 'NO_SHOW'},
+    'CONFIRMED': {'IN_PROGRESS', 'COMPLETED', 'CANCELLED', 'NO_SHOW'},
+    'IN_PROGRESS': {'COMPLETED', 'CANCELLED'},
+    'COMPLETED': set(),
+    'CANCELLED': set(),
+    'NO_SHOW': set(),
+}
+
+# Timestamp column stamped in the same UPDATE as the status change
+TIMESTAMP_FIELDS = {
+    'CONFIRMED': 'confirmed_at',
+    'COMPLETED': 'completed_at',
+    'CANCELLED': 'cancelled_at',
+}
+
+# Statuses that give the booking's time slot capacity back
+RELEASING_STATUSES = ('CANCELLED', 'NO_SHOW')
+
+BATCH_SIZE = 2000
+
+
+class InvalidTransition(Exception):
+    pass
+
+
+def can_transition(from_status, to_status):
+    return to_status in ALLOWED_TRANSITIONS.get(from_status, ())
+
+
+def source_statuses(to_status):
+    if to_status not in ALLOWED_TRANSITIONS:
+        raise InvalidTransition(f'Unknown booking status: {to_status}')
+    return [status for status, targets in ALLOWED_TRANSITIONS.items() if to_status in targets]
+
+
+def bulk_transition(queryset, to_status, user=None, reason='', batch_size=BATCH_SIZE):
+    """
+    Move every booking in ``queryset`` that may legally reach ``to_status``
+    with set-based UPDATEs, one per batch. Bookings in other statuses are
+    left untouched. Returns the number of bookings transitioned.
+    
+    Each batch sends a single ``bookings_transitioned`` signal carrying the
+    affected rows so counters and slot capacity are adjusted per batch.
+    """
+    sources = source_statuses(to_status)
+    now = timezone.now()
+    
+    values = {'status': to_status, 'updated_at': now}
+    if to_status in TIMESTAMP_FIELDS:
+        values[TIMESTAMP_FIELDS[to_status]] = now
+    if to_status == 'CANCELLED':
+        values['cancelled_by'] = user
+        values['cancellation_reason'] = reason
+    
+    candidates = queryset.filter(status__in=sources).order_by('pk')
+    total = 0
+    last_pk = None
+    while True:
+        with transaction.atomic():
+            batch = candidates if last_pk is None else candidates.filter(pk__gt=last_pk)
+            rows = list(
+                batch.select_for_update().values_list(
+                    'id', 'business_id', 'service_id', 'time_slot_id', 'date', 'status'
+                )[:batch_size]
+            )
+            if not rows:
+                break
+            
+            last_pk = rows[-1][0]
+            updated = Booking.objects.filter(
+                pk__in=[row[0] for row in rows],
+                status__in=sources,
+            ).update(**values)
+            total += updated
+            
+            bookings_transitioned.send(sender=Booking, rows=rows, status=to_status)
+        
+        if len(rows) < batch_size:
+            break
+    
+    return total
+
+
+def transition(booking, to_status, user=None, reason=''):
+    if not can_transition(booking.status, to_status):
+        raise InvalidTransition(f'Cannot move booking from {booking.status} to {to_status}')
+    
+    if not bulk_transition(Booking.objects.filter(pk=booking.pk), to_status, user=user, reason=reason):
+        raise InvalidTransition('Booking status changed concurrently')
+    
+    booking.refresh_from_db(fields=[
+        'status', 'updated_at', 'confirmed_at', 'completed_at',
+        'cancelled_at', 'cancelled_by', 'cancellation_reason',
+    ])
+    booking._stats_key = stats_key(booking)
+    return booking
+
+
+def release_slot_capacity(rows, status):
+    if status not in RELEASING_STATUSES:
+        return
+    
+    released = Counter(
+        time_slot_id
+        for _, _, _, time_slot_id, _, old_status in rows
+        if time_slot_id and old_status not in RELEASING_STATUSES
+    )
+    for time_slot_id, count in released.items():
+        TimeSlot.objects.filter(pk=time_slot_id).update(
+            current_bookings=Greatest(F('current_bookings') - count, 0)
+        )
+
+
+def ended(queryset, now=None):
+    """
+    Narrow ``queryset`` to bookings whose local end time, in their
+    business's timezone, is at or before ``now``.
+    
+    Dates more than a day back have ended in every zone and stay a plain
+    date filter; only the bookings near ``now`` are converted to UTC, a
+    business at a time.
+    """
+    now = now or timezone.now()
+    cutoff = (now - LOCAL_DATE_MARGIN).date()
+    recent = list(
+        queryset.filter(date__gte=cutoff, date__lte=(now + LOCAL_DATE_MARGIN).date())
+        .values_list('pk', 'business_id', 'date', 'end_time')
+    )
+    
+    by_business = defaultdict(list)
+    for row in recent:
+        by_business[str(row[1])].append(row)
+    zones = business_timezones(by_business)
+    
+    finished = []
+    for business_id, group in by_business.items():
+        epochs = to_utc_epoch(zones[business_id], [row[2] for row in group], [row[3] for row in group])
+        finished.extend(row[0] for row, epoch in zip(group, epochs.tolist()) if epoch <= now.timestamp())
+    return queryset.filter(Q(date__lt=cutoff) | Q(pk__in=finished))
+
+
+def mark_no_shows(day=None, business=None, statuses=('PENDING',), now=None):
+    """
+    Mark bookings still in ``statuses`` as NO_SHOW once they have ended in
+    their business's timezone; only those on ``day`` when given.
+    """
+    queryset = Booking.objects.filter(status__in=statuses)
+    if day is not None:
+        queryset = queryset.filter(date=day)
+    if business is not None:
+        queryset = queryset.filter(business=business)
+    return bulk_transition(ended(queryset, now), 'NO_SHOW')
+
+
+def complete_finished(business=None, now=None):
+    queryset = Booking.objects.filter(status='IN_PROGRESS')
+    if business is not None:
+        queryset = queryset.filter(business=business)
+    return bulk_transition(ended(queryset, now), 'COMPLETED')
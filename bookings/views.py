@@ -1,3 +1,73 @@
-from django.shortcuts import render
+# apps/bookings/views.py
+import json
 
-# Create your views here.
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.exceptions import ValidationError
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_date, parse_time
+from django.utils.decorators import method_decorator
+from django.views import View
+
+from apps.core.idempotency import idempotent
+from .conflicts import ScheduleConflict
+from .creation import BookingError, create_booking, get_time_slot
+from .models import Service
+
+
+def booking_to_dict(booking):
+    return {
+        'id': str(booking.id),
+        'booking_number': booking.booking_number,
+        'service': str(booking.service_id),
+        'time_slot': str(booking.time_slot_id) if booking.time_slot_id else None,
+        'date': booking.date.isoformat(),
+        'start_time': booking.start_time.isoformat(timespec='minutes'),
+        'end_time': booking.end_time.isoformat(timespec='minutes'),
+        'status': booking.status,
+        'payment_status': booking.payment_status,
+        'total_amount': str(booking.total_amount),
+    }
+
+
+@method_decorator(idempotent('bookings:create'), name='post')
+class BookingCreateView(LoginRequiredMixin, View):
+    http_method_names = ['post']
+    
+    def post(self, request):
+        try:
+            data = json.loads(request.body)
+            service = get_object_or_404(Service, pk=data['service'], is_active=True)
+            time_slot = get_time_slot(data['time_slot'], service) if data.get('time_slot') else None
+            booking = create_booking(
+                service=service,
+                customer=request.user,
+                date=parse_date(data.get('date') or '') if not time_slot else None,
+                start_time=parse_time(data.get('start_time') or '') if not time_slot else None,
+                time_slot=time_slot,
+                provider=self.get_provider(service, data.get('provider')),
+                customer_name=data.get('customer_name', ''),
+                customer_email=data.get('customer_email', ''),
+                customer_phone=data.get('customer_phone', ''),
+                customer_notes=data.get('customer_notes', ''),
+                source=data.get('source', 'WEBSITE'),
+                ip_address=request.META.get('REMOTE_ADDR'),
+                user_agent=request.META.get('HTTP_USER_AGENT', ''),
+            )
+        except ScheduleConflict as exc:
+            return JsonResponse({'error': str(exc.message)}, status=409)
+        except (ValueError, KeyError, TypeError, ValidationError):
+            # ValidationError: a malformed UUID for service, time_slot or provider
+            return JsonResponse({'error': 'Invalid request body.'}, status=400)
+        except BookingError as exc:
+            return JsonResponse({'error': str(exc)}, status=409)
+        
+        return JsonResponse(booking_to_dict(booking), status=201)
+    
+    def get_provider(self, service, provider_id):
+        if not provider_id:
+            return None
+        provider = service.providers.filter(pk=provider_id).first()
+        if provider is None:
+            raise BookingError('This provider does not offer the service.')
+        return provider
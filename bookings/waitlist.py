@@ -0,0 +1,217 @@
+# apps/bookings/waitlist.py
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Case, F, Q, Value, When, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from .creation import BookingError, create_booking
+from .events import waitlist_offers_made
+from .models import TimeSlot, WaitlistEntry
+from .transitions import RELEASING_STATUSES
+
+HOLD_MINUTES = getattr(settings, 'WAITLIST_HOLD_MINUTES', 30)
+BATCH_SIZE = 1000
+
+
+def join_waitlist(service, customer, time_slot=None, date_from=None, date_to=None, priority=0):
+    if time_slot is not None:
+        date_from = date_to = time_slot.date
+    if date_from is None:
+        raise BookingError(_('A time slot or a date range is required.'))
+    return WaitlistEntry.objects.create(
+        business_id=service.business_id,
+        service=service,
+        customer=customer,
+        time_slot=time_slot,
+        date_from=date_from,
+        date_to=date_to or date_from,
+        priority=priority,
+    )
+
+
+def _adjust_capacity(deltas):
+    # One UPDATE for every slot in ``{slot_id: delta}``
+    deltas = {slot_id: delta for slot_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    TimeSlot.objects.filter(pk__in=list(deltas)).update(
+        current_bookings=F('current_bookings') + Case(
+            *[When(pk=slot_id, then=Value(delta)) for slot_id, delta in deltas.items()],
+            default=Value(0),
+            output_field=models.IntegerField(),
+        )
+    )
+
+
+def _pick_candidates(slots, free):
+    """
+    Choose waitlist entries for each slot, best first: entries waiting for
+    that exact slot (ranked per slot in one window query), then entries
+    waiting on any slot of the service within a date range (one query for
+    every slot's service and date, shared out in slot order).
+    """
+    picked = defaultdict(list)
+    taken = set()
+    
+    ranked = (
+        WaitlistEntry.objects.filter(time_slot_id__in=list(free), status='WAITING')
+        .annotate(rank=Window(
+            RowNumber(),
+            partition_by=[F('time_slot_id')],
+            order_by=[F('priority').desc(), F('created_at').asc()],
+        ))
+        .filter(rank__lte=max(free.values()))
+        .values_list('pk', 'time_slot_id', 'rank')
+    )
+    for pk, slot_id, rank in sorted(ranked, key=lambda row: row[2]):
+        if len(picked[slot_id]) < free[slot_id]:
+            picked[slot_id].append(pk)
+            taken.add(pk)
+    
+    open_slots = [slot for slot in slots if free[slot['pk']] > len(picked[slot['pk']])]
+    if not open_slots:
+        return picked
+    
+    wanted = Q()
+    for service_id, day in {(slot['service_id'], slot['date']) for slot in open_slots}:
+        wanted |= Q(service_id=service_id, date_from__lte=day, date_to__gte=day)
+    ranged = list(
+        WaitlistEntry.objects.filter(wanted, time_slot=None, status='WAITING')
+        .exclude(pk__in=taken)
+        .order_by('-priority', 'created_at')
+        .values_list('pk', 'service_id', 'date_from', 'date_to')
+    )
+    for slot in open_slots:
+        remaining = free[slot['pk']] - len(picked[slot['pk']])
+        for pk, service_id, date_from, date_to in ranged:
+            if remaining <= 0:
+                break
+            if pk not in taken and service_id == slot['service_id'] and date_from <= slot['date'] <= date_to:
+                picked[slot['pk']].append(pk)
+                taken.add(pk)
+                remaining -= 1
+    return picked
+
+
+def backfill_slots(slot_ids, now=None):
+    """
+    Offer freed capacity on ``slot_ids`` to the next waitlisted customers.
+    
+    Capacity is held for each offer (``current_bookings`` goes up) until it
+    is claimed or expires. Works on the whole set of slots at once: one
+    window query ranks slot-specific entries, and the offers and capacity
+    holds are each written with a single UPDATE. Returns the offered
+    entry pks.
+    """
+    now = now or timezone.now()
+    slot_ids = set(slot_ids)
+    if not slot_ids:
+        return []
+    
+    with transaction.atomic():
+        slots = list(
+            TimeSlot.objects.select_for_update()
+            .filter(pk__in=slot_ids, is_available=True, date__gte=timezone.localdate(now))
+            .filter(current_bookings__lt=F('max_bookings'))
+            .values('pk', 'service_id', 'date', 'max_bookings', 'current_bookings')
+        )
+        free = {slot['pk']: slot['max_bookings'] - slot['current_bookings'] for slot in slots}
+        if not free:
+            return []
+        
+        picked = {slot_id: pks for slot_id, pks in _pick_candidates(slots, free).items() if pks}
+        offered = [pk for pks in picked.values() for pk in pks]
+        if not offered:
+            return []
+        
+        WaitlistEntry.objects.filter(pk__in=offered, status='WAITING').update(
+            status='OFFERED',
+            offered_slot_id=Case(
+                *[When(pk__in=pks, then=Value(slot_id)) for slot_id, pks in picked.items()],
+                output_field=models.UUIDField(),
+            ),
+            offered_at=now,
+            offer_expires_at=now + timedelta(minutes=HOLD_MINUTES),
+        )
+        _adjust_capacity({slot_id: len(pks) for slot_id, pks in picked.items()})
+        
+        transaction.on_commit(lambda: waitlist_offers_made.send(sender=WaitlistEntry, entry_ids=offered))
+    return offered
+
+
+def claim_offer(entry_id, customer, **booking_fields):
+    """Turn a held offer into a booking; the capacity is already reserved."""
+    with transaction.atomic():
+        entry = (
+            WaitlistEntry.objects.select_for_update()
+            .select_related('service', 'offered_slot__provider')
+            .filter(pk=entry_id, customer=customer)
+            .first()
+        )
+        if entry is None or entry.status != 'OFFERED':
+            raise BookingError(_('There is no open offer for this waitlist entry.'))
+        if entry.offer_expires_at <= timezone.now():
+            raise BookingError(_('This offer has expired.'))
+        
+        booking = create_booking(
+            service=entry.service,
+            customer=customer,
+            date=None,
+            start_time=None,
+            time_slot=entry.offered_slot,
+            capacity_held=True,
+            **booking_fields,
+        )
+        entry.status = 'CLAIMED'
+        entry.booking = booking
+        entry.save(update_fields=['status', 'booking'])
+    return booking
+
+
+def decline_offer(entry_id, customer):
+    with transaction.atomic():
+        entry = WaitlistEntry.objects.select_for_update().filter(
+            pk=entry_id, customer=customer, status='OFFERED'
+        ).first()
+        if entry is None:
+            return []
+        WaitlistEntry.objects.filter(pk=entry.pk).update(status='CANCELLED')
+        _adjust_capacity({entry.offered_slot_id: -1})
+        return backfill_slots([entry.offered_slot_id])
+
+
+def expire_offers(now=None, batch_size=BATCH_SIZE):
+    """Expire lapsed offers in batches, return their capacity and re-offer it."""
+    now = now or timezone.now()
+    total = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                WaitlistEntry.objects.select_for_update(skip_locked=True)
+                .filter(status='OFFERED', offer_expires_at__lt=now)
+                .values_list('pk', 'offered_slot_id')[:batch_size]
+            )
+            if not rows:
+                return total
+            
+            WaitlistEntry.objects.filter(pk__in=[pk for pk, _ in rows]).update(status='EXPIRED')
+            released = Counter(slot_id for _, slot_id in rows if slot_id)
+            _adjust_capacity({slot_id: -count for slot_id, count in released.items()})
+            backfill_slots(released, now=now)
+        total += len(rows)
+
+
+def released_slots(rows, status):
+    """Slot ids freed by a ``bookings_transitioned`` batch."""
+    if status not in RELEASING_STATUSES:
+        return set()
+    return {
+        time_slot_id
+        for _, _, _, time_slot_id, _, old_status in rows
+        if time_slot_id and old_status not in RELEASING_STATUSES
+    }
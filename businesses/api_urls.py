@@ -0,0 +1,9 @@
+# apps/businesses/api_urls.py
+from django.urls import path
+from .views import NearbyBusinessesView
+
+app_name = 'businesses_api'
+
+urlpatterns = [
+    path('nearby/', NearbyBusinessesView.as_view(), name='nearby'),
+]
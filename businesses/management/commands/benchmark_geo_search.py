@@ -0,0 +1,101 @@
+# apps/businesses/management/commands/benchmark_geo_search.py
+import statistics
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.businesses.models import BusinessLocation
+from apps.businesses.search import nearby_businesses
+from apps.core.geo import (
+    SEARCH_START_PRECISION, covered_radius_km, encode, encode_many, haversine_km, neighbours,
+)
+from apps.core.instrumentation import record_queries
+
+
+class Command(BaseCommand):
+    help = (
+        'Time nearest-N search: geohash prefilter + vectorized haversine against a '
+        'full scan, over synthetic points in memory, or over stored locations with --db'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--points', type=int, default=1_000_000)
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument('--limit', type=int, default=50)
+        parser.add_argument('--db', action='store_true', help='Search stored BusinessLocation rows')
+        parser.add_argument('--seed', type=int, default=42)
+        # Defaults cover a region the size of a large metro area
+        parser.add_argument('--bbox', nargs=4, type=float, default=[24.4, 46.4, 25.0, 47.0],
+                            metavar=('LAT_MIN', 'LON_MIN', 'LAT_MAX', 'LON_MAX'))
+    
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options['seed'])
+        lat_min, lon_min, lat_max, lon_max = options['bbox']
+        points = list(zip(
+            rng.uniform(lat_min, lat_max, options['queries']).tolist(),
+            rng.uniform(lon_min, lon_max, options['queries']).tolist(),
+        ))
+        if options['db']:
+            self.bench_db(points, options['limit'])
+        else:
+            latitudes = rng.uniform(lat_min, lat_max, options['points'])
+            longitudes = rng.uniform(lon_min, lon_max, options['points'])
+            self.bench_memory(latitudes, longitudes, points, options['limit'])
+    
+    def bench_memory(self, latitudes, longitudes, points, limit):
+        started = time.perf_counter()
+        hashes = encode_many(latitudes, longitudes)
+        order = np.argsort(hashes)
+        hashes, latitudes, longitudes = hashes[order], latitudes[order], longitudes[order]
+        self.stdout.write(f'indexed {len(hashes):,} points in {time.perf_counter() - started:.2f}s')
+        
+        def full_scan(lat, lon):
+            distances = haversine_km(lat, lon, latitudes, longitudes)
+            return np.argpartition(distances, limit - 1)[:limit]
+        
+        def prefiltered(lat, lon):
+            # Same widening loop as core.geo.nearest, with searchsorted as the index
+            for precision in range(SEARCH_START_PRECISION, 0, -1):
+                radius = covered_radius_km(lat, precision)
+                ranges = [
+                    (np.searchsorted(hashes, cell, 'left'), np.searchsorted(hashes, cell + '~', 'left'))
+                    for cell in neighbours(encode(lat, lon, precision))
+                ]
+                candidates = np.concatenate([np.arange(start, end) for start, end in ranges])
+                distances = haversine_km(lat, lon, latitudes[candidates], longitudes[candidates])
+                close = distances <= radius
+                if close.sum() >= limit or precision == 1:
+                    break
+            within, distances = candidates[close], distances[close]
+            return within[np.argpartition(distances, min(limit, len(within)) - 1)[:limit]]
+        
+        mismatches = 0
+        for lat, lon in points[:20]:
+            if set(full_scan(lat, lon)) != set(prefiltered(lat, lon)):
+                mismatches += 1
+        
+        self.report('full scan', [self.timed(full_scan, lat, lon) for lat, lon in points])
+        self.report('geohash prefilter', [self.timed(prefiltered, lat, lon) for lat, lon in points])
+        self.stdout.write(f'result mismatches (of 20 checked): {mismatches}')
+    
+    def bench_db(self, points, limit):
+        if not BusinessLocation.objects.exists():
+            raise CommandError('No business locations stored; run without --db or load data first.')
+        for label in ('cold', 'cached'):
+            with record_queries() as recorder:
+                timings = [self.timed(nearby_businesses, lat, lon, '', limit) for lat, lon in points]
+            self.report(f'nearby_businesses ({label})', timings, recorder.count / len(points))
+    
+    def timed(self, func, *args):
+        started = time.perf_counter()
+        func(*args)
+        return (time.perf_counter() - started) * 1000
+    
+    def report(self, label, timings, queries=None):
+        timings.sort()
+        line = (f'{label:32} median {statistics.median(timings):8.2f} ms  '
+                f'p95 {timings[int(len(timings) * 0.95) - 1]:8.2f} ms')
+        if queries is not None:
+            line += f'  queries/search {queries:.1f}'
+        self.stdout.write(line)
@@ -1,3 +1,45 @@
+# apps/businesses/models.py
 from django.db import models
+from django.utils.translation import gettext_lazy as _
 
-# Create your models here.
+from apps.core.geo import encode
+
+
+class BusinessLocation(models.Model):
+    # Map position and timezone of a business, geohash-indexed for "near me" searches.
+    # Either can be set without the other; without coordinates the geohash
+    # stays empty and the business is left out of nearby searches.
+    business = models.OneToOneField('businesses.Business', on_delete=models.CASCADE,
+                                    primary_key=True, related_name='location')
+    
+    latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    geohash = models.CharField(max_length=12, blank=True, db_index=True, editable=False)
+    city = models.CharField(_('city'), max_length=100, blank=True)
+    # IANA zone the business's bookings and time slots are in (see businesses.timezones)
+    timezone = models.CharField(_('timezone'), max_length=50, blank=True)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = _('Business Location')
+        verbose_name_plural = _('Business Locations')
+    
+    def __str__(self):
+        return f"{self.business_id} ({self.latitude}, {self.longitude})"
+    
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or {'latitude', 'longitude'} & set(update_fields):
+            self.geohash = self.compute_geohash()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'geohash'}
+        super().save(*args, **kwargs)
+        
+        from .timezones import forget_timezone
+        forget_timezone(self.business_id)
+    
+    def compute_geohash(self):
+        if self.latitude is None or self.longitude is None:
+            return ''
+        return encode(self.latitude, self.longitude)
@@ -0,0 +1,67 @@
+# apps/businesses/search.py
+import hashlib
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import Exists, OuterRef, Q
+
+from apps.bookings.models import Service
+from apps.core.geo import nearest
+from .models import BusinessLocation
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 100
+MAX_RADIUS_KM = getattr(settings, 'GEO_SEARCH_MAX_RADIUS_KM', 50)
+
+
+def active_services(query=''):
+    services = Service.objects.filter(is_active=True)
+    if query:
+        services = services.filter(Q(name__icontains=query) | Q(name_ar__icontains=query))
+    return services
+
+
+def nearby_businesses(latitude, longitude, service_query='', limit=DEFAULT_LIMIT, max_radius_km=MAX_RADIUS_KM):
+    """
+    Businesses nearest to a point that offer an active service matching
+    ``service_query``, closest first, each with its matching services.
+    Costs one candidate query (skipped for cached areas) and one services
+    query.
+    """
+    query = service_query.strip().lower()
+    locations = BusinessLocation.objects.filter(
+        Exists(active_services(query).filter(business_id=OuterRef('business_id')))
+    )
+    ranked = nearest(
+        locations,
+        latitude,
+        longitude,
+        limit=min(limit, MAX_LIMIT),
+        max_radius_km=max_radius_km,
+        cache_prefix='business:' + hashlib.md5(query.encode()).hexdigest(),
+    )
+    if not ranked:
+        return []
+    
+    names, services = {}, defaultdict(list)
+    rows = (
+        active_services(query)
+        .filter(business_id__in=[pk for pk, _ in ranked])
+        .order_by('business_id', '-total_bookings')
+        .values('id', 'business_id', 'business__name', 'name', 'name_ar',
+                'duration_minutes', 'price', 'discounted_price')
+    )
+    for row in rows:
+        business_id = row.pop('business_id')
+        names[business_id] = row.pop('business__name')
+        services[business_id].append(row)
+    
+    return [
+        {
+            'business_id': business_id,
+            'business_name': names.get(business_id, ''),
+            'distance_km': round(distance, 3),
+            'services': services[business_id],
+        }
+        for business_id, distance in ranked
+    ]
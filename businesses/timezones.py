@@ -0,0 +1,44 @@
+# apps/businesses/timezones.py
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core.tz import DEFAULT_ZONE, get_zone
+
+from .models import BusinessLocation
+
+TIMEZONE_CACHE_TIMEOUT = getattr(settings, 'BUSINESS_TIMEZONE_CACHE_TIMEOUT', 3600)
+
+
+def _cache_key(business_id):
+    return f'business:tz:{business_id}'
+
+
+def business_timezones(business_ids):
+    """IANA zone name per business id; one cache round trip, one query for misses."""
+    business_ids = {str(business_id) for business_id in business_ids}
+    cached = cache.get_many([_cache_key(business_id) for business_id in business_ids])
+    zones = {business_id: cached.get(_cache_key(business_id)) for business_id in business_ids}
+    
+    missing = [business_id for business_id, zone in zones.items() if zone is None]
+    if missing:
+        found = {
+            str(business_id): zone
+            for business_id, zone in BusinessLocation.objects.filter(business_id__in=missing)
+            .exclude(timezone='')
+            .values_list('business_id', 'timezone')
+        }
+        fresh = {}
+        for business_id in missing:
+            # Validate once here so conversions can trust the name
+            zone = get_zone(found.get(business_id) or DEFAULT_ZONE).key
+            zones[business_id] = fresh[_cache_key(business_id)] = zone
+        cache.set_many(fresh, TIMEZONE_CACHE_TIMEOUT)
+    return zones
+
+
+def business_timezone(business_id):
+    return business_timezones([business_id])[str(business_id)]
+
+
+def forget_timezone(business_id):
+    cache.delete(_cache_key(business_id))
@@ -1,3 +1,22 @@
-from django.shortcuts import render
+# apps/businesses/views.py
+from django.http import JsonResponse
+from django.views import View
 
-# Create your views here.
+from .search import DEFAULT_LIMIT, MAX_LIMIT, nearby_businesses
+
+
+class NearbyBusinessesView(View):
+    http_method_names = ['get']
+    
+    def get(self, request):
+        try:
+            latitude = float(request.GET['lat'])
+            longitude = float(request.GET['lng'])
+            limit = int(request.GET.get('limit', DEFAULT_LIMIT))
+        except (KeyError, ValueError):
+            return JsonResponse({'error': 'lat and lng are required numbers.'}, status=400)
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180) or not 1 <= limit <= MAX_LIMIT:
+            return JsonResponse({'error': 'Coordinates or limit out of range.'}, status=400)
+        
+        results = nearby_businesses(latitude, longitude, request.GET.get('q', ''), limit=limit)
+        return JsonResponse({'results': results})
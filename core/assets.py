@@ -0,0 +1,147 @@
+# apps/core/assets.py
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+import urllib.request
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+
+# Third-party assets served from our own origin, pinned by version and by
+# the sha256 of the file. Paths are relative to the first STATICFILES_DIRS
+# entry; collectstatic then fingerprints and precompresses them. An entry
+# without a digest is refused: fetch it once from a trusted network and pin
+# the digest build_assets reports.
+VENDOR_ASSETS = {
+    'vendor/fullcalendar/6.1.8/index.global.min.js': (
+        'https://cdn.jsdelivr.net/npm/fullcalendar@6.1.8/index.global.min.js', None,
+    ),
+    'vendor/fullcalendar-interaction/6.1.8/index.global.min.js': (
+        'https://cdn.jsdelivr.net/npm/@fullcalendar/interaction@6.1.8/index.global.min.js', None,
+    ),
+    'vendor/alpinejs/3.13.3/cdn.min.js': (
+        'https://cdn.jsdelivr.net/npm/alpinejs@3.13.3/dist/cdn.min.js', None,
+    ),
+    'vendor/jquery/3.6.0/jquery.min.js': (
+        'https://code.jquery.com/jquery-3.6.0.min.js', None,
+    ),
+    'vendor/plotly/2.27.0/plotly.min.js': (
+        'https://cdn.plot.ly/plotly-2.27.0.min.js', None,
+    ),
+    'vendor/font-awesome/6.4.0/css/all.min.css': (
+        'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css', None,
+    ),
+}
+
+# all.min.css references these; manifest storage must find every one
+for font in ('fa-brands-400', 'fa-regular-400', 'fa-solid-900', 'fa-v4compatibility'):
+    for extension in ('woff2', 'ttf'):
+        VENDOR_ASSETS[f'vendor/font-awesome/6.4.0/webfonts/{font}.{extension}'] = (
+            f'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/webfonts/{font}.{extension}', None,
+        )
+
+TAILWIND_OUTPUT = 'css/tailwind.min.css'
+# In-browser compiler, used only until build_assets has compiled TAILWIND_OUTPUT
+TAILWIND_CDN = 'https://cdn.tailwindcss.com'
+TAILWIND_INPUT = '@tailwind base;\n@tailwind components;\n@tailwind utilities;\n'
+
+
+def static_source_dir():
+    return Path(settings.STATICFILES_DIRS[0])
+
+
+def is_built(relative):
+    """
+    Whether ``relative`` can be served from our own origin: found by the
+    finders in development, present in the collectstatic manifest otherwise.
+    """
+    if settings.DEBUG:
+        return finders.find(relative) is not None
+    try:
+        staticfiles_storage.stored_name(relative)
+    except ValueError:
+        return False
+    return True
+
+
+class AssetDigestMismatch(Exception):
+    pass
+
+
+def _download(url, target):
+    """
+    Stream ``url`` into a temporary file beside ``target``; returns the
+    temporary path and its sha256. A failed download leaves nothing behind.
+    """
+    digest = hashlib.sha256()
+    fd, partial = tempfile.mkstemp(dir=target.parent, prefix=f'.{target.name}.', suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as fh, urllib.request.urlopen(url, timeout=30) as response:
+            for chunk in iter(lambda: response.read(64 * 1024), b''):
+                digest.update(chunk)
+                fh.write(chunk)
+    except BaseException:
+        os.unlink(partial)
+        raise
+    return partial, digest.hexdigest()
+
+
+def fetch_vendor_assets(force=False, log=None):
+    """
+    Download missing vendor files, verify each against its pinned sha256
+    and only then move it into place; returns the paths written.
+    """
+    log = log or (lambda message: None)
+    root = static_source_dir()
+    written = []
+    for relative, (url, sha256) in VENDOR_ASSETS.items():
+        target = root / relative
+        if target.exists() and not force:
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        partial, digest = _download(url, target)
+        if digest != sha256:
+            os.unlink(partial)
+            if sha256 is None:
+                raise AssetDigestMismatch(
+                    f'{relative} has no pinned sha256; after checking the file, pin {digest} in VENDOR_ASSETS.'
+                )
+            raise AssetDigestMismatch(f'{relative}: expected sha256 {sha256}, downloaded {digest}.')
+        os.replace(partial, target)
+        log(f'fetched {relative} ({target.stat().st_size:,} bytes)')
+        written.append(target)
+    return written
+
+
+def template_globs():
+    dirs = [Path(directory) for template in settings.TEMPLATES for directory in template.get('DIRS', [])]
+    # App templates, for apps that ship their own
+    dirs += [Path(__file__).resolve().parent.parent / '*' / 'templates']
+    return [str(directory / '**' / '*.html') for directory in dirs]
+
+
+def build_tailwind(cli='tailwindcss'):
+    """
+    Compile only the Tailwind classes the templates use, with the
+    standalone CLI, instead of shipping the in-browser JIT compiler.
+    """
+    executable = shutil.which(cli)
+    if executable is None:
+        raise FileNotFoundError(
+            f'{cli} not found; install the Tailwind standalone CLI or pass --tailwind-cli.'
+        )
+    target = static_source_dir() / TAILWIND_OUTPUT
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile('w', suffix='.css') as source:
+        source.write(TAILWIND_INPUT)
+        source.flush()
+        subprocess.run(
+            [executable, '-i', source.name, '-o', str(target), '--minify',
+             '--content', ','.join(template_globs())],
+            check=True,
+        )
+    return target
@@ -0,0 +1,405 @@
+# apps/core/benchmarks.py
+import json
+import platform
+import statistics
+import subprocess
+import threading
+import time
+from datetime import timedelta
+
+from django.db import close_old_connections, connection
+from django.utils import timezone
+
+from .instrumentation import record_queries
+
+BENCHMARKS = {}
+
+
+def benchmark(name, repeat=10, setup=None):
+    """Register ``func(ctx)`` as a named benchmark scenario."""
+    def decorator(func):
+        BENCHMARKS[name] = {'func': func, 'repeat': repeat, 'setup': setup}
+        return func
+    return decorator
+
+
+class BenchmarkContext:
+    def __init__(self, business):
+        self.business = business
+        self.owner = business.owner
+        self.today = timezone.localdate()
+
+
+def _time(func, ctx):
+    with record_queries() as recorder:
+        started = time.perf_counter()
+        result = func(ctx)
+        elapsed = time.perf_counter() - started
+    return elapsed, recorder.count, result
+
+
+def run_benchmark(name, ctx, repeat=None):
+    spec = BENCHMARKS[name]
+    repeat = repeat or spec['repeat']
+    if spec['setup']:
+        spec['setup'](ctx)
+    
+    _time(spec['func'], ctx)  # warm-up
+    timings, queries, extra = [], 0, None
+    for _ in range(repeat):
+        elapsed, queries, result = _time(spec['func'], ctx)
+        timings.append(elapsed * 1000)
+        if isinstance(result, dict):
+            extra = result
+    
+    timings.sort()
+    row = {
+        'runs': repeat,
+        'min_ms': round(timings[0], 3),
+        'median_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+        'queries': queries,
+    }
+    if extra:
+        row.update(extra)
+    return row
+
+
+def run_suite(business, names=None, repeat=None, log=None):
+    log = log or (lambda message: None)
+    ctx = BenchmarkContext(business)
+    results = {}
+    for name in names or BENCHMARKS:
+        results[name] = run_benchmark(name, ctx, repeat=repeat)
+        log(f"{name:32} median {results[name]['median_ms']:>10.2f} ms  "
+            f"p95 {results[name]['p95_ms']:>10.2f} ms  queries {results[name]['queries']}")
+    
+    return {
+        'commit': _git_commit(),
+        'timestamp': timezone.now().isoformat(),
+        'database': database_profile(),
+        'python': platform.python_version(),
+        'business': str(business.pk),
+        'results': results,
+    }
+
+
+def database_profile():
+    settings_dict = connection.settings_dict
+    profile = {
+        'vendor': connection.vendor,
+        'conn_max_age': settings_dict.get('CONN_MAX_AGE'),
+        'pool': bool(settings_dict.get('OPTIONS', {}).get('pool')),
+    }
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            for pragma in ('journal_mode', 'synchronous', 'busy_timeout', 'mmap_size', 'cache_size'):
+                cursor.execute(f'PRAGMA {pragma}')
+                profile[pragma] = cursor.fetchone()[0]
+    return profile
+
+
+def compare(current, previous):
+    rows = []
+    for name, row in current['results'].items():
+        before = previous.get('results', {}).get(name)
+        if not before:
+            continue
+        change = (row['median_ms'] - before['median_ms']) / before['median_ms'] * 100 if before['median_ms'] else 0
+        rows.append((name, before['median_ms'], row['median_ms'], change))
+    return rows
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def dump(results, path):
+    with open(path, 'w') as fh:
+        json.dump(results, fh, indent=2, default=str)
+
+
+# Scenarios
+
+@benchmark('dashboard_home')
+def bench_dashboard_home(ctx):
+    from apps.dashboard.views import DashboardHomeView
+    stats = DashboardHomeView().get_business_stats(ctx.business)
+    list(stats['upcoming_bookings'])
+
+
+@benchmark('calendar_events')
+def bench_calendar_events(ctx):
+    from apps.bookings.models import Booking
+    from apps.dashboard.views import booking_to_event
+    bookings = Booking.objects.filter(
+        business=ctx.business,
+        date__gte=ctx.today - timedelta(days=30),
+        date__lte=ctx.today + timedelta(days=30),
+    ).select_related('service', 'customer')
+    json.dumps([booking_to_event(booking) for booking in bookings])
+
+
+def _booking_list(ctx, **filters):
+    from django.core.paginator import Paginator
+    from apps.dashboard.views import BookingListView
+    from django.test import RequestFactory
+    
+    request = RequestFactory().get('/dashboard/bookings/', filters)
+    request.user = ctx.owner
+    view = BookingListView()
+    view.setup(request)
+    page = Paginator(view.get_queryset(), view.paginate_by).page(1)
+    list(page.object_list)
+
+
+@benchmark('booking_list')
+def bench_booking_list(ctx):
+    _booking_list(ctx)
+
+
+@benchmark('booking_list_filtered')
+def bench_booking_list_filtered(ctx):
+    _booking_list(ctx, status='CONFIRMED', date_from=str(ctx.today - timedelta(days=90)))
+
+
+@benchmark('booking_search')
+def bench_booking_search(ctx):
+    _booking_list(ctx, search='Ahmed')
+
+
+@benchmark('booking_create_concurrent', repeat=3)
+def bench_booking_create_concurrent(ctx, threads=8, per_thread=25):
+    from apps.bookings.conflicts import ScheduleConflict, save_without_conflict
+    from apps.bookings.models import Booking
+    
+    template = Booking.objects.filter(business=ctx.business).exclude(provider=None).first()
+    created, lock = [], threading.Lock()
+    target = ctx.today + timedelta(days=3650)
+    
+    def worker(offset):
+        close_old_connections()
+        for i in range(per_thread):
+            # One booking per day keeps workers from conflicting with each other
+            booking = Booking(
+                business_id=template.business_id,
+                service_id=template.service_id,
+                customer_id=template.customer_id,
+                provider_id=template.provider_id,
+                date=target + timedelta(days=offset * per_thread + i),
+                start_time=template.start_time,
+                end_time=template.end_time,
+                customer_name=template.customer_name,
+                customer_email=template.customer_email,
+                customer_phone=template.customer_phone,
+                service_price=template.service_price,
+                total_amount=template.total_amount,
+                source='BENCHMARK',
+            )
+            try:
+                save_without_conflict(booking)
+            except ScheduleConflict:
+                continue
+            with lock:
+                created.append(booking.pk)
+        close_old_connections()
+    
+    started = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    
+    Booking.objects.filter(pk__in=created).delete()
+    return {'bookings_per_second': round(len(created) / elapsed, 1) if elapsed else None}
+
+
+@benchmark('revenue_report_year')
+def bench_revenue_report(ctx):
+    from apps.dashboard.reports import build_revenue_report
+    build_revenue_report(ctx.business, ctx.today - timedelta(days=365), ctx.today, 'month')
+
+
+@benchmark('chart_payloads_uncached')
+def bench_chart_payloads(ctx):
+    from apps.dashboard.charts import CHART_BUILDERS, dumps, resolve_range
+    start_date, end_date = resolve_range(30)
+    for builder in CHART_BUILDERS.values():
+        dumps(builder(ctx.business, start_date, end_date))
+
+
+@benchmark('mixed_writes_reads', repeat=1)
+def bench_mixed_writes_reads(ctx, writers=2, readers=8, duration=5.0):
+    """
+    Booking writers and dashboard readers running side by side; run once
+    per database profile (see DB_* settings) and compare throughput.
+    """
+    from django.db import DatabaseError
+    from apps.bookings.models import Booking
+    from apps.dashboard.views import DashboardHomeView
+    
+    template = Booking.objects.filter(business=ctx.business).first()
+    counts = {'writes': 0, 'reads': 0, 'errors': 0}
+    created, lock = [], threading.Lock()
+    deadline = time.perf_counter() + duration
+    
+    def writer(offset):
+        close_old_connections()
+        while time.perf_counter() < deadline:
+            booking = Booking(
+                business_id=template.business_id,
+                service_id=template.service_id,
+                customer_id=template.customer_id,
+                date=ctx.today + timedelta(days=7300 + offset),
+                start_time=template.start_time,
+                end_time=template.end_time,
+                customer_name=template.customer_name,
+                customer_email=template.customer_email,
+                customer_phone=template.customer_phone,
+                service_price=template.service_price,
+                total_amount=template.total_amount,
+                source='BENCHMARK',
+            )
+            try:
+                booking.save()
+            except DatabaseError:
+                outcome = 'errors'
+            else:
+                outcome = 'writes'
+            with lock:
+                counts[outcome] += 1
+                if outcome == 'writes':
+                    created.append(booking.pk)
+        close_old_connections()
+    
+    def reader():
+        close_old_connections()
+        view = DashboardHomeView()
+        while time.perf_counter() < deadline:
+            try:
+                stats = view.get_business_stats(ctx.business)
+                list(stats['upcoming_bookings'])
+            except DatabaseError:
+                outcome = 'errors'
+            else:
+                outcome = 'reads'
+            with lock:
+                counts[outcome] += 1
+        close_old_connections()
+    
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    Booking.objects.filter(pk__in=created).delete()
+    return {
+        'writes_per_second': round(counts['writes'] / duration, 1),
+        'reads_per_second': round(counts['reads'] / duration, 1),
+        'errors': counts['errors'],
+    }
+
+
+class _Rollback(Exception):
+    pass
+
+
+@benchmark('waitlist_burst_backfill', repeat=3)
+def bench_waitlist_burst(ctx, burst=30, waiting_per_slot=3):
+    """
+    Cancel ``burst`` upcoming slot bookings in one transition and let the
+    waitlist backfill the freed capacity; everything is rolled back.
+    """
+    from django.db import transaction
+    from apps.bookings.models import Booking, WaitlistEntry
+    from apps.bookings.transitions import bulk_transition
+    
+    bookings = list(
+        Booking.objects.filter(
+            business=ctx.business,
+            status__in=('PENDING', 'CONFIRMED'),
+            date__gte=ctx.today,
+        ).exclude(time_slot=None)
+        .values('pk', 'service_id', 'customer_id', 'time_slot_id', 'date')[:burst]
+    )
+    result = {}
+    try:
+        with transaction.atomic():
+            WaitlistEntry.objects.bulk_create([
+                WaitlistEntry(
+                    business_id=ctx.business.pk,
+                    service_id=row['service_id'],
+                    customer_id=row['customer_id'],
+                    time_slot_id=row['time_slot_id'],
+                    date_from=row['date'],
+                    date_to=row['date'],
+                    priority=n,
+                )
+                for row in bookings
+                for n in range(waiting_per_slot)
+            ])
+            started = time.perf_counter()
+            cancelled = bulk_transition(
+                Booking.objects.filter(pk__in=[row['pk'] for row in bookings]), 'CANCELLED'
+            )
+            elapsed = time.perf_counter() - started
+            result = {
+                'cancelled': cancelled,
+                'offers': WaitlistEntry.objects.filter(status='OFFERED').count(),
+                'cancellations_per_second': round(cancelled / elapsed, 1) if elapsed else None,
+            }
+            raise _Rollback
+    except _Rollback:
+        pass
+    return result
+
+
+@benchmark('archive_hot_table', repeat=1)
+def bench_archive_hot_table(ctx, samples=20):
+    """
+    Hot-table reads (dashboard home and the first booking list page)
+    before and after archiving every booking past the horizon; the archive
+    run is rolled back. On PostgreSQL the deleted rows are still dead
+    tuples inside the transaction, so the "after" figure is conservative:
+    for the settled numbers, save a ``run_benchmarks`` result, run
+    ``archive_bookings`` and ``VACUUM ANALYZE``, then ``--compare``.
+    """
+    from django.db import transaction
+    from apps.bookings.archive import archive_bookings
+    
+    def read_ms():
+        timings = []
+        for _ in range(samples):
+            started = time.perf_counter()
+            bench_dashboard_home(ctx)
+            bench_booking_list(ctx)
+            timings.append((time.perf_counter() - started) * 1000)
+        return round(statistics.median(timings), 3)
+    
+    result = {}
+    try:
+        with transaction.atomic():
+            before = read_ms()
+            started = time.perf_counter()
+            archived = archive_bookings()
+            elapsed = time.perf_counter() - started
+            after = read_ms()
+            result = {
+                'archived': archived,
+                'archive_seconds': round(elapsed, 2),
+                'hot_reads_before_ms': before,
+                'hot_reads_after_ms': after,
+            }
+            raise _Rollback
+    except _Rollback:
+        pass
+    return result
@@ -0,0 +1,105 @@
+# apps/core/db_router.py
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger('apps.core.replica')
+
+REPLICA_ALIAS = 'replica'
+
+# Set by ReplicaRoutingMiddleware (or use_replica()) for read-only work
+_read_alias = ContextVar('read_alias', default=None)
+
+_health = {'checked_at': 0.0, 'healthy': False}
+
+
+def replica_configured():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def replica_lag_seconds():
+    """
+    Replication delay of the replica, or ``None`` when it can't be measured.
+    Only PostgreSQL streaming replicas report lag; other backends (such as
+    the SQLite pair kept in sync by ``sync_sqlite_replica``) report 0.
+    
+    A replica that has replayed everything it received is caught up. The
+    age of the last replayed transaction only counts while WAL is still
+    pending replay: it keeps growing whenever the primary is idle.
+    """
+    connection = connections[REPLICA_ALIAS]
+    if connection.vendor != 'postgresql':
+        return 0.0
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT CASE '
+            'WHEN NOT pg_is_in_recovery() THEN 0 '
+            'WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+            'ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) '
+            'END'
+        )
+        return float(cursor.fetchone()[0])
+
+
+def replica_is_healthy():
+    interval = getattr(settings, 'DATABASE_REPLICA_CHECK_INTERVAL', 5)
+    now = time.monotonic()
+    if now - _health['checked_at'] < interval:
+        return _health['healthy']
+    
+    max_lag = getattr(settings, 'DATABASE_REPLICA_MAX_LAG', 5)
+    try:
+        lag = replica_lag_seconds()
+        healthy = lag is not None and lag <= max_lag
+        if not healthy:
+            logger.warning('Replica lag %.1fs over %ss, reading from primary', lag, max_lag)
+    except DatabaseError:
+        logger.exception('Replica health check failed, reading from primary')
+        healthy = False
+    
+    _health.update(checked_at=now, healthy=healthy)
+    return healthy
+
+
+def read_replica(view):
+    # Marks a function view as safe to serve from the replica
+    view.use_replica = True
+    return view
+
+
+@contextmanager
+def use_replica():
+    token = _read_alias.set(REPLICA_ALIAS)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Sends reads to the replica only inside ``use_replica()`` (which the
+    middleware enters for read-only views). Everything else, including any
+    read inside a transaction on the primary, stays on ``default``.
+    """
+    
+    def db_for_read(self, model, **hints):
+        if _read_alias.get() != REPLICA_ALIAS or not replica_configured():
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return REPLICA_ALIAS if replica_is_healthy() else DEFAULT_DB_ALIAS
+    
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+    
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+    
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,191 @@
+# apps/core/geo.py
+import hashlib
+import math
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from .lazy import lazy_import
+
+np = lazy_import('numpy')  # only the vectorized helpers need it
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+_DECODE = {char: index for index, char in enumerate(BASE32)}
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+# Stored precision: 9 characters is a cell of roughly 5 x 5 m
+GEOHASH_PRECISION = 9
+
+# Nearest-neighbour search starts with ~1.2 km cells and widens from there
+SEARCH_START_PRECISION = 6
+
+GEO_CACHE_TIMEOUT = getattr(settings, 'GEO_SEARCH_CACHE_TIMEOUT', 300)
+GEO_CACHE_MAX_CANDIDATES = getattr(settings, 'GEO_SEARCH_CACHE_MAX_CANDIDATES', 20000)
+
+
+def encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    latitude, longitude = float(latitude), float(longitude)
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        value, bounds = (longitude, lon_range) if even else (latitude, lat_range)
+        mid = (bounds[0] + bounds[1]) / 2
+        if value >= mid:
+            bits = bits * 2 + 1
+            bounds[0] = mid
+        else:
+            bits *= 2
+            bounds[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits, bit_count = 0, 0
+    return ''.join(chars)
+
+
+def encode_many(latitudes, longitudes, precision=GEOHASH_PRECISION):
+    """Vectorized ``encode`` for arrays of points; returns an array of str."""
+    total_bits = 5 * precision
+    lat_bits, lon_bits = total_bits // 2, (total_bits + 1) // 2
+    lat_cells = np.clip(
+        ((np.asarray(latitudes, dtype=np.float64) + 90) / 180 * 2 ** lat_bits).astype(np.int64),
+        0, 2 ** lat_bits - 1,
+    )
+    lon_cells = np.clip(
+        ((np.asarray(longitudes, dtype=np.float64) + 180) / 360 * 2 ** lon_bits).astype(np.int64),
+        0, 2 ** lon_bits - 1,
+    )
+    
+    # Interleave the bits, longitude first, as in encode()
+    code = np.zeros(lat_cells.shape, dtype=np.int64)
+    for bit in range(total_bits):
+        source, width = (lon_cells, lon_bits) if bit % 2 == 0 else (lat_cells, lat_bits)
+        code = (code << 1) | ((source >> (width - 1 - bit // 2)) & 1)
+    
+    shifts = np.arange(precision - 1, -1, -1, dtype=np.int64) * 5
+    indexes = (code[:, None] >> shifts) & 31
+    alphabet = np.frombuffer(BASE32.encode(), dtype=np.uint8)
+    return alphabet[indexes].view(f'S{precision}').ravel().astype(str)
+
+
+def decode_bounds(geohash):
+    """Return ``(lat_min, lat_max, lon_min, lon_max)`` of a cell."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        bits = _DECODE[char]
+        for shift in range(4, -1, -1):
+            bounds = lon_range if even else lat_range
+            mid = (bounds[0] + bounds[1]) / 2
+            if bits >> shift & 1:
+                bounds[0] = mid
+            else:
+                bounds[1] = mid
+            even = not even
+    return lat_range[0], lat_range[1], lon_range[0], lon_range[1]
+
+
+def cell_size(precision):
+    """Cell height and width in degrees at ``precision``."""
+    bits = 5 * precision
+    return 180 / 2 ** (bits // 2), 360 / 2 ** ((bits + 1) // 2)
+
+
+def neighbours(geohash):
+    """The cell and its (up to) eight neighbours, wrapping at the antimeridian."""
+    lat_min, lat_max, lon_min, lon_max = decode_bounds(geohash)
+    height, width = lat_max - lat_min, lon_max - lon_min
+    lat, lon = (lat_min + lat_max) / 2, (lon_min + lon_max) / 2
+    cells = set()
+    for dlat in (-height, 0, height):
+        cell_lat = lat + dlat
+        if not -90 < cell_lat < 90:
+            continue
+        for dlon in (-width, 0, width):
+            cell_lon = (lon + dlon + 180) % 360 - 180
+            cells.add(encode(cell_lat, cell_lon, len(geohash)))
+    return cells
+
+
+def covered_radius_km(latitude, precision):
+    """
+    Any point closer than this to ``latitude`` lies inside the 3 x 3 block
+    of cells around the point's own cell.
+    """
+    height, width = cell_size(precision)
+    edge_latitude = min(abs(float(latitude)) + height, 90)
+    return min(height * KM_PER_DEGREE, width * KM_PER_DEGREE * math.cos(math.radians(edge_latitude)))
+
+
+def cells_filter(cells, field='geohash'):
+    # Prefix matches as index range scans; '~' sorts after every base32 char
+    query = Q()
+    for cell in sorted(cells):
+        query |= Q(**{f'{field}__gte': cell, f'{field}__lt': cell + '~'})
+    return query
+
+
+def haversine_km(latitude, longitude, latitudes, longitudes):
+    """Great-circle distances from one point to arrays of points."""
+    lat1, lon1 = math.radians(float(latitude)), math.radians(float(longitude))
+    lat2, lon2 = np.radians(latitudes), np.radians(longitudes)
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def _candidates(queryset, cells, cache_key):
+    if cache_key:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+    
+    rows = list(queryset.filter(cells_filter(cells)).values_list('pk', 'latitude', 'longitude'))
+    candidates = (
+        [pk for pk, _, _ in rows],
+        np.array([float(lat) for _, lat, _ in rows], dtype=np.float64),
+        np.array([float(lon) for _, _, lon in rows], dtype=np.float64),
+    )
+    if cache_key and len(rows) <= GEO_CACHE_MAX_CANDIDATES:
+        cache.set(cache_key, candidates, GEO_CACHE_TIMEOUT)
+    return candidates
+
+
+def nearest(queryset, latitude, longitude, limit=50, max_radius_km=50, cache_prefix=None):
+    """
+    Return up to ``limit`` ``(pk, distance_km)`` pairs from ``queryset``
+    nearest to the point, closest first.
+    
+    ``queryset`` rows need ``geohash``, ``latitude`` and ``longitude``.
+    Candidates come from the 3 x 3 block of geohash cells around the
+    point (index range scans), and are ranked with a vectorized haversine.
+    The block widens one precision step at a time until it holds ``limit``
+    rows that are provably nearest, or covers ``max_radius_km``.
+    
+    With ``cache_prefix``, the candidate set of each block is cached, so
+    searches from anywhere in a popular area skip the database.
+    """
+    for precision in range(SEARCH_START_PRECISION, 0, -1):
+        radius = min(covered_radius_km(latitude, precision), max_radius_km)
+        cells = neighbours(encode(latitude, longitude, precision))
+        cache_key = None
+        if cache_prefix:
+            digest = hashlib.md5(','.join(sorted(cells)).encode()).hexdigest()
+            cache_key = f'geo:{cache_prefix}:{digest}'
+        pks, latitudes, longitudes = _candidates(queryset, cells, cache_key)
+        
+        distances = haversine_km(latitude, longitude, latitudes, longitudes)
+        within = np.flatnonzero(distances <= radius)
+        if len(within) >= limit or radius >= max_radius_km or precision == 1:
+            break
+    
+    if len(within) > limit:
+        within = within[np.argpartition(distances[within], limit - 1)[:limit]]
+    within = within[np.argsort(distances[within], kind='stable')]
+    return [(pks[index], float(distances[index])) for index in within]
@@ -0,0 +1,165 @@
+# apps/core/idempotency.py
+import hashlib
+import time
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+
+from .models import IdempotencyKey
+
+HEADER = 'HTTP_IDEMPOTENCY_KEY'
+KEY_TTL = getattr(settings, 'IDEMPOTENCY_KEY_TTL', timedelta(hours=24))
+WAIT_TIMEOUT = getattr(settings, 'IDEMPOTENCY_WAIT_TIMEOUT', 10)
+LOCK_TIMEOUT = getattr(settings, 'IDEMPOTENCY_LOCK_TIMEOUT', timedelta(seconds=60))
+MAX_KEY_LENGTH = 255
+# Dead records taken over per request before giving up on a contended key
+CLAIM_ATTEMPTS = 3
+
+
+def _request_hash(request):
+    return hashlib.sha256(request.body).hexdigest()
+
+
+def _replay(record):
+    response = HttpResponse(
+        bytes(record.response_body),
+        status=record.status_code,
+        content_type=record.content_type or 'application/json',
+    )
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def _is_dead(record, now=None):
+    # Expired, or claimed by a worker that never finished (e.g. was killed)
+    now = now or timezone.now()
+    if record.expires_at <= now:
+        return True
+    return not record.completed and record.locked_until is not None and record.locked_until <= now
+
+
+def _release_dead(record):
+    """Delete ``record`` if it is dead, so the key can be claimed again."""
+    now = timezone.now()
+    if not _is_dead(record, now):
+        return False
+    # Conditional, so a record re-claimed meanwhile is left alone
+    (
+        IdempotencyKey.objects.filter(pk=record.pk)
+        .filter(Q(expires_at__lte=now) | Q(completed=False, locked_until__lte=now))
+        .delete()
+    )
+    return True
+
+
+def _claim(scope, key, request_hash):
+    # The unique index decides which request owns the key
+    now = timezone.now()
+    try:
+        with transaction.atomic():
+            return IdempotencyKey.objects.create(
+                scope=scope,
+                key=key,
+                request_hash=request_hash,
+                expires_at=now + KEY_TTL,
+                locked_until=now + LOCK_TIMEOUT,
+            )
+    except IntegrityError:
+        return None
+
+
+def _wait_for(scope, key, timeout):
+    # Another request holds the key; poll until it stores its response
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    while time.monotonic() < deadline:
+        record = IdempotencyKey.objects.filter(scope=scope, key=key).first()
+        if record is None or record.completed or _is_dead(record):
+            return record
+        time.sleep(delay)
+        delay = min(delay * 2, 0.5)
+    return IdempotencyKey.objects.filter(scope=scope, key=key).first()
+
+
+def idempotent(scope):
+    """
+    Make a view safe to retry with an ``Idempotency-Key`` header.
+    
+    The first request with a key claims it through the unique index and
+    runs the view; its response (unless 5xx) is stored until the key
+    expires. Retries get the stored response. Concurrent duplicates wait
+    for it. Expired keys, and claims whose lease ran out before a response
+    was stored, count as absent and are claimed again. Requests without
+    the header run normally.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            key = request.META.get(HEADER)
+            if not key:
+                return view(request, *args, **kwargs)
+            if len(key) > MAX_KEY_LENGTH:
+                return JsonResponse({'error': 'Idempotency-Key is too long.'}, status=400)
+            
+            caller = request.user.pk if request.user.is_authenticated else 'anonymous'
+            full_scope = f'{scope}:{caller}'
+            request_hash = _request_hash(request)
+            
+            for _attempt in range(CLAIM_ATTEMPTS):
+                record = _claim(full_scope, key, request_hash)
+                if record is not None:
+                    break
+                record = _wait_for(full_scope, key, WAIT_TIMEOUT)
+                if record is None or _release_dead(record):
+                    # The first attempt failed, expired or was abandoned; claim it again
+                    continue
+                if record.request_hash != request_hash:
+                    return JsonResponse(
+                        {'error': 'Idempotency-Key was already used with a different request.'},
+                        status=422,
+                    )
+                if not record.completed:
+                    return JsonResponse({'error': 'A request with this key is still in progress.'}, status=409)
+                return _replay(record)
+            else:
+                # Every claim lost to another request that then died or expired
+                return JsonResponse({'error': 'Idempotency-Key is contended; retry the request.'}, status=409)
+            
+            try:
+                response = view(request, *args, **kwargs)
+            except Exception:
+                record.delete()
+                raise
+            
+            if response.status_code >= 500 or getattr(response, 'streaming', False):
+                record.delete()
+                return response
+            
+            IdempotencyKey.objects.filter(pk=record.pk).update(
+                completed=True,
+                locked_until=None,
+                status_code=response.status_code,
+                content_type=response.get('Content-Type', ''),
+                response_body=response.content,
+            )
+            return response
+        return wrapper
+    return decorator
+
+
+def purge_expired_keys(batch_size=5000, now=None):
+    now = now or timezone.now()
+    total = 0
+    while True:
+        ids = list(
+            IdempotencyKey.objects.filter(expires_at__lt=now)
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if not ids:
+            return total
+        total += IdempotencyKey.objects.filter(pk__in=ids).delete()[0]
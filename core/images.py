@@ -0,0 +1,210 @@
+# apps/core/images.py
+import hashlib
+import io
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+VARIANT_WIDTHS = tuple(getattr(settings, 'IMAGE_VARIANT_WIDTHS', (160, 320, 640, 1280)))
+JPEG_QUALITY = 82
+WEBP_QUALITY = 80
+MAX_UPLOAD_BYTES = getattr(settings, 'IMAGE_MAX_UPLOAD_BYTES', 20 * 1024 * 1024)
+
+# Refuse decompression bombs instead of allocating gigabytes for them
+Image.MAX_IMAGE_PIXELS = getattr(settings, 'IMAGE_MAX_PIXELS', 40_000_000)
+
+# model label -> (image field, variants field, storage prefix)
+IMAGE_FIELDS = {
+    'bookings.Service': ('image', 'image_variants', 'services'),
+    'accounts.User': ('avatar', 'avatar_variants', 'avatars'),
+}
+
+
+class ImageProcessingError(Exception):
+    pass
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:24]
+
+
+def _flatten(image):
+    background = Image.new('RGB', image.size, (255, 255, 255))
+    background.paste(image, mask=image.getchannel('A'))
+    return background
+
+
+def _encode(image, image_format, **options):
+    buffer = io.BytesIO()
+    image.save(buffer, image_format, **options)
+    return buffer.getvalue()
+
+
+def render_variants(data, widths=VARIANT_WIDTHS):
+    """
+    Decode ``data`` once and return ``[(width, height, extension, bytes)]``
+    with a WebP and a JPEG per width (never upscaled).
+    
+    Only pixels are written: EXIF (after applying its orientation), ICC
+    and XMP metadata are dropped. JPEG sources are decoded at a reduced
+    scale close to the largest width, which keeps memory proportional to
+    the output rather than to the camera resolution. Pure bytes in,
+    bytes out, so it can run in a worker process.
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as source:
+            largest = max(widths)
+            source.draft('RGB', (largest, largest))
+            image = ImageOps.exif_transpose(source)
+            has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+            image = image.convert('RGBA' if has_alpha else 'RGB')
+    except (OSError, ValueError, Image.DecompressionBombError) as exc:
+        raise ImageProcessingError(str(exc)) from exc
+    image.info = {}
+    
+    variants = []
+    for width in sorted({min(width, image.width) for width in widths}):
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.Resampling.LANCZOS)
+        variants.append((width, height, 'webp', _encode(resized, 'WEBP', quality=WEBP_QUALITY, method=4)))
+        opaque = _flatten(resized) if has_alpha else resized
+        variants.append((width, height, 'jpg', _encode(opaque, 'JPEG', quality=JPEG_QUALITY,
+                                                      optimize=True, progressive=True)))
+    return variants
+
+
+def build_manifest(prefix, digest, variants):
+    by_width = {}
+    for width, height, extension, _ in variants:
+        entry = by_width.setdefault(width, {'width': width, 'height': height})
+        entry[extension] = f'{prefix}/{digest}/{width}w.{extension}'
+    return {'hash': digest, 'variants': [by_width[width] for width in sorted(by_width)]}
+
+
+def load_manifest(prefix, digest, storage=default_storage):
+    name = f'{prefix}/{digest}/manifest.json'
+    if not storage.exists(name):
+        return None
+    with storage.open(name, 'rb') as fh:
+        return json.loads(fh.read())
+
+
+def save_variants(prefix, digest, variants, storage=default_storage):
+    """
+    Write rendered variants under ``<prefix>/<content hash>/`` and return
+    their manifest. Names depend only on the content, so identical uploads
+    share one set of files and are only processed once.
+    """
+    for width, _, extension, payload in variants:
+        name = f'{prefix}/{digest}/{width}w.{extension}'
+        if not storage.exists(name):
+            storage.save(name, ContentFile(payload))
+    
+    manifest = build_manifest(prefix, digest, variants)
+    storage.save(f'{prefix}/{digest}/manifest.json', ContentFile(json.dumps(manifest).encode()))
+    return manifest
+
+
+def read_upload(name, storage=default_storage):
+    if storage.size(name) > MAX_UPLOAD_BYTES:
+        raise ImageProcessingError(f'{name} is larger than {MAX_UPLOAD_BYTES} bytes.')
+    with storage.open(name, 'rb') as fh:
+        return fh.read()
+
+
+def needs_processing(instance, label, update_fields=None):
+    """
+    Whether a saved row's image has no current manifest. Saves that don't
+    write the image field (e.g. ``update_fields=['last_login']``) never
+    need processing; a manifest recording a failure counts as current.
+    """
+    field, variants_field, _ = IMAGE_FIELDS[label]
+    if update_fields is not None and field not in update_fields:
+        return False
+    if {field, variants_field} & instance.get_deferred_fields():
+        return False
+    name = getattr(instance, field).name or ''
+    return (getattr(instance, variants_field) or {}).get('source', '') != name
+
+
+def record_failure(label, pk, name, error):
+    # Marks the upload as handled, so it isn't re-enqueued on every save;
+    # a new upload (different name) is processed again
+    return record_manifest(label, pk, name, {'error': str(error)[:200]})
+
+
+def record_manifest(label, pk, name, manifest):
+    # Queryset update: no save() signals, and only if the upload is unchanged
+    field, variants_field, _ = IMAGE_FIELDS[label]
+    if name:
+        manifest = {**manifest, 'source': name}
+    apps.get_model(label).objects.filter(pk=pk, **{field: name}).update(**{variants_field: manifest})
+    return manifest
+
+
+def pending_images(label, batch_size=1000):
+    """Yield ``(pk, name)`` for rows whose image has no current variants."""
+    field, variants_field, _ = IMAGE_FIELDS[label]
+    rows = (
+        apps.get_model(label).objects.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True})
+        .values_list('pk', field, variants_field)
+        .iterator(chunk_size=batch_size)
+    )
+    for pk, name, manifest in rows:
+        if (manifest or {}).get('source') != name:
+            yield pk, name
+
+
+def process_field(label, pk):
+    """Render, store and record the variants for one row's image."""
+    field, variants_field, prefix = IMAGE_FIELDS[label]
+    row = apps.get_model(label).objects.filter(pk=pk).values(field, variants_field).first()
+    if row is None:
+        return None
+    
+    name = row[field] or ''
+    if not name:
+        return record_manifest(label, pk, name, {})
+    if (row[variants_field] or {}).get('source') == name:
+        return row[variants_field]
+    
+    try:
+        data = read_upload(name)
+        digest = content_hash(data)
+        manifest = load_manifest(prefix, digest) or save_variants(prefix, digest, render_variants(data))
+    except ImageProcessingError as exc:
+        return record_failure(label, pk, name, exc)
+    return record_manifest(label, pk, name, manifest)
+
+
+def iter_rendered(jobs, workers=None, max_in_flight=None, max_tasks_per_child=50):
+    """
+    Render ``(key, data)`` jobs in a process pool and yield ``(key, variants)``
+    as they finish, or ``(key, ImageProcessingError)`` for unreadable images.
+    
+    At most ``max_in_flight`` source images are held at once (``jobs`` is
+    consumed lazily) and workers are replaced after ``max_tasks_per_child``
+    images, so memory stays bounded however large the batch is.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 2
+    jobs = iter(jobs)
+    with ProcessPoolExecutor(workers, max_tasks_per_child=max_tasks_per_child) as pool:
+        pending = {pool.submit(render_variants, data): key for key, data in islice(jobs, max_in_flight)}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = pending.pop(future)
+                try:
+                    yield key, future.result()
+                except ImageProcessingError as exc:
+                    yield key, exc
+                for next_key, data in islice(jobs, 1):
+                    pending[pool.submit(render_variants, data)] = next_key
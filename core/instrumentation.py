@@ -0,0 +1,151 @@
+# apps/core/instrumentation.py
+import re
+import threading
+import time
+import traceback
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager, ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+_PROJECT_ROOT = str(getattr(settings, 'BASE_DIR', ''))
+
+
+def fingerprint(sql):
+    # Django keeps parameters out of the SQL, so only inline literals and
+    # variable-length IN lists need collapsing
+    return _LITERALS.sub('?', _IN_LIST.sub('IN (...)', sql))
+
+
+def _call_site():
+    for frame in reversed(traceback.extract_stack()):
+        filename = frame.filename
+        if (
+            filename.startswith(_PROJECT_ROOT)
+            and 'site-packages' not in filename
+            and not filename.endswith('instrumentation.py')
+        ):
+            return f'{filename[len(_PROJECT_ROOT):].lstrip("/")}:{frame.lineno} ({frame.name})'
+    return '<unknown>'
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryRecorder:
+    """``execute_wrapper`` that tallies queries, DB time and repeated SQL."""
+    
+    def __init__(self, capture_stacks=False):
+        self.capture_stacks = capture_stacks
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+        self.call_sites = defaultdict(Counter)
+    
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            key = fingerprint(sql)
+            self.fingerprints[key] += 1
+            if self.capture_stacks:
+                self.call_sites[key][_call_site()] += 1
+    
+    def duplicates(self, threshold=2):
+        return [(sql, count) for sql, count in self.fingerprints.most_common() if count >= threshold]
+    
+    def top_call_sites(self, threshold=2, limit=5):
+        sites = Counter()
+        for sql, count in self.duplicates(threshold):
+            sites.update(self.call_sites.get(sql, {}))
+        return sites.most_common(limit)
+
+
+@contextmanager
+def record_queries(capture_stacks=False, using=None):
+    recorder = QueryRecorder(capture_stacks=capture_stacks)
+    aliases = [using] if using else list(connections)
+    with ExitStack() as stack:
+        for alias in aliases:
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+        yield recorder
+
+
+@contextmanager
+def query_budget(max_queries, capture_stacks=True):
+    """
+    Fail when the wrapped block runs more than ``max_queries`` queries.
+    Meant for tests::
+    
+        with query_budget(5):
+            client.get('/dashboard/')
+    """
+    with record_queries(capture_stacks=capture_stacks) as recorder:
+        yield recorder
+    if recorder.count > max_queries:
+        raise QueryBudgetExceeded(budget_message(recorder, max_queries))
+
+
+def budget_message(recorder, max_queries):
+    lines = [f'{recorder.count} queries executed, budget is {max_queries}.']
+    for sql, count in recorder.duplicates()[:5]:
+        lines.append(f'  {count}x {sql[:200]}')
+    for site, count in recorder.top_call_sites():
+        lines.append(f'  {count}x from {site}')
+    return '\n'.join(lines)
+
+
+class RequestStats:
+    """Rolling per-URL-name samples of request time, DB time and query count."""
+    
+    def __init__(self, window=500):
+        self.window = window
+        self._samples = defaultdict(lambda: deque(maxlen=self.window))
+        self._lock = threading.Lock()
+    
+    def add(self, name, total_ms, db_ms, queries):
+        with self._lock:
+            self._samples[name].append((total_ms, db_ms, queries))
+    
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+    
+    def snapshot(self):
+        with self._lock:
+            samples = {name: list(values) for name, values in self._samples.items()}
+        
+        table = []
+        for name, values in samples.items():
+            totals = sorted(v[0] for v in values)
+            db = sorted(v[1] for v in values)
+            queries = sorted(v[2] for v in values)
+            table.append({
+                'name': name,
+                'requests': len(values),
+                'p50_ms': _percentile(totals, 50),
+                'p95_ms': _percentile(totals, 95),
+                'db_p50_ms': _percentile(db, 50),
+                'db_p95_ms': _percentile(db, 95),
+                'queries_p50': _percentile(queries, 50),
+                'queries_p95': _percentile(queries, 95),
+            })
+        return sorted(table, key=lambda row: row['p95_ms'], reverse=True)
+
+
+def _percentile(values, percent):
+    if not values:
+        return 0
+    index = min(len(values) - 1, max(0, round(percent / 100 * len(values)) - 1))
+    return round(values[index], 2)
+
+
+request_stats = RequestStats()
@@ -0,0 +1,62 @@
+# apps/core/lazy.py
+import importlib
+import sys
+import threading
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access.
+        
+        np = lazy_import('numpy')
+    
+    keeps numpy out of Django setup: processes that never touch ``np.*``
+    (most workers and management commands) never pay for the import.
+    """
+    
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+        self.__dict__['_lock'] = threading.Lock()
+    
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            with self.__dict__['_lock']:
+                module = self.__dict__['_module']
+                if module is None:
+                    module = importlib.import_module(self.__dict__['_name'])
+                    self.__dict__['_module'] = module
+        return module
+    
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+    
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+    
+    def __dir__(self):
+        return dir(self._load())
+    
+    def __repr__(self):
+        state = 'loaded' if self.__dict__['_module'] is not None else 'not loaded'
+        return f"<lazy module '{self.__dict__['_name']}' ({state})>"
+    
+    @property
+    def is_loaded(self):
+        return self.__dict__['_module'] is not None or self.__dict__['_name'] in sys.modules
+
+
+_registry = {}
+
+
+def lazy_import(name):
+    """One shared ``LazyModule`` per module name."""
+    module = _registry.get(name)
+    if module is None:
+        module = _registry.setdefault(name, LazyModule(name))
+    return module
+
+
+def lazy_modules():
+    return dict(_registry)
@@ -0,0 +1,102 @@
+# apps/core/loadtest.py
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+
+class _Connection:
+    """Minimal keep-alive HTTP/1.1 client; enough for JSON endpoints."""
+    
+    def __init__(self, host, port, ssl):
+        self.host, self.port, self.ssl = host, port, ssl
+        self.reader = self.writer = None
+    
+    async def request(self, raw):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+        self.writer.write(raw)
+        await self.writer.drain()
+        
+        head = await self.reader.readuntil(b'\r\n\r\n')
+        lines = head.decode('latin-1').split('\r\n')
+        status = int(lines[0].split()[1])
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+        
+        if 'content-length' in headers:
+            await self.reader.readexactly(int(headers['content-length']))
+        else:
+            await self.reader.read()
+            await self.close()
+        if headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status, headers
+    
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+
+def build_request(url, headers=()):
+    parts = urlsplit(url)
+    path = parts.path or '/'
+    if parts.query:
+        path += '?' + parts.query
+    lines = [f'GET {path} HTTP/1.1', f'Host: {parts.netloc}', 'Connection: keep-alive']
+    lines.extend(headers)
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode()
+
+
+async def run_load(url, concurrency, duration, headers=(), on_response=None):
+    """
+    Keep ``concurrency`` clients busy against ``url`` for ``duration``
+    seconds and report throughput and latency percentiles.
+    """
+    parts = urlsplit(url)
+    ssl = parts.scheme == 'https'
+    port = parts.port or (443 if ssl else 80)
+    raw = build_request(url, headers)
+    
+    latencies, statuses, errors = [], {}, 0
+    deadline = time.perf_counter() + duration
+    
+    async def client():
+        nonlocal errors
+        connection = _Connection(parts.hostname, port, ssl)
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                status, response_headers = await connection.request(raw)
+            except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+                errors += 1
+                await connection.close()
+                continue
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+            if on_response is not None:
+                on_response(status, response_headers)
+        await connection.close()
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    
+    latencies.sort()
+    return {
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': errors,
+        'statuses': statuses,
+        'requests_per_second': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(statistics.median(latencies) * 1000, 2) if latencies else None,
+        'p95_ms': round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2) if latencies else None,
+    }
@@ -0,0 +1,40 @@
+# apps/core/management/commands/backfill_geohashes.py
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from apps.businesses.models import BusinessLocation
+from apps.core.geo import encode_many
+
+
+class Command(BaseCommand):
+    help = 'Fill in geohash columns for users and business locations in chunks'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+    
+    def handle(self, *args, **options):
+        users = get_user_model().objects.exclude(latitude=None).exclude(longitude=None)
+        locations = BusinessLocation.objects.exclude(latitude=None).exclude(longitude=None)
+        for label, queryset in (('users', users), ('business locations', locations)):
+            count = self.backfill(queryset, options['batch_size'])
+            self.stdout.write(f'{label}: {count} geohashes updated')
+    
+    def backfill(self, queryset, batch_size):
+        model = queryset.model
+        queryset = queryset.order_by('pk')
+        total, last_pk = 0, None
+        while True:
+            batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            rows = list(batch.values_list('pk', 'latitude', 'longitude', 'geohash')[:batch_size])
+            if not rows:
+                return total
+            last_pk = rows[-1][0]
+            
+            hashes = encode_many([float(row[1]) for row in rows], [float(row[2]) for row in rows])
+            changed = [
+                model(pk=pk, geohash=geohash)
+                for (pk, _, _, current), geohash in zip(rows, hashes)
+                if current != geohash
+            ]
+            model.objects.bulk_update(changed, ['geohash'])
+            total += len(changed)
@@ -0,0 +1,60 @@
+# apps/core/management/commands/benchmark_images.py
+import resource
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.images import ImageProcessingError, iter_rendered, render_variants
+
+EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.gif', '.tif', '.tiff', '.bmp'}
+
+
+class Command(BaseCommand):
+    help = 'Measure image variant throughput and memory on a folder of sample images (nothing is stored)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('folder')
+        parser.add_argument('--workers', type=int)
+        parser.add_argument('--max-in-flight', type=int)
+        parser.add_argument('--serial', action='store_true', help='Also time a single-process run')
+    
+    def handle(self, *args, **options):
+        paths = sorted(path for path in Path(options['folder']).rglob('*') if path.suffix.lower() in EXTENSIONS)
+        if not paths:
+            raise CommandError('No images found.')
+        bytes_in = sum(path.stat().st_size for path in paths)
+        self.stdout.write(f'{len(paths)} images, {bytes_in / 1e6:.1f} MB')
+        
+        if options['serial']:
+            started = time.perf_counter()
+            bytes_out = 0
+            for path in paths:
+                try:
+                    bytes_out += sum(len(variant[3]) for variant in render_variants(path.read_bytes()))
+                except ImageProcessingError:
+                    pass
+            self.report('serial', len(paths), time.perf_counter() - started, bytes_in, bytes_out)
+        
+        started = time.perf_counter()
+        bytes_out = failed = 0
+        jobs = ((path, path.read_bytes()) for path in paths)
+        for _, result in iter_rendered(jobs, workers=options['workers'], max_in_flight=options['max_in_flight']):
+            if isinstance(result, ImageProcessingError):
+                failed += 1
+            else:
+                bytes_out += sum(len(variant[3]) for variant in result)
+        self.report('pool', len(paths), time.perf_counter() - started, bytes_in, bytes_out)
+        
+        # ru_maxrss is in KiB on Linux
+        self.stdout.write(f'peak RSS: parent {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB, '
+                          f'largest worker {resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024:.0f} MiB')
+        if failed:
+            self.stdout.write(f'{failed} images could not be decoded')
+    
+    def report(self, label, count, elapsed, bytes_in, bytes_out):
+        self.stdout.write(
+            f'{label:7} {count / elapsed:8.1f} images/s  '
+            f'{bytes_in / 1e6 / elapsed:7.1f} MB/s in  '
+            f'output {bytes_out / 1e6:.1f} MB for all variants'
+        )
@@ -0,0 +1,91 @@
+# apps/core/management/commands/benchmark_timezones.py
+import random
+import time
+from datetime import date, datetime, time as dt_time, timedelta, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand
+
+from apps.core import tz
+
+ZONES = (
+    'UTC', 'Asia/Riyadh', 'Europe/London', 'Europe/Berlin', 'America/New_York',
+    'America/Santiago', 'Australia/Lord_Howe', 'Asia/Kolkata',
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Convert local booking times to UTC with the cached offset tables and compare '
+        'speed and results against per-row zoneinfo conversion'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000)
+        parser.add_argument('--baseline-rows', type=int, default=100_000,
+                            help='Rows converted per-row with zoneinfo (the rate is extrapolated)')
+        parser.add_argument('--from-db', action='store_true',
+                            help='Convert stored bookings (in their business timezones) instead of synthetic rows')
+        parser.add_argument('--seed', type=int, default=42)
+    
+    def handle(self, *args, **options):
+        groups = self.load_db(options) if options['from_db'] else self.synthetic(options)
+        total = sum(len(dates) for dates, _ in groups.values())
+        
+        tz.offset_table.cache_clear()
+        started = time.perf_counter()
+        converted = {zone: tz.to_utc_epoch(zone, dates, times) for zone, (dates, times) in groups.items()}
+        cold = time.perf_counter() - started
+        started = time.perf_counter()
+        converted = {zone: tz.to_utc_epoch(zone, dates, times) for zone, (dates, times) in groups.items()}
+        warm = time.perf_counter() - started
+        self.stdout.write(
+            f'offset tables: {total:,} rows in {len(groups)} zones, '
+            f'{cold:.3f}s cold ({tz.offset_table.cache_info().currsize} tables built), '
+            f'{warm:.3f}s warm = {total / warm:,.0f} rows/s'
+        )
+        
+        budget = options['baseline_rows']
+        mismatches = checked = 0
+        started = time.perf_counter()
+        for zone, (dates, times) in groups.items():
+            share = max(1, budget * len(dates) // total)
+            zone_info = tz.get_zone(zone)
+            for day, moment, epoch in zip(dates[:share], times[:share], converted[zone][:share].tolist()):
+                expected = datetime.combine(day, moment, tzinfo=zone_info).astimezone(dt_timezone.utc).timestamp()
+                checked += 1
+                mismatches += int(expected) != epoch
+        baseline = time.perf_counter() - started
+        rate = checked / baseline if baseline else 0
+        self.stdout.write(
+            f'zoneinfo per row: {rate:,.0f} rows/s ({total / rate if rate else 0:.2f}s extrapolated), '
+            f'speedup {total / warm / rate if rate else 0:.1f}x; '
+            f'{mismatches} of {checked:,} checked rows differ'
+        )
+    
+    def synthetic(self, options):
+        rng = random.Random(options['seed'])
+        start = date.today() - timedelta(days=365)
+        groups = {zone: ([], []) for zone in ZONES}
+        for _ in range(options['rows']):
+            dates, times = groups[rng.choice(ZONES)]
+            dates.append(start + timedelta(days=rng.randrange(730)))
+            times.append(dt_time(rng.randrange(24), rng.choice((0, 15, 30, 45))))
+        return groups
+    
+    def load_db(self, options):
+        from apps.bookings.models import Booking
+        from apps.businesses.timezones import business_timezones
+        
+        rows = Booking.objects.values_list('business_id', 'date', 'start_time')[:options['rows']]
+        by_business = {}
+        for business_id, day, moment in rows.iterator(chunk_size=10000):
+            dates, times = by_business.setdefault(str(business_id), ([], []))
+            dates.append(day)
+            times.append(moment)
+        
+        groups = {}
+        for business_id, zone in business_timezones(by_business).items():
+            dates, times = groups.setdefault(zone, ([], []))
+            dates.extend(by_business[business_id][0])
+            times.extend(by_business[business_id][1])
+        return groups
@@ -0,0 +1,30 @@
+# apps/core/management/commands/build_assets.py
+import subprocess
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.assets import AssetDigestMismatch, build_tailwind, fetch_vendor_assets
+
+
+class Command(BaseCommand):
+    help = (
+        'Production static build: vendor the pinned CDN assets, compile Tailwind, then '
+        'collectstatic (hashed names plus gzip/brotli via WhiteNoise)'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--tailwind-cli', default='tailwindcss')
+        parser.add_argument('--refetch', action='store_true', help='Download vendor assets again')
+        parser.add_argument('--skip-collectstatic', action='store_true')
+    
+    def handle(self, *args, **options):
+        try:
+            fetch_vendor_assets(force=options['refetch'], log=self.stdout.write)
+            css = build_tailwind(options['tailwind_cli'])
+        except (OSError, subprocess.CalledProcessError, AssetDigestMismatch) as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(f'compiled {css} ({css.stat().st_size:,} bytes)')
+        
+        if not options['skip_collectstatic']:
+            call_command('collectstatic', interactive=False, verbosity=1)
@@ -0,0 +1,54 @@
+# apps/core/management/commands/check_admin_queries.py
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+
+from apps.core.admin import LargeTableAdmin, changelist_variants
+from apps.core.instrumentation import record_queries
+
+
+class Command(BaseCommand):
+    help = (
+        'Render every large-table admin changelist (plain, filtered, searched and '
+        'paged) and fail when one runs more queries than its changelist_query_budget'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--model', action='append', default=[], help='app_label.model to check (default: all)')
+    
+    def handle(self, *args, **options):
+        user = get_user_model().objects.filter(is_superuser=True, is_active=True).first()
+        if user is None:
+            raise CommandError('A superuser is needed to render the admin.')
+        
+        factory = RequestFactory()
+        failures = []
+        for model, model_admin in admin.site._registry.items():
+            label = model._meta.label_lower
+            if not isinstance(model_admin, LargeTableAdmin) or (options['model'] and label not in options['model']):
+                continue
+            
+            url = reverse(f'admin:{model._meta.app_label}_{model._meta.model_name}_changelist')
+            for params in changelist_variants(model_admin):
+                request = factory.get(url, params)
+                request.user = user
+                request.resolver_match = resolve(url)
+                with record_queries(capture_stacks=True) as recorder:
+                    response = model_admin.changelist_view(request)
+                    if hasattr(response, 'render'):  # out-of-range pages redirect
+                        response.render()
+                
+                ok = recorder.count <= model_admin.changelist_query_budget
+                self.stdout.write(
+                    f"{'ok  ' if ok else 'FAIL'} {label:<24} {recorder.count:>3} queries "
+                    f"(budget {model_admin.changelist_query_budget})  {params or ''}"
+                )
+                if not ok:
+                    failures.append(label)
+                    for sql, count in recorder.duplicates()[:3]:
+                        self.stdout.write(f'       {count}x {sql[:160]}')
+        
+        if failures:
+            raise CommandError(f"Over budget: {', '.join(sorted(set(failures)))}")
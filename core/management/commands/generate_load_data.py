@@ -0,0 +1,39 @@
+# apps/core/management/commands/generate_load_data.py
+from django.core.management.base import BaseCommand
+
+from apps.core.synthetic import SyntheticDataGenerator
+
+
+class Command(BaseCommand):
+    help = 'Generate a reproducible multi-tenant data set for load testing and benchmarks'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--businesses', type=int, default=10)
+        parser.add_argument('--staff', type=int, default=5, help='Staff members per business')
+        parser.add_argument('--services', type=int, default=10, help='Services per business')
+        parser.add_argument('--clients', type=int, default=5000, help='Client users shared by all businesses')
+        parser.add_argument('--customers', type=int, default=1000, help='CRM customers per business')
+        parser.add_argument('--leads', type=int, default=200, help='CRM leads per business')
+        parser.add_argument('--bookings', type=int, default=100000, help='Total bookings')
+        parser.add_argument('--days-back', type=int, default=365)
+        parser.add_argument('--days-ahead', type=int, default=60)
+        parser.add_argument('--batch-size', type=int, default=5000)
+    
+    def handle(self, *args, **options):
+        generator = SyntheticDataGenerator(
+            seed=options['seed'],
+            businesses=options['businesses'],
+            staff=options['staff'],
+            services=options['services'],
+            clients=options['clients'],
+            customers=options['customers'],
+            leads=options['leads'],
+            bookings=options['bookings'],
+            days_back=options['days_back'],
+            days_ahead=options['days_ahead'],
+            batch_size=options['batch_size'],
+            log=self.stdout.write,
+        )
+        generator.generate()
+        self.stdout.write(self.style.SUCCESS('Done.'))
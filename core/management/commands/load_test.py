@@ -0,0 +1,39 @@
+# apps/core/management/commands/load_test.py
+import asyncio
+import json
+
+from django.core.management.base import BaseCommand
+
+from apps.core.loadtest import run_load
+
+
+class Command(BaseCommand):
+    help = (
+        'HTTP load test at increasing concurrency. Compare server setups by running it '
+        'against e.g. "gunicorn project.wsgi -w 4" (WSGI) and '
+        '"gunicorn project.asgi -w 4 -k uvicorn.workers.UvicornWorker" (ASGI).'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('url')
+        parser.add_argument('--concurrency', default='50,200,1000',
+                            help='Comma-separated client counts')
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds per level')
+        parser.add_argument('--header', action='append', default=[],
+                            help='Extra request header, e.g. "Cookie: sessionid=..."')
+        parser.add_argument('--output', help='Write results as JSON to this file')
+    
+    def handle(self, *args, **options):
+        results = []
+        for level in [int(value) for value in options['concurrency'].split(',')]:
+            result = asyncio.run(run_load(options['url'], level, options['duration'], options['header']))
+            results.append(result)
+            self.stdout.write(
+                f"{level:>6} clients  {result['requests_per_second']:>9.1f} req/s  "
+                f"p50 {result['p50_ms']} ms  p95 {result['p95_ms']} ms  "
+                f"errors {result['errors']}  statuses {result['statuses']}"
+            )
+        
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump({'url': options['url'], 'results': results}, fh, indent=2)
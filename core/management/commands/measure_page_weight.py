@@ -0,0 +1,99 @@
+# apps/core/management/commands/measure_page_weight.py
+import json
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+from django.core.management.base import BaseCommand
+
+
+class AssetParser(HTMLParser):
+    """Collect scripts and stylesheets, flagging the render-blocking ones."""
+    
+    def __init__(self):
+        super().__init__()
+        self.assets = []
+        self.in_head = False
+    
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'head':
+            self.in_head = True
+        elif tag == 'body':
+            self.in_head = False
+        elif tag == 'script' and attrs.get('src'):
+            blocking = self.in_head and 'defer' not in attrs and 'async' not in attrs
+            self.assets.append((attrs['src'], blocking))
+        elif tag == 'link' and 'stylesheet' in (attrs.get('rel') or '') and attrs.get('href'):
+            self.assets.append((attrs['href'], True))
+
+
+def fetch(url, headers):
+    request = urllib.request.Request(url, headers={'Accept-Encoding': 'br, gzip', **headers})
+    started = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=30) as response:
+        body = response.read()  # still compressed: we measure bytes on the wire
+        return {
+            'url': url,
+            'bytes': len(body),
+            'ms': round((time.perf_counter() - started) * 1000, 1),
+            'encoding': response.headers.get('Content-Encoding', 'identity'),
+            'cache_control': response.headers.get('Cache-Control', ''),
+        }
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure bytes transferred and an estimated time to first render for a page and the '
+        'scripts/stylesheets it loads. Run against a server before and after a static change.'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('url')
+        parser.add_argument('--header', action='append', default=[],
+                            help='Extra request header, e.g. "Cookie: sessionid=..."')
+        parser.add_argument('--output', help='Write results as JSON to this file')
+    
+    def handle(self, *args, **options):
+        headers = dict(header.split(': ', 1) for header in options['header'])
+        page = fetch(options['url'], headers)
+        
+        request = urllib.request.Request(options['url'], headers=headers)
+        with urllib.request.urlopen(request, timeout=30) as response:
+            parser = AssetParser()
+            parser.feed(response.read().decode('utf-8', 'replace'))
+        
+        assets = [(urljoin(options['url'], src), blocking) for src, blocking in parser.assets]
+        # Browsers fetch assets in parallel; mimic that
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            results = list(pool.map(lambda asset: fetch(asset[0], headers), assets))
+        for result, (_, blocking) in zip(results, assets):
+            result['blocking'] = blocking
+        
+        blocking_ms = max((result['ms'] for result in results if result['blocking']), default=0)
+        # Served with a long-lived cache policy: free on a repeat visit
+        cached = [result for result in results if 'immutable' in result['cache_control']]
+        summary = {
+            'html_bytes': page['bytes'],
+            'asset_bytes': sum(result['bytes'] for result in results),
+            'total_bytes': page['bytes'] + sum(result['bytes'] for result in results),
+            'repeat_visit_bytes': page['bytes'] + sum(result['bytes'] for result in results if result not in cached),
+            'requests': 1 + len(results),
+            'blocking_requests': sum(1 for result in results if result['blocking']),
+            # HTML, then the slowest render-blocking asset; no parse/paint time
+            'estimated_first_render_ms': round(page['ms'] + blocking_ms, 1),
+        }
+        
+        for result in results:
+            self.stdout.write(
+                f"{'B' if result['blocking'] else ' '} {result['bytes']:>10,} B {result['ms']:>8.1f} ms "
+                f"{result['encoding']:>8}  {result['url']}"
+            )
+        for key, value in summary.items():
+            self.stdout.write(f'{key:28} {value:,}')
+        
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump({'url': options['url'], 'page': page, 'assets': results, 'summary': summary}, fh, indent=2)
@@ -0,0 +1,63 @@
+# apps/core/management/commands/process_images.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.core.images import (
+    IMAGE_FIELDS, ImageProcessingError, content_hash, iter_rendered, load_manifest, pending_images,
+    read_upload, record_failure, record_manifest, save_variants,
+)
+
+
+class Command(BaseCommand):
+    help = 'Render missing image variants for services and avatars in a bounded process pool'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--model', choices=sorted(IMAGE_FIELDS), action='append',
+                            help='Limit to one model label (repeatable)')
+        parser.add_argument('--workers', type=int)
+        parser.add_argument('--max-in-flight', type=int, help='Source images held in memory at once')
+    
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        counts = {'rendered': 0, 'reused': 0, 'failed': 0}
+        
+        def jobs():
+            for label in options['model'] or IMAGE_FIELDS:
+                prefix = IMAGE_FIELDS[label][2]
+                for pk, name in pending_images(label):
+                    try:
+                        data = read_upload(name)
+                    except ImageProcessingError as exc:
+                        record_failure(label, pk, name, exc)
+                        counts['failed'] += 1
+                        self.stderr.write(f'{label} {pk}: {exc}')
+                        continue
+                    except OSError as exc:
+                        # Possibly transient (storage); left pending for the next run
+                        counts['failed'] += 1
+                        self.stderr.write(f'{label} {pk}: {exc}')
+                        continue
+                    digest = content_hash(data)
+                    manifest = load_manifest(prefix, digest)
+                    if manifest is not None:
+                        record_manifest(label, pk, name, manifest)
+                        counts['reused'] += 1
+                        continue
+                    yield (label, pk, name, digest), data
+        
+        rendered = iter_rendered(jobs(), workers=options['workers'], max_in_flight=options['max_in_flight'])
+        for (label, pk, name, digest), result in rendered:
+            if isinstance(result, ImageProcessingError):
+                record_failure(label, pk, name, result)
+                counts['failed'] += 1
+                self.stderr.write(f'{label} {pk}: {result}')
+                continue
+            record_manifest(label, pk, name, save_variants(IMAGE_FIELDS[label][2], digest, result))
+            counts['rendered'] += 1
+        
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Rendered {counts['rendered']}, reused {counts['reused']}, "
+            f"failed {counts['failed']} in {elapsed:.1f}s."
+        ))
@@ -0,0 +1,125 @@
+# apps/core/management/commands/profile_startup.py
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter so nothing this process imported skews it
+PROBE = '''
+import json, resource, sys, time
+started = time.perf_counter()
+stage, eager = sys.argv[1], sys.argv[2] == '1'
+if stage == 'wsgi':
+    from django.core.wsgi import get_wsgi_application
+    get_wsgi_application()
+    from django.urls import get_resolver
+    get_resolver().url_patterns
+else:
+    import django
+    django.setup()
+if eager:
+    for name in %(modules)r:
+        __import__(name)
+elapsed = time.perf_counter() - started
+rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+try:
+    with open('/proc/self/status') as status:
+        rss_kib = next(int(line.split()[1]) for line in status if line.startswith('VmRSS:'))
+except OSError:
+    pass
+print(json.dumps({
+    'seconds': elapsed,
+    'rss_mib': rss_kib / 1024,
+    'modules': len(sys.modules),
+    'heavy': sorted(name for name in %(watch)r if name in sys.modules),
+}))
+'''
+
+HEAVY_MODULES = ('numpy', 'pandas', 'plotly.graph_objects')
+WATCHED = ('numpy', 'pandas', 'plotly', 'PIL', 'celery', 'import_export', 'redis')
+
+
+class Command(BaseCommand):
+    help = (
+        'Profile process startup in fresh interpreters: boot time and RSS after Django '
+        'setup (or a full WSGI worker boot), which heavy libraries got imported, and the '
+        'slowest imports by package and module (python -X importtime). Compare against '
+        '--eager, which imports the analytics libraries up front as module-level imports did.'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--stage', choices=('setup', 'wsgi'), default='wsgi')
+        parser.add_argument('--repeat', type=int, default=5, help='Boots to time (median reported)')
+        parser.add_argument('--top', type=int, default=20)
+        parser.add_argument('--eager', action='store_true', help='Import numpy/pandas/plotly during boot')
+        parser.add_argument('--json', dest='output', help='Write the results to this file')
+    
+    def probe(self, options, importtime=False):
+        command = [sys.executable]
+        if importtime:
+            command += ['-X', 'importtime']
+        script = PROBE % {'modules': HEAVY_MODULES, 'watch': WATCHED}
+        command += ['-c', script, options['stage'], '1' if options['eager'] else '0']
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'project.settings')}
+        result = subprocess.run(command, cwd=settings.BASE_DIR, env=env, capture_output=True, text=True)
+        if result.returncode:
+            raise CommandError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'probe failed')
+        return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+    
+    def handle(self, *args, **options):
+        runs = [self.probe(options)[0] for _ in range(max(1, options['repeat']))]
+        summary = {
+            'stage': options['stage'],
+            'eager': options['eager'],
+            'boot_seconds': statistics.median(run['seconds'] for run in runs),
+            'rss_mib': statistics.median(run['rss_mib'] for run in runs),
+            'modules': runs[-1]['modules'],
+            'heavy_loaded': runs[-1]['heavy'],
+        }
+        self.stdout.write(
+            f"{summary['stage']} boot ({'eager' if options['eager'] else 'lazy'}): "
+            f"{summary['boot_seconds'] * 1000:.0f} ms median of {len(runs)}, "
+            f"RSS {summary['rss_mib']:.1f} MiB, {summary['modules']} modules; "
+            f"heavy libraries loaded: {', '.join(summary['heavy_loaded']) or 'none'}"
+        )
+        
+        _, trace = self.probe(options, importtime=True)
+        packages, modules = self.parse_importtime(trace)
+        summary['packages'] = packages[:options['top']]
+        summary['modules_cumulative'] = modules[:options['top']]
+        
+        self.stdout.write('\nSelf import time by top-level package:')
+        for name, micros in summary['packages']:
+            self.stdout.write(f'  {micros / 1000:>9.1f} ms  {name}')
+        self.stdout.write('\nSlowest modules (cumulative, including what they import):')
+        for name, micros in summary['modules_cumulative']:
+            self.stdout.write(f'  {micros / 1000:>9.1f} ms  {name}')
+        
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(summary, fh, indent=2)
+    
+    def parse_importtime(self, trace):
+        # Lines look like "import time:   self [us] |  cumulative | package.module"
+        by_package = defaultdict(int)
+        cumulative = {}
+        for line in trace.splitlines():
+            if not line.startswith('import time:') or 'self [us]' in line:
+                continue
+            try:
+                self_us, cumulative_us, name = line[len('import time:'):].split('|')
+                self_us, cumulative_us = int(self_us), int(cumulative_us)
+            except ValueError:
+                continue
+            name = name.strip()
+            by_package[name.split('.')[0]] += self_us
+            cumulative[name] = max(cumulative.get(name, 0), cumulative_us)
+        
+        def rank(items):
+            return sorted(items, key=lambda item: item[1], reverse=True)
+        return rank(by_package.items()), rank(cumulative.items())
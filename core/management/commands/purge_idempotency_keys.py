@@ -0,0 +1,15 @@
+# apps/core/management/commands/purge_idempotency_keys.py
+from django.core.management.base import BaseCommand
+
+from apps.core.idempotency import purge_expired_keys
+
+
+class Command(BaseCommand):
+    help = 'Delete expired idempotency keys in batches'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+    
+    def handle(self, *args, **options):
+        count = purge_expired_keys(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{count} expired idempotency keys deleted.'))
@@ -0,0 +1,52 @@
+# apps/core/management/commands/run_benchmarks.py
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.benchmarks import BENCHMARKS, compare, dump, run_suite
+
+
+class Command(BaseCommand):
+    help = 'Time the key application paths and write the results as JSON'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help='Scenarios to run (default: all)')
+        parser.add_argument('--business', help='Business id (default: the one with most bookings)')
+        parser.add_argument('--repeat', type=int, help='Override the per-scenario repeat count')
+        parser.add_argument('--output', default='benchmark-results.json')
+        parser.add_argument('--compare', help='Earlier results file to compare against')
+        parser.add_argument('--list', action='store_true', help='List scenarios and exit')
+    
+    def handle(self, *args, **options):
+        if options['list']:
+            for name in BENCHMARKS:
+                self.stdout.write(name)
+            return
+        
+        unknown = set(options['names']) - set(BENCHMARKS)
+        if unknown:
+            raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+        
+        business = self.get_business(options['business'])
+        results = run_suite(business, names=options['names'] or None,
+                            repeat=options['repeat'], log=self.stdout.write)
+        dump(results, options['output'])
+        self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+        
+        if options['compare']:
+            with open(options['compare']) as fh:
+                previous = json.load(fh)
+            self.stdout.write(f"\nvs {previous.get('commit') or options['compare']}:")
+            for name, before, after, change in compare(results, previous):
+                self.stdout.write(f'{name:32} {before:>10.2f} -> {after:>10.2f} ms  ({change:+.1f}%)')
+    
+    def get_business(self, business_id):
+        from django.db.models import Count
+        from apps.businesses.models import Business
+        
+        if business_id:
+            return Business.objects.get(pk=business_id)
+        business = Business.objects.annotate(n=Count('bookings')).order_by('-n').first()
+        if business is None:
+            raise CommandError('No businesses found; run generate_load_data first.')
+        return business
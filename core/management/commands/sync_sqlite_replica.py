@@ -0,0 +1,29 @@
+# apps/core/management/commands/sync_sqlite_replica.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from apps.core.db_router import REPLICA_ALIAS, replica_configured
+from apps.core.replica import sync_sqlite_replica
+
+
+class Command(BaseCommand):
+    help = 'Copy the primary SQLite database onto the replica file (optionally on a loop to simulate lag)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, help='Keep syncing every N seconds')
+    
+    def handle(self, *args, **options):
+        if not replica_configured():
+            raise CommandError('No "replica" database configured (set DB_REPLICA_NAME).')
+        if connections[REPLICA_ALIAS].vendor != 'sqlite':
+            raise CommandError('Only SQLite replicas can be synced by this command.')
+        
+        while True:
+            started = time.perf_counter()
+            sync_sqlite_replica()
+            self.stdout.write(f'Replica synced in {(time.perf_counter() - started) * 1000:.0f} ms')
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
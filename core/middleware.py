@@ -0,0 +1,161 @@
+# apps/core/middleware.py
+import logging
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+
+from .db_router import REPLICA_ALIAS, _read_alias, replica_configured
+from .instrumentation import QueryBudgetExceeded, budget_message, record_queries, request_stats
+
+logger = logging.getLogger('apps.core.queries')
+
+DEFAULTS = {
+    'SAMPLE_RATE': 0.0,           # share of requests instrumented (0 disables)
+    'CAPTURE_STACKS': False,      # record call sites of repeated queries
+    'DUPLICATE_THRESHOLD': 3,     # same SQL this many times is logged as N+1
+    'SERVER_TIMING': True,
+    'ENFORCE_BUDGETS': False,     # raise when a view exceeds its query_budget
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'QUERY_INSTRUMENTATION', {})}
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Per-request query count, DB time and duplicate-SQL detection.
+    
+    Unsampled requests go straight through, so with ``SAMPLE_RATE`` at 0
+    the only overhead is one dictionary lookup. Runs natively under both
+    WSGI and ASGI, so async views are not pushed into a thread by it.
+    """
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = get_config()
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+    
+    def _sampled(self):
+        rate = self.config['SAMPLE_RATE']
+        return bool(rate) and (rate >= 1 or random.random() < rate)
+    
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self._sampled():
+            return self.get_response(request)
+        
+        started = time.perf_counter()
+        with record_queries(capture_stacks=self.config['CAPTURE_STACKS']) as recorder:
+            response = self.get_response(request)
+        return self._finish(request, response, recorder, started)
+    
+    async def __acall__(self, request):
+        if not self._sampled():
+            return await self.get_response(request)
+        
+        started = time.perf_counter()
+        # Connections are per thread: install the wrappers in the thread
+        # the request's sync_to_async ORM calls run in
+        recording = record_queries(capture_stacks=self.config['CAPTURE_STACKS'])
+        recorder = await sync_to_async(recording.__enter__)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(recording.__exit__)(None, None, None)
+        return self._finish(request, response, recorder, started)
+    
+    def _finish(self, request, response, recorder, started):
+        total_ms = (time.perf_counter() - started) * 1000
+        db_ms = recorder.duration * 1000
+        
+        match = getattr(request, 'resolver_match', None)
+        # One bucket for unresolved requests: keying 404s and bot probes by
+        # path would grow the stats without bound
+        name = (match.view_name if match else None) or '<unresolved>'
+        request_stats.add(name, total_ms, db_ms, recorder.count)
+        
+        duplicates = recorder.duplicates(self.config['DUPLICATE_THRESHOLD'])
+        if duplicates:
+            logger.warning(
+                'Repeated queries in %s: %s',
+                name,
+                '; '.join(f'{count}x {sql[:120]}' for sql, count in duplicates[:3]),
+                extra={'call_sites': recorder.top_call_sites(self.config['DUPLICATE_THRESHOLD'])},
+            )
+        
+        budget = getattr(request, '_query_budget', None)
+        if budget is not None and recorder.count > budget and self.config['ENFORCE_BUDGETS']:
+            raise QueryBudgetExceeded(f'{name}: ' + budget_message(recorder, budget))
+        
+        if self.config['SERVER_TIMING']:
+            response['Server-Timing'] = ', '.join([
+                f'db;dur={db_ms:.1f};desc="{recorder.count} queries"',
+                f'dup;desc="{len(duplicates)} repeated"',
+                f'app;dur={total_ms - db_ms:.1f}',
+            ])
+        return response
+    
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        budget = getattr(view_func, 'query_budget', None)
+        if budget is None and view_class is not None:
+            budget = getattr(view_class, 'query_budget', None)
+        request._query_budget = budget
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Routes reads of views marked ``use_replica`` to the replica database.
+    
+    After a user's own write (any successful unsafe request) a short-lived
+    cookie pins their reads to the primary so they see what they just saved.
+    """
+    PIN_COOKIE = 'db_pin'
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.pin_seconds = getattr(settings, 'DATABASE_REPLICA_PIN_SECONDS', 10)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+    
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        request._replica_token = None
+        return self._finish(request, self.get_response(request))
+    
+    async def __acall__(self, request):
+        request._replica_token = None
+        return self._finish(request, await self.get_response(request))
+    
+    def _finish(self, request, response):
+        if request._replica_token is not None:
+            try:
+                _read_alias.reset(request._replica_token)
+            except ValueError:
+                # Token was created in another context (async adaptation)
+                _read_alias.set(None)
+        
+        if request.method not in ('GET', 'HEAD', 'OPTIONS') and response.status_code < 400:
+            response.set_cookie(self.PIN_COOKIE, '1', max_age=self.pin_seconds, httponly=True, samesite='Lax')
+        return response
+    
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method not in ('GET', 'HEAD') or request.COOKIES.get(self.PIN_COOKIE):
+            return None
+        if not replica_configured():
+            return None
+        
+        view_class = getattr(view_func, 'view_class', None)
+        if getattr(view_func, 'use_replica', False) or getattr(view_class, 'use_replica', False):
+            request._replica_token = _read_alias.set(REPLICA_ALIAS)
+        return None
@@ -0,0 +1,33 @@
+# apps/core/models.py
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class IdempotencyKey(models.Model):
+    # Stored response for a client-supplied Idempotency-Key (core.idempotency)
+    scope = models.CharField(max_length=100)  # endpoint + caller
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    
+    completed = models.BooleanField(default=False)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    content_type = models.CharField(max_length=100, blank=True)
+    response_body = models.BinaryField(blank=True, default=b'')
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+    # In-progress lease; a claim still unfinished after this was abandoned
+    locked_until = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        verbose_name = _('Idempotency Key')
+        verbose_name_plural = _('Idempotency Keys')
+        constraints = [
+            models.UniqueConstraint(fields=['scope', 'key'], name='idempotency_scope_key_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['expires_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.scope}:{self.key}"
@@ -0,0 +1,25 @@
+# apps/core/replica.py
+import sqlite3
+
+from django.db import connections
+
+from .db_router import REPLICA_ALIAS
+
+
+def sync_sqlite_replica(source=None, replica=None):
+    """
+    Copy the primary SQLite database onto the replica file with the online
+    backup API. Stands in for replication when developing or testing the
+    replica routing locally.
+    """
+    source = source or connections['default'].settings_dict['NAME']
+    replica = replica or connections[REPLICA_ALIAS].settings_dict['NAME']
+    
+    connections[REPLICA_ALIAS].close()
+    src = sqlite3.connect(str(source))
+    dst = sqlite3.connect(str(replica))
+    try:
+        src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
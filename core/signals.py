@@ -0,0 +1,18 @@
+# apps/core/signals.py
+from django.db import transaction
+from django.db.models.signals import post_save
+
+from .images import IMAGE_FIELDS, needs_processing
+
+
+def enqueue_image_processing(sender, instance, raw=False, update_fields=None, **kwargs):
+    label = sender._meta.label
+    if raw or not needs_processing(instance, label, update_fields):
+        return
+    from .tasks import process_image_field
+    pk = str(instance.pk)
+    transaction.on_commit(lambda: process_image_field.delay(label, pk))
+
+
+for label in IMAGE_FIELDS:
+    post_save.connect(enqueue_image_processing, sender=label, dispatch_uid=f'images:{label}')
@@ -0,0 +1,383 @@
+# apps/core/synthetic.py
+import random
+import time
+import uuid
+from datetime import datetime, time as dt_time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.bookings.models import Booking, Service, TimeSlot
+from apps.bookings.stats import rebuild_service_stats
+from apps.bookings.transitions import RELEASING_STATUSES
+from apps.businesses.models import Business, BusinessStaff
+from apps.crm.linking import email_hash
+from apps.crm.models import Customer, Lead
+from apps.subscriptions.models import Plan, Subscription
+
+FIRST_NAMES = [
+    'Ahmed', 'Sara', 'Omar', 'Layla', 'Yusuf', 'Mona', 'Khalid', 'Noura', 'Ali', 'Huda',
+    'John', 'Emma', 'Liam', 'Olivia', 'Noah', 'Ava', 'Lucas', 'Mia', 'Adam', 'Zara',
+]
+LAST_NAMES = [
+    'Al-Saud', 'Haddad', 'Nasser', 'Khan', 'Rahman', 'Saleh', 'Farouk', 'Aziz',
+    'Smith', 'Brown', 'Garcia', 'Miller', 'Davis', 'Wilson', 'Moore', 'Taylor',
+]
+CITIES = ['Riyadh', 'Jeddah', 'Dammam', 'Dubai', 'Cairo', 'Amman', 'London', 'Berlin']
+SERVICE_NAMES = [
+    'Haircut', 'Beard Trim', 'Coloring', 'Manicure', 'Pedicure', 'Facial', 'Massage',
+    'Consultation', 'Check-up', 'Cleaning', 'Physiotherapy', 'Personal Training',
+    'Yoga Class', 'Eyebrow Threading', 'Makeup', 'Blow Dry',
+]
+
+# (status, weight) for past and future bookings
+PAST_STATUSES = [('COMPLETED', 70), ('CANCELLED', 15), ('NO_SHOW', 7), ('CONFIRMED', 5), ('PENDING', 3)]
+FUTURE_STATUSES = [('CONFIRMED', 55), ('PENDING', 35), ('CANCELLED', 10)]
+SOURCES = [('WEBSITE', 50), ('MOBILE', 30), ('WALK_IN', 10), ('PHONE', 10)]
+
+SLOT_START_HOUR = 9
+SLOTS_PER_DAY = 9
+
+
+class SyntheticDataGenerator:
+    """
+    Reproducible multi-tenant data set built with batched ``bulk_create``.
+    
+    Every random choice (including primary keys) comes from one seeded
+    ``random.Random``, so the same options produce the same rows. Bookings
+    are streamed in batches and never held in memory all at once.
+    """
+    
+    def __init__(self, seed=42, businesses=10, staff=5, services=10, clients=5000,
+                 customers=1000, leads=200, bookings=100000, days_back=365,
+                 days_ahead=60, batch_size=5000, log=None):
+        self.rng = random.Random(seed)
+        self.options = {
+            'businesses': businesses,
+            'staff': staff,
+            'services': services,
+            'clients': clients,
+            'customers': customers,
+            'leads': leads,
+            'bookings': bookings,
+            'days_back': days_back,
+            'days_ahead': days_ahead,
+        }
+        self.batch_size = batch_size
+        self.log = log or (lambda message: None)
+        self.today = timezone.localdate()
+        self.password = make_password('benchmark')
+    
+    def uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+    
+    def weighted(self, choices):
+        values, weights = zip(*choices)
+        return self.rng.choices(values, weights=weights)[0]
+    
+    def person(self):
+        return self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+    
+    def bulk(self, model, objects):
+        for start in range(0, len(objects), self.batch_size):
+            model.objects.bulk_create(objects[start:start + self.batch_size])
+        return objects
+    
+    def generate(self):
+        started = time.perf_counter()
+        with transaction.atomic():
+            plans = self.create_plans()
+            owners, clients = self.create_users()
+            businesses = self.create_businesses(owners, plans)
+            staff = self.create_staff(businesses)
+            services = self.create_services(businesses, staff)
+            slots = self.create_time_slots(services, staff)
+            self.create_crm(businesses, clients, services)
+        
+        booking_count = self.create_bookings(businesses, services, staff, slots, clients)
+        
+        self.log('Recomputing counters...')
+        self.sync_slot_counters(businesses)
+        rebuild_service_stats(batch_size=self.batch_size)
+        
+        elapsed = time.perf_counter() - started
+        self.log(f'Generated {booking_count} bookings for {len(businesses)} businesses in {elapsed:.1f}s')
+        return businesses
+    
+    def create_plans(self):
+        specs = [
+            ('starter', 'Starter', Decimal('29.00'), 100, False),
+            ('pro', 'Pro', Decimal('79.00'), 1000, False),
+            ('business', 'Business', Decimal('199.00'), -1, True),
+        ]
+        plans = []
+        for order, (slug, name, price, monthly_bookings, api_access) in enumerate(specs):
+            plan, _ = Plan.objects.get_or_create(
+                slug=f'synthetic-{slug}',
+                defaults={
+                    'name': name,
+                    'name_ar': name,
+                    'description': f'{name} plan',
+                    'description_ar': f'{name} plan',
+                    'price': price,
+                    'billing_period': 'MONTHLY',
+                    'max_bookings_per_month': monthly_bookings,
+                    'has_api_access': api_access,
+                    'order': order,
+                },
+            )
+            plans.append(plan)
+        return plans
+    
+    def make_user(self, index, role):
+        first_name, last_name = self.person()
+        return User(
+            id=self.uuid(),
+            email=f'{role.lower()}{index}@synthetic.test',
+            first_name=first_name,
+            last_name=last_name,
+            phone=f'+9665{self.rng.randint(10000000, 99999999)}',
+            role=role,
+            city=self.rng.choice(CITIES),
+            password=self.password,
+            is_active=True,
+            is_verified=True,
+        )
+    
+    def create_users(self):
+        owners = [self.make_user(i, 'BUSINESS_ADMIN') for i in range(self.options['businesses'])]
+        clients = [self.make_user(i, 'CLIENT') for i in range(self.options['clients'])]
+        self.bulk(User, owners)
+        self.bulk(User, clients)
+        self.log(f'{len(owners)} owners, {len(clients)} clients')
+        return owners, clients
+    
+    def create_businesses(self, owners, plans):
+        # Business / BusinessStaff field names follow their usage elsewhere
+        # in the project (owner -> owned_businesses, staff.user)
+        businesses = [
+            Business(id=self.uuid(), owner=owner, name=f'Synthetic Business {i}')
+            for i, owner in enumerate(owners)
+        ]
+        self.bulk(Business, businesses)
+        
+        now = timezone.now()
+        subscriptions = []
+        for business in businesses:
+            plan = self.rng.choice(plans)
+            end_date = now + timedelta(days=plan.get_period_days())
+            subscriptions.append(Subscription(
+                id=self.uuid(),
+                business=business,
+                plan=plan,
+                status=self.weighted([('ACTIVE', 80), ('TRIAL', 15), ('PAST_DUE', 5)]),
+                start_date=now,
+                end_date=end_date,
+                next_billing_date=end_date,
+            ))
+        self.bulk(Subscription, subscriptions)
+        return businesses
+    
+    def create_staff(self, businesses):
+        users, staff = [], {}
+        for business in businesses:
+            staff[business.pk] = []
+            for i in range(self.options['staff']):
+                user = self.make_user(f'{business.pk.hex[:8]}-{i}', 'BUSINESS_STAFF')
+                users.append(user)
+                staff[business.pk].append(BusinessStaff(id=self.uuid(), business=business, user=user))
+        self.bulk(User, users)
+        self.bulk(BusinessStaff, [member for members in staff.values() for member in members])
+        return staff
+    
+    def create_services(self, businesses, staff):
+        services = {}
+        for business in businesses:
+            names = self.rng.sample(SERVICE_NAMES, min(self.options['services'], len(SERVICE_NAMES)))
+            services[business.pk] = [
+                Service(
+                    id=self.uuid(),
+                    business=business,
+                    name=name,
+                    description=f'{name} at {business.name}',
+                    duration_minutes=self.rng.choice([30, 45, 60]),
+                    price=Decimal(self.rng.randrange(50, 500)),
+                    buffer_time_minutes=self.rng.choice([0, 0, 5, 10]),
+                    max_bookings_per_slot=self.rng.choice([1, 1, 1, 2, 4]),
+                    available_days=[0, 1, 2, 3, 4, 5],
+                )
+                for name in names
+            ]
+        all_services = [service for group in services.values() for service in group]
+        self.bulk(Service, all_services)
+        
+        through = Service.providers.through
+        links = []
+        for business_id, group in services.items():
+            for service in group:
+                for member in self.rng.sample(staff[business_id], min(2, len(staff[business_id]))):
+                    links.append(through(service_id=service.pk, businessstaff_id=member.pk))
+        self.bulk(through, links)
+        return services
+    
+    def create_time_slots(self, services, staff):
+        # Slots cover the upcoming window only, like a live booking calendar
+        slots = {}
+        objects = []
+        for business_id, group in services.items():
+            for service in group:
+                provider = self.rng.choice(staff[business_id])
+                for offset in range(self.options['days_ahead']):
+                    day = self.today + timedelta(days=offset)
+                    for index in range(SLOTS_PER_DAY):
+                        start = datetime.combine(day, dt_time(SLOT_START_HOUR + index))
+                        slot = TimeSlot(
+                            id=self.uuid(),
+                            business_id=business_id,
+                            service=service,
+                            provider=provider,
+                            date=day,
+                            start_time=start.time(),
+                            end_time=(start + timedelta(minutes=service.duration_minutes)).time(),
+                            max_bookings=service.max_bookings_per_slot,
+                        )
+                        slots[(service.pk, day, index)] = slot
+                        objects.append(slot)
+        self.bulk(TimeSlot, objects)
+        self.log(f'{len(objects)} time slots')
+        return slots
+    
+    def create_crm(self, businesses, clients, services):
+        customers, leads = [], []
+        for business in businesses:
+            for client in self.rng.sample(clients, min(self.options['customers'], len(clients))):
+                customers.append(Customer(
+                    id=self.uuid(),
+                    business=business,
+                    user=client,
+                    customer_type=self.weighted([('REGULAR', 85), ('VIP', 10), ('CORPORATE', 5)]),
+                    first_name=client.first_name,
+                    last_name=client.last_name,
+                    email=client.email,
+                    email_hash=email_hash(client.email),
+                    phone=client.phone,
+                    city=client.city,
+                ))
+            for i in range(self.options['leads']):
+                first_name, last_name = self.person()
+                leads.append(Lead(
+                    id=self.uuid(),
+                    business=business,
+                    name=f'{first_name} {last_name}',
+                    email=f'lead{i}-{business.pk.hex[:8]}@synthetic.test',
+                    phone=f'+9665{self.rng.randint(10000000, 99999999)}',
+                    status=self.rng.choice(['NEW', 'CONTACTED', 'QUALIFIED', 'CONVERTED', 'LOST']),
+                    source=self.rng.choice(['WEBSITE', 'SOCIAL_MEDIA', 'REFERRAL', 'PHONE']),
+                    estimated_value=Decimal(self.rng.randrange(100, 5000)),
+                    probability=self.rng.randrange(0, 101, 10),
+                ))
+        self.bulk(Customer, customers)
+        self.bulk(Lead, leads)
+        self.log(f'{len(customers)} CRM customers, {len(leads)} leads')
+    
+    def iter_bookings(self, businesses, services, staff, slots, clients):
+        days_back, days_ahead = self.options['days_back'], self.options['days_ahead']
+        held = {}
+        for number in range(self.options['bookings']):
+            business = self.rng.choice(businesses)
+            service = self.rng.choice(services[business.pk])
+            client = self.rng.choice(clients)
+            offset = self.rng.randint(-days_back, days_ahead - 1)
+            day = self.today + timedelta(days=offset)
+            index = self.rng.randrange(SLOTS_PER_DAY)
+            
+            status = self.weighted(PAST_STATUSES if offset < 0 else FUTURE_STATUSES)
+            slot = slots.get((service.pk, day, index))
+            if slot is not None and status not in RELEASING_STATUSES:
+                # Never overbook a slot; overflow bookings are slot-less walk-ins
+                if held.get(slot.pk, 0) >= slot.max_bookings:
+                    slot = None
+                else:
+                    held[slot.pk] = held.get(slot.pk, 0) + 1
+            start = datetime.combine(day, dt_time(SLOT_START_HOUR + index))
+            end = start + timedelta(minutes=service.duration_minutes)
+            
+            if status == 'COMPLETED':
+                payment_status = self.weighted([('PAID', 90), ('PARTIALLY_PAID', 7), ('REFUNDED', 3)])
+            elif status == 'CANCELLED':
+                payment_status = self.weighted([('PENDING', 80), ('REFUNDED', 20)])
+            else:
+                payment_status = self.weighted([('PENDING', 70), ('PARTIALLY_PAID', 20), ('PAID', 10)])
+            
+            price = service.price
+            discount = price * Decimal('0.10') if self.rng.random() < 0.15 else Decimal('0.00')
+            tax = ((price - discount) * Decimal('0.15')).quantize(Decimal('0.01'))
+            total = price - discount + tax
+            deposit = (total * Decimal('0.20')).quantize(Decimal('0.01')) if payment_status == 'PARTIALLY_PAID' else Decimal('0.00')
+            
+            # created_at is auto_now_add, so only the lifecycle stamps are backdated
+            stamp = timezone.make_aware(start) - timedelta(days=self.rng.randint(0, 30))
+            yield Booking(
+                id=self.uuid(),
+                booking_number=f'SY{number:012d}',
+                business=business,
+                service=service,
+                time_slot=slot,
+                customer=client,
+                provider=slot.provider if slot else self.rng.choice(staff[business.pk]),
+                date=day,
+                start_time=start.time(),
+                end_time=end.time(),
+                customer_name=f'{client.first_name} {client.last_name}',
+                customer_email=client.email,
+                customer_phone=client.phone,
+                status=status,
+                payment_status=payment_status,
+                service_price=price,
+                discount_amount=discount,
+                tax_amount=tax,
+                total_amount=total,
+                deposit_paid=deposit,
+                source=self.weighted(SOURCES),
+                confirmed_at=stamp if status in ('CONFIRMED', 'COMPLETED') else None,
+                cancelled_at=stamp if status == 'CANCELLED' else None,
+                completed_at=timezone.make_aware(end) if status == 'COMPLETED' else None,
+            )
+    
+    def create_bookings(self, businesses, services, staff, slots, clients):
+        started = time.perf_counter()
+        batch, total = [], 0
+        for booking in self.iter_bookings(businesses, services, staff, slots, clients):
+            batch.append(booking)
+            if len(batch) >= self.batch_size:
+                total += self._flush_bookings(batch)
+                batch = []
+                if total % (self.batch_size * 20) == 0:
+                    rate = total / (time.perf_counter() - started)
+                    self.log(f'  {total} bookings ({rate:,.0f}/s)')
+        if batch:
+            total += self._flush_bookings(batch)
+        return total
+    
+    def _flush_bookings(self, batch):
+        with transaction.atomic():
+            Booking.objects.bulk_create(batch)
+        return len(batch)
+    
+    def sync_slot_counters(self, businesses):
+        held = (
+            Booking.objects.filter(time_slot=OuterRef('pk'))
+            .exclude(status__in=RELEASING_STATUSES)
+            .order_by()
+            .values('time_slot')
+            .annotate(count=Count('id'))
+            .values('count')
+        )
+        TimeSlot.objects.filter(business__in=businesses).update(
+            current_bookings=Coalesce(Subquery(held), Value(0), output_field=IntegerField())
+        )
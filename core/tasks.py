@@ -0,0 +1,10 @@
+# apps/core/tasks.py
+from celery import shared_task
+
+from .images import process_field
+
+
+@shared_task(ignore_result=True, acks_late=True, autoretry_for=(OSError,),
+             retry_backoff=True, max_retries=3)
+def process_image_field(label, pk):
+    process_field(label, pk)
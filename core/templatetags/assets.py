@@ -0,0 +1,29 @@
+# apps/core/templatetags/assets.py
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html
+
+from apps.core.assets import TAILWIND_CDN, TAILWIND_OUTPUT, VENDOR_ASSETS, is_built
+
+register = template.Library()
+
+
+@register.simple_tag
+def vendor_asset(path):
+    """
+    ``{% vendor_asset 'vendor/jquery/3.6.0/jquery.min.js' %}``
+    
+    The self-hosted copy once ``build_assets`` has fetched it, the pinned
+    CDN URL until then, so a fresh checkout still renders.
+    """
+    if is_built(path):
+        return static(path)
+    return VENDOR_ASSETS[path][0]
+
+
+@register.simple_tag
+def tailwind_stylesheet():
+    """The compiled Tailwind CSS, or the in-browser compiler until it is built."""
+    if is_built(TAILWIND_OUTPUT):
+        return format_html('<link rel="stylesheet" href="{}">', static(TAILWIND_OUTPUT))
+    return format_html('<script src="{}"></script>', TAILWIND_CDN)
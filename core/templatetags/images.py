@@ -0,0 +1,47 @@
+# apps/core/templatetags/images.py
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html
+
+register = template.Library()
+
+
+def _srcset(variants, extension):
+    return ', '.join(
+        f"{default_storage.url(variant[extension])} {variant['width']}w"
+        for variant in variants
+        if extension in variant
+    )
+
+
+@register.simple_tag
+def srcset(manifest, extension='jpg'):
+    """``{% srcset service.image_variants 'webp' %}``"""
+    return _srcset((manifest or {}).get('variants', []), extension)
+
+
+@register.simple_tag
+def responsive_image(image, manifest, alt='', sizes='100vw', css_class=''):
+    """
+    ``{% responsive_image service.image service.image_variants alt=service.name sizes="(min-width: 768px) 33vw, 100vw" %}``
+    
+    Renders a ``<picture>`` with WebP and JPEG ``srcset``s; until the
+    variants exist it falls back to the original upload.
+    """
+    variants = (manifest or {}).get('variants')
+    if not variants:
+        if not image:
+            return ''
+        return format_html('<img src="{}" alt="{}" class="{}" loading="lazy">', image.url, alt, css_class)
+    
+    fallback = variants[min(len(variants) - 1, 2)]
+    return format_html(
+        '<picture>'
+        '<source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" alt="{}" class="{}" '
+        'loading="lazy" decoding="async">'
+        '</picture>',
+        _srcset(variants, 'webp'), sizes,
+        default_storage.url(fallback['jpg']), _srcset(variants, 'jpg'), sizes,
+        fallback['width'], fallback['height'], alt, css_class,
+    )
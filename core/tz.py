@@ -0,0 +1,154 @@
+# apps/core/tz.py
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.conf import settings
+from django.utils.dateparse import parse_date
+
+from .lazy import lazy_import
+
+np = lazy_import('numpy')
+
+SECONDS_PER_DAY = 86400
+UNIX_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+DEFAULT_ZONE = getattr(settings, 'BUSINESS_DEFAULT_TIMEZONE', settings.TIME_ZONE)
+
+# Local dates are at most 14 hours from UTC, so one day either side covers every zone
+LOCAL_DATE_MARGIN = timedelta(days=1)
+
+
+@lru_cache(maxsize=None)
+def get_zone(name):
+    try:
+        return ZoneInfo(name or DEFAULT_ZONE)
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo(DEFAULT_ZONE)
+
+
+def parse_date_param(value, default=None):
+    # parse_date raises ValueError for well-formed but impossible dates
+    # such as 2024-02-30; treat those like any other unparseable value
+    try:
+        return parse_date(value or '') or default
+    except ValueError:
+        return default
+
+
+def _offset(zone, epoch_seconds):
+    instant = datetime.fromtimestamp(epoch_seconds, dt_timezone.utc)
+    return int(zone.utcoffset(instant.astimezone(zone)).total_seconds())
+
+
+def _transition(zone, low, high, before):
+    # Last UTC second still at the ``before`` offset, by bisection
+    while high - low > 1:
+        middle = (low + high) // 2
+        if _offset(zone, middle) == before:
+            low = middle
+        else:
+            high = middle
+    return high
+
+
+@lru_cache(maxsize=512)
+def offset_table(zone_name, year):
+    """
+    UTC offsets for every local day of ``year`` as three arrays indexed by
+    day of year: the offset the day starts with, the offset it ends with,
+    and the local second of the day from which the second applies (86400
+    when the day has no transition).
+    
+    Wall times skipped or repeated by a DST switch resolve like
+    ``zoneinfo`` with ``fold=0``, i.e. to the offset before the switch.
+    """
+    zone = get_zone(zone_name)
+    first = date(year, 1, 1).toordinal()
+    days = date(year + 1, 1, 1).toordinal() - first
+    before = np.empty(days, dtype=np.int64)
+    after = np.empty(days, dtype=np.int64)
+    switch = np.full(days, SECONDS_PER_DAY, dtype=np.int64)
+    
+    for index in range(days):
+        # Offsets in force at the end of the previous local day and of this one
+        day_start = (first + index - UNIX_EPOCH_ORDINAL) * SECONDS_PER_DAY
+        previous_end, day_end = day_start - 1, day_start + SECONDS_PER_DAY - 1
+        start_offset = _offset(zone, previous_end - _offset(zone, previous_end))
+        end_offset = _offset(zone, day_end - _offset(zone, day_end))
+        before[index], after[index] = start_offset, end_offset
+        if start_offset != end_offset:
+            instant = _transition(zone, previous_end - start_offset, day_end - end_offset, start_offset)
+            local = instant + max(start_offset, end_offset) - day_start
+            switch[index] = min(max(local, 0), SECONDS_PER_DAY)
+    return before, after, switch
+
+
+def _tables(zone_name, first_year, last_year):
+    parts = [offset_table(zone_name, year) for year in range(first_year, last_year + 1)]
+    if len(parts) == 1:
+        return parts[0]
+    return tuple(np.concatenate(column) for column in zip(*parts))
+
+
+def as_arrays(dates, times):
+    """Day ordinals and seconds-of-day for sequences of ``date`` / ``time``."""
+    ordinals = np.fromiter((value.toordinal() for value in dates), dtype=np.int64)
+    seconds = np.fromiter(
+        (value.hour * 3600 + value.minute * 60 + value.second for value in times), dtype=np.int64,
+    )
+    return ordinals, seconds
+
+
+def utc_offsets(zone_name, ordinals, seconds):
+    """Offset in seconds for each local wall time (day ordinal + second of day)."""
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    seconds = np.asarray(seconds, dtype=np.int64)
+    if not ordinals.size:
+        return np.empty(0, dtype=np.int64)
+    first_year = date.fromordinal(int(ordinals.min())).year
+    last_year = date.fromordinal(int(ordinals.max())).year
+    before, after, switch = _tables(zone_name, first_year, last_year)
+    index = ordinals - date(first_year, 1, 1).toordinal()
+    return np.where(seconds >= switch[index], after[index], before[index])
+
+
+def to_utc_epoch(zone_name, dates, times):
+    """Local ``date`` + ``time`` pairs in ``zone_name`` as UTC epoch seconds, in one pass."""
+    ordinals, seconds = as_arrays(dates, times)
+    offsets = utc_offsets(zone_name, ordinals, seconds)
+    return (ordinals - UNIX_EPOCH_ORDINAL) * SECONDS_PER_DAY + seconds - offsets
+
+
+def to_utc(zone_name, dates, times):
+    """Like ``to_utc_epoch`` but returns aware UTC datetimes."""
+    epoch = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+    return [epoch + timedelta(seconds=int(value)) for value in to_utc_epoch(zone_name, dates, times)]
+
+
+def isoformat_utc(epoch_seconds):
+    """``YYYY-MM-DDTHH:MM:SSZ`` strings for UTC epoch seconds, formatted by numpy in one call."""
+    values = np.asarray(epoch_seconds, dtype=np.int64).astype('datetime64[s]')
+    return np.datetime_as_string(values, unit='s', timezone='UTC').tolist()
+
+
+def format_offset(seconds):
+    sign = '-' if seconds < 0 else '+'
+    minutes = abs(int(seconds)) // 60
+    return f'{sign}{minutes // 60:02d}:{minutes % 60:02d}'
+
+
+def isoformat_local(zone_name, dates, times):
+    """``YYYY-MM-DDTHH:MM:SS+HH:MM`` strings for local wall times, offsets included."""
+    ordinals, seconds = as_arrays(dates, times)
+    offsets = utc_offsets(zone_name, ordinals, seconds)
+    labels = {}
+    return [
+        f'{day.isoformat()}T{moment.isoformat()}{labels.get(offset) or labels.setdefault(offset, format_offset(offset))}'
+        for day, moment, offset in zip(dates, times, offsets.tolist())
+    ]
+
+
+def local_now(zone_name, now=None):
+    now = now or datetime.now(dt_timezone.utc)
+    return now.astimezone(get_zone(zone_name))
@@ -0,0 +1,48 @@
+# apps/core/warmup.py
+import gc
+import importlib
+import random
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.urls import get_resolver
+
+from .lazy import lazy_modules
+
+# Imported before forking when gunicorn preloads the app, so workers share them
+WARMUP_MODULES = getattr(settings, 'WARMUP_MODULES', ('numpy', 'pandas', 'plotly.graph_objects'))
+
+
+def warm_up(modules=WARMUP_MODULES):
+    """
+    Do the expensive one-off work in the gunicorn master (``preload_app``)
+    so forked workers inherit it copy-on-write: heavy analytics modules,
+    the URLconf and every view module it references.
+    
+    Leaves nothing fork-unsafe behind: database connections and cache
+    clients opened while loading are closed, and the surviving objects
+    are moved out of the garbage collector's reach so collections in the
+    workers don't dirty the shared pages.
+    """
+    for name in modules:
+        importlib.import_module(name)
+    get_resolver().url_patterns  # imports every urls / views module
+    
+    prepare_fork()
+    gc.collect()
+    gc.freeze()
+    return sorted(name for name, module in lazy_modules().items() if module.is_loaded)
+
+
+def prepare_fork():
+    # Sockets must not be shared between processes
+    connections.close_all()
+    for cache in caches.all(initialized_only=True):
+        cache.close()
+
+
+def after_fork():
+    """Per-worker state that must not be inherited from the master."""
+    prepare_fork()
+    random.seed()
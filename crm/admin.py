@@ -1,3 +1,68 @@
+# apps/crm/admin.py
 from django.contrib import admin
 
-# Register your models here.
+from apps.core.admin import LargeTableAdmin
+
+from .models import Customer, Lead, LoyaltyLedgerEntry, LoyaltyRule
+
+
+@admin.register(Customer)
+class CustomerAdmin(LargeTableAdmin):
+    list_display = ('__str__', 'email', 'phone', 'customer_type', 'total_bookings', 'total_spent', 'last_visit')
+    list_filter = ('customer_type',)
+    list_select_related = ('business',)
+    list_only = (
+        'id', 'first_name', 'last_name', 'email', 'phone', 'customer_type',
+        'total_bookings', 'total_spent', 'last_visit', 'business__id', 'business__name',
+    )
+    # Exact and prefix lookups on indexed columns (emails are stored lowercased)
+    search_fields = ('email__exact', 'last_name__startswith')
+    raw_id_fields = ('business', 'user')
+    export_fields = (
+        'id', 'business_id', 'first_name', 'last_name', 'email', 'phone', 'customer_type',
+        'total_bookings', 'total_spent', 'loyalty_points', 'first_visit', 'last_visit',
+    )
+    actions = ('export_csv',)
+
+
+@admin.register(Lead)
+class LeadAdmin(LargeTableAdmin):
+    list_display = ('__str__', 'email', 'status', 'source', 'estimated_value', 'next_followup_date')
+    list_filter = ('status', 'source')
+    list_select_related = ('business',)
+    list_only = (
+        'id', 'name', 'email', 'status', 'source', 'estimated_value', 'next_followup_date',
+        'business__id', 'business__name',
+    )
+    search_fields = ('email__exact', 'name__startswith')
+    raw_id_fields = ('business', 'assigned_to', 'converted_customer')
+    export_fields = (
+        'id', 'business_id', 'name', 'email', 'phone', 'company', 'status', 'source',
+        'estimated_value', 'probability', 'converted', 'created_at',
+    )
+    actions = ('export_csv',)
+
+
+@admin.register(LoyaltyRule)
+class LoyaltyRuleAdmin(admin.ModelAdmin):
+    list_display = ('business', 'points_per_currency', 'points_per_visit', 'is_active', 'updated_at')
+    list_filter = ('is_active',)
+    list_select_related = ('business',)
+    raw_id_fields = ('business',)
+
+
+@admin.register(LoyaltyLedgerEntry)
+class LoyaltyLedgerEntryAdmin(LargeTableAdmin):
+    list_display = ('customer_id', 'kind', 'points', 'effective_at', 'applied_at', 'description')
+    list_filter = ('kind', 'effective_at')
+    list_only = ('id', 'customer', 'kind', 'points', 'effective_at', 'applied_at', 'description')
+    raw_id_fields = ('business', 'customer', 'booking')
+    export_fields = ('id', 'business_id', 'customer_id', 'booking_id', 'kind', 'points', 'effective_at', 'applied_at')
+    actions = ('export_csv',)
+    
+    # Append-only: corrections are new ADJUST entries
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
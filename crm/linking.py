@@ -0,0 +1,221 @@
+# apps/crm/linking.py
+import hashlib
+import re
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.bookings.models import Booking
+
+from .models import Customer
+
+CACHE_TIMEOUT = getattr(settings, 'CRM_LINK_CACHE_TIMEOUT', 3600)
+CHUNK_SIZE = getattr(settings, 'CRM_LINK_CHUNK_SIZE', 5000)
+
+_PHONE_NOISE = re.compile(r'[^\d+]')
+
+
+def normalize_email(email):
+    return (email or '').strip().lower()
+
+
+def normalize_phone(phone):
+    """Digits only, keeping a leading ``+``; ``00`` international prefixes become ``+``."""
+    phone = _PHONE_NOISE.sub('', phone or '')
+    plus = phone.startswith('+')
+    digits = phone.replace('+', '')
+    if not plus and digits.startswith('00'):
+        plus, digits = True, digits[2:]
+    return ('+' if plus and digits else '') + digits
+
+
+def email_hash(email):
+    """
+    Fixed-width key for the ``(business, email_hash)`` index: matching on
+    it ignores case and surrounding whitespace without a functional index.
+    """
+    email = normalize_email(email)
+    return hashlib.blake2b(email.encode(), digest_size=16).hexdigest() if email else ''
+
+
+def _cache_key(business_id, hashed):
+    return f'crm:customer:{business_id}:{hashed}'
+
+
+def split_name(name):
+    first_name, _, last_name = (name or '').strip().partition(' ')
+    return first_name[:100], last_name.strip()[:100]
+
+
+def customer_id_for(business_id, email, name='', phone='', user_id=None):
+    """
+    The CRM customer for ``email`` at a business, created when missing.
+    Returns ``None`` for bookings without an email.
+    
+    Hits are cached per ``(business, email_hash)``; a created customer is
+    only cached once the surrounding transaction commits.
+    """
+    hashed = email_hash(email)
+    if not hashed:
+        return None
+    key = _cache_key(business_id, hashed)
+    customer_id = cache.get(key)
+    if customer_id is not None:
+        return customer_id
+    
+    customer_id = (
+        Customer.objects.filter(business_id=business_id, email_hash=hashed)
+        .order_by('created_at')
+        .values_list('pk', flat=True)
+        .first()
+    )
+    if customer_id is None:
+        first_name, last_name = split_name(name)
+        customer, _ = Customer.objects.get_or_create(
+            business_id=business_id,
+            email=normalize_email(email),
+            defaults={
+                'user_id': user_id,
+                'first_name': first_name,
+                'last_name': last_name,
+                'phone': normalize_phone(phone)[:20],
+            },
+        )
+        customer_id = customer.pk
+    transaction.on_commit(lambda: cache.set(key, customer_id, CACHE_TIMEOUT))
+    return customer_id
+
+
+def link_booking(booking):
+    """Point an unsaved booking at its CRM customer."""
+    booking.crm_customer_id = customer_id_for(
+        booking.business_id,
+        booking.customer_email,
+        name=booking.customer_name,
+        phone=booking.customer_phone,
+        user_id=booking.customer_id,
+    )
+    return booking.crm_customer_id
+
+
+def forget_customers(keys):
+    """
+    Drop cached lookups for ``(business_id, email_hash)`` pairs, now and
+    again once the transaction commits, so a concurrent lookup can't
+    re-cache the old row in between.
+    """
+    keys = [_cache_key(business_id, hashed) for business_id, hashed in keys if business_id and hashed]
+    if keys:
+        cache.delete_many(keys)
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def forget_customer(business_id, email):
+    forget_customers([(business_id, email_hash(email))])
+
+
+def hash_customer_emails(chunk_size=CHUNK_SIZE):
+    """Fill ``email_hash`` for customers written before it existed, one bulk update per chunk."""
+    total = 0
+    last_pk = None
+    while True:
+        queryset = Customer.objects.filter(email_hash='').order_by('pk')
+        if last_pk is not None:
+            queryset = queryset.filter(pk__gt=last_pk)
+        rows = list(queryset.values_list('pk', 'email')[:chunk_size])
+        if not rows:
+            break
+        last_pk = rows[-1][0]
+        Customer.objects.bulk_update(
+            [Customer(pk=pk, email_hash=email_hash(email)) for pk, email in rows if email],
+            ['email_hash'],
+        )
+        total += len(rows)
+        if len(rows) < chunk_size:
+            break
+    return total
+
+
+def _resolve_customers(rows):
+    """
+    Map ``(business_id, email_hash)`` to a customer id for a chunk of
+    booking rows, creating missing customers with one ``bulk_create``.
+    """
+    wanted = {}
+    for _, business_id, email, name, phone, user_id in rows:
+        hashed = email_hash(email)
+        if hashed:
+            wanted.setdefault((business_id, hashed), (email, name, phone, user_id))
+    if not wanted:
+        return {}
+    
+    def lookup():
+        found = {}
+        existing = Customer.objects.filter(
+            business_id__in={business_id for business_id, _ in wanted},
+            email_hash__in={hashed for _, hashed in wanted},
+        ).order_by('-created_at').values_list('business_id', 'email_hash', 'pk')
+        for business_id, hashed, pk in existing:
+            # Oldest wins when case variants were stored separately
+            found[(business_id, hashed)] = pk
+        return {key: pk for key, pk in found.items() if key in wanted}
+    
+    resolved = lookup()
+    missing = [key for key in wanted if key not in resolved]
+    if missing:
+        customers = []
+        for business_id, hashed in missing:
+            email, name, phone, user_id = wanted[(business_id, hashed)]
+            first_name, last_name = split_name(name)
+            customers.append(Customer(
+                business_id=business_id,
+                user_id=user_id,
+                email=normalize_email(email),
+                email_hash=hashed,
+                first_name=first_name,
+                last_name=last_name,
+                phone=normalize_phone(phone)[:20],
+            ))
+        # Conflicts are customers created concurrently; the re-read picks them up
+        Customer.objects.bulk_create(customers, ignore_conflicts=True)
+        resolved = lookup()
+    return resolved
+
+
+def link_bookings(queryset=None, chunk_size=CHUNK_SIZE, progress=None):
+    """
+    Backfill ``Booking.crm_customer`` in primary-key chunks: per chunk one
+    read, one customer lookup (plus one insert for new customers) and one
+    bulk UPDATE, so memory stays bounded by ``chunk_size`` however many
+    bookings there are. Returns ``(scanned, linked)``.
+    """
+    queryset = Booking.objects.all() if queryset is None else queryset
+    pending = queryset.filter(crm_customer__isnull=True).order_by('pk')
+    scanned = linked = 0
+    last_pk = None
+    while True:
+        chunk = pending if last_pk is None else pending.filter(pk__gt=last_pk)
+        rows = list(chunk.values_list(
+            'pk', 'business_id', 'customer_email', 'customer_name', 'customer_phone', 'customer_id',
+        )[:chunk_size])
+        if not rows:
+            break
+        last_pk = rows[-1][0]
+        
+        with transaction.atomic():
+            resolved = _resolve_customers(rows)
+            updates = []
+            for pk, business_id, email, *_ in rows:
+                customer_id = resolved.get((business_id, email_hash(email)))
+                if customer_id is not None:
+                    updates.append(Booking(pk=pk, crm_customer_id=customer_id))
+            Booking.objects.bulk_update(updates, ['crm_customer'])
+        
+        scanned += len(rows)
+        linked += len(updates)
+        if progress is not None:
+            progress(scanned, linked)
+        if len(rows) < chunk_size:
+            break
+    return scanned, linked
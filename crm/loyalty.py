@@ -0,0 +1,190 @@
+# apps/crm/loyalty.py
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Exists, F, IntegerField, OuterRef, Sum, Value, When
+from django.utils import timezone
+
+from apps.bookings.models import Booking
+
+from .models import Customer, LoyaltyLedgerEntry, LoyaltyRule
+
+CHUNK_SIZE = getattr(settings, 'LOYALTY_CHUNK_SIZE', 5000)
+
+
+class InsufficientPoints(Exception):
+    pass
+
+
+def active_rules(business_ids):
+    return {
+        rule.business_id: rule
+        for rule in LoyaltyRule.objects.filter(business_id__in=set(business_ids), is_active=True)
+    }
+
+
+def earnable_bookings(queryset=None):
+    """Completed, CRM-linked bookings that have not earned points yet."""
+    queryset = Booking.objects.all() if queryset is None else queryset
+    earned = LoyaltyLedgerEntry.objects.filter(booking=OuterRef('pk'), kind='EARN')
+    return queryset.filter(status='COMPLETED', crm_customer__isnull=False).exclude(Exists(earned))
+
+
+def record_earnings(queryset=None, chunk_size=CHUNK_SIZE, now=None):
+    """
+    Append an EARN entry for every earnable booking, one ``bulk_create``
+    per primary-key chunk. Entries take effect when the booking was
+    completed. Balances are not touched here; see ``apply_pending``.
+    
+    Bookings that earn nothing (e.g. their business has no active rule)
+    get a zero-point entry, stamped as already applied, so they leave
+    ``earnable_bookings`` instead of being rescanned and locked every run.
+    
+    Each chunk's bookings are locked (skipping ones a concurrent run
+    holds) until its entries are written. Returns the number of entries
+    actually written, zero-point ones included, read back after the insert
+    since ``ignore_conflicts`` drops duplicates silently.
+    """
+    now = now or timezone.now()
+    pending = earnable_bookings(queryset).order_by('pk')
+    rules = {}
+    total = 0
+    last_pk = None
+    while True:
+        chunk = pending if last_pk is None else pending.filter(pk__gt=last_pk)
+        with transaction.atomic():
+            rows = list(
+                chunk.select_for_update(skip_locked=True, of=('self',))
+                .values_list(
+                    'pk', 'business_id', 'crm_customer_id', 'total_amount',
+                    'crm_customer__customer_type', 'completed_at',
+                )[:chunk_size]
+            )
+            if not rows:
+                break
+            last_pk = rows[-1][0]
+            
+            missing = {row[1] for row in rows} - rules.keys()
+            if missing:
+                found = active_rules(missing)
+                rules.update({business_id: found.get(business_id) for business_id in missing})
+            
+            entries = []
+            for pk, business_id, customer_id, amount, customer_type, completed_at in rows:
+                rule = rules[business_id]
+                points = rule.points_for(amount, customer_type) if rule else 0
+                entries.append(LoyaltyLedgerEntry(
+                    business_id=business_id,
+                    customer_id=customer_id,
+                    booking_id=pk,
+                    kind='EARN',
+                    points=points,
+                    effective_at=completed_at or now,
+                    # Nothing to fold into the balance
+                    applied_at=None if points else now,
+                ))
+            if entries:
+                # The unique (booking, EARN) constraint still guards against
+                # other writers; count what actually landed
+                before = _earned_count(entries)
+                LoyaltyLedgerEntry.objects.bulk_create(entries, ignore_conflicts=True)
+                total += _earned_count(entries) - before
+        if len(rows) < chunk_size:
+            break
+    return total
+
+
+def _earned_count(entries):
+    return LoyaltyLedgerEntry.objects.filter(
+        booking_id__in=[entry.booking_id for entry in entries], kind='EARN',
+    ).count()
+
+
+def apply_pending(chunk_size=CHUNK_SIZE, now=None):
+    """
+    Fold unapplied ledger entries into ``Customer.loyalty_points``.
+    
+    Per chunk: claim entries (skipping ones another worker holds), sum
+    them per customer in the database, add the sums with one CASE UPDATE
+    and stamp the entries as applied, all in one transaction. Customers
+    are never updated once per entry, so busy customers don't serialize
+    bookings. Returns ``(entries, customers)`` applied.
+    """
+    now = now or timezone.now()
+    entries = customers = 0
+    while True:
+        with transaction.atomic():
+            ids = list(
+                LoyaltyLedgerEntry.objects.filter(applied_at__isnull=True)
+                .order_by('pk')
+                .select_for_update(skip_locked=True)
+                .values_list('pk', flat=True)[:chunk_size]
+            )
+            if not ids:
+                break
+            totals = dict(
+                LoyaltyLedgerEntry.objects.filter(pk__in=ids)
+                .order_by()
+                .values('customer_id')
+                .annotate(total=Sum('points'))
+                .values_list('customer_id', 'total')
+            )
+            Customer.objects.filter(pk__in=totals).update(
+                loyalty_points=F('loyalty_points') + Case(
+                    *[When(pk=customer_id, then=Value(total)) for customer_id, total in totals.items()],
+                    default=Value(0),
+                    output_field=IntegerField(),
+                )
+            )
+            LoyaltyLedgerEntry.objects.filter(pk__in=ids).update(applied_at=now)
+        entries += len(ids)
+        customers += len(totals)
+        if len(ids) < chunk_size:
+            break
+    return entries, customers
+
+
+def balance_at(customer_id, when=None):
+    """Points held at ``when`` (default now), applied or not, from the ledger."""
+    entries = LoyaltyLedgerEntry.objects.filter(customer_id=customer_id)
+    if when is not None:
+        entries = entries.filter(effective_at__lte=when)
+    return entries.aggregate(total=Sum('points'))['total'] or 0
+
+
+def balances_at(customer_ids, when):
+    """``balance_at`` for many customers in one grouped query."""
+    balances = dict.fromkeys(customer_ids, 0)
+    balances.update(
+        LoyaltyLedgerEntry.objects.filter(customer_id__in=customer_ids, effective_at__lte=when)
+        .order_by()
+        .values('customer_id')
+        .annotate(total=Sum('points'))
+        .values_list('customer_id', 'total')
+    )
+    return balances
+
+
+def record_entry(customer, kind, points, description='', booking=None):
+    """
+    Append a REDEEM, ADJUST or EXPIRE entry. Debits lock the customer row
+    and are checked against the ledger balance, so points can't be spent
+    twice.
+    """
+    with transaction.atomic():
+        if points < 0:
+            list(Customer.objects.select_for_update().filter(pk=customer.pk).values_list('pk'))
+            if balance_at(customer.pk) + points < 0:
+                raise InsufficientPoints(f'Customer {customer.pk} has fewer than {-points} points.')
+        return LoyaltyLedgerEntry.objects.create(
+            business_id=customer.business_id,
+            customer=customer,
+            booking=booking,
+            kind=kind,
+            points=points,
+            description=description,
+        )
+
+
+def redeem(customer, points, description='', booking=None):
+    return record_entry(customer, 'REDEEM', -abs(points), description, booking)
+
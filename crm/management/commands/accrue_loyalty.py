@@ -0,0 +1,43 @@
+# apps/crm/management/commands/accrue_loyalty.py
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from apps.bookings.models import Booking
+from apps.crm.loyalty import CHUNK_SIZE, apply_pending, record_earnings
+
+
+class Command(BaseCommand):
+    help = 'End-of-day loyalty accrual: earn points for completed bookings, then apply pending ledger entries'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help='Only earn for bookings on this date (default: all pending)')
+        parser.add_argument('--yesterday', action='store_true', help='Shorthand for --date <yesterday>')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+        parser.add_argument('--apply-only', action='store_true', help='Skip earning; only apply pending entries')
+    
+    def handle(self, *args, **options):
+        if not options['apply_only']:
+            bookings = Booking.objects.all()
+            day = timezone.localdate() - timedelta(days=1) if options['yesterday'] else None
+            if options['date']:
+                day = self.parse_day(options['date'])
+            if day is not None:
+                bookings = bookings.filter(date=day)
+            earned = record_earnings(bookings, options['chunk_size'])
+            self.stdout.write(f'Recorded {earned} earn entries.')
+        
+        applied, customers = apply_pending(options['chunk_size'])
+        self.stdout.write(f'Applied {applied} entries to {customers} customers.')
+    
+    def parse_day(self, value):
+        # A bad --date must not widen the run to every pending booking
+        try:
+            day = parse_date(value)
+        except ValueError:
+            day = None
+        if day is None:
+            raise CommandError(f'Invalid --date {value!r}; expected YYYY-MM-DD.')
+        return day
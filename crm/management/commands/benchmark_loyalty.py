@@ -0,0 +1,82 @@
+# apps/crm/management/commands/benchmark_loyalty.py
+import resource
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count
+
+from apps.bookings.models import Booking
+from apps.crm.linking import link_bookings
+from apps.crm.loyalty import CHUNK_SIZE, apply_pending, balances_at, earnable_bookings, record_earnings
+from apps.crm.models import LoyaltyRule
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Time end-of-day loyalty accrual over completed bookings (earn + apply) and '
+        'point-in-time balance queries; everything is rolled back. For the 1M case, '
+        'generate the data first with generate_load_data --bookings 1500000.'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+        parser.add_argument('--balance-queries', type=int, default=1000)
+    
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            self.stdout.write('Rolled back.')
+    
+    def timed(self, label, func, *args, **kwargs):
+        started = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'{label:<16} {elapsed:>8.2f}s  -> {result}  '
+            f'(peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB)'
+        )
+        return result, elapsed
+    
+    def run(self, options):
+        business_ids = list(Booking.objects.filter(status='COMPLETED').values_list('business_id', flat=True).distinct())
+        if not business_ids:
+            raise CommandError('No completed bookings found; generate data first.')
+        
+        LoyaltyRule.objects.filter(business_id__in=business_ids).delete()
+        LoyaltyRule.objects.bulk_create([
+            LoyaltyRule(business_id=business_id, points_per_currency=Decimal('1'), points_per_visit=10,
+                        multipliers={'VIP': 1.5, 'CORPORATE': 1.2})
+            for business_id in business_ids
+        ])
+        
+        if Booking.objects.filter(status='COMPLETED', crm_customer__isnull=True).exists():
+            self.timed('link customers', link_bookings, Booking.objects.filter(status='COMPLETED'),
+                       options['chunk_size'])
+        
+        pending = earnable_bookings().count()
+        self.stdout.write(f'{pending} completed bookings to accrue')
+        earned, earn_seconds = self.timed('record earnings', record_earnings, None, options['chunk_size'])
+        (applied, customers), apply_seconds = self.timed('apply pending', apply_pending, options['chunk_size'])
+        self.stdout.write(
+            f'earn {earned / earn_seconds if earn_seconds else 0:,.0f} bookings/s, '
+            f'apply {applied / apply_seconds if apply_seconds else 0:,.0f} entries/s '
+            f'into {customers} customers'
+        )
+        
+        busiest = list(
+            Booking.objects.filter(crm_customer__isnull=False)
+            .values('crm_customer_id').annotate(n=Count('pk')).order_by('-n')
+            .values_list('crm_customer_id', flat=True)[:options['balance_queries']]
+        )
+        completed = Booking.objects.filter(status='COMPLETED').exclude(completed_at=None).order_by('completed_at')
+        midpoint = completed.values_list('completed_at', flat=True)[completed.count() // 2]
+        self.timed('balances_at', lambda: len(balances_at(busiest, midpoint)))
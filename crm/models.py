@@ -1,5 +1,8 @@
 # apps/crm/models.py
+from decimal import Decimal
 from django.db import models
+from django.db.models import Q
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.conf import settings
 import uuid
@@ -20,6 +23,7 @@ class Customer(models.Model):
     first_name = models.CharField(max_length=100)
     last_name = models.CharField(max_length=100)
     email = models.EmailField()
+    email_hash = models.CharField(max_length=32, blank=True, editable=False)  # see crm.linking
     phone = models.CharField(max_length=20)
     
     # Additional Info
@@ -56,11 +60,25 @@ class Customer(models.Model):
         indexes = [
             models.Index(fields=['business', 'customer_type']),
             models.Index(fields=['email']),
+            models.Index(fields=['business', 'created_at']),
+            models.Index(fields=['business', 'email_hash']),
+            # Prefix search (LIKE 'x%') on PostgreSQL needs the pattern opclass
+            models.Index(fields=['last_name'], opclasses=['varchar_pattern_ops'], name='crm_customer_last_name_like'),
         ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name} - {self.business.name}"
     
+    def save(self, *args, **kwargs):
+        from .linking import email_hash
+        
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'email' in update_fields:
+            self.email_hash = email_hash(self.email)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'email_hash'}
+        super().save(*args, **kwargs)
+    
     @property
     def full_name(self):
         return f"{self.first_name} {self.last_name}"
@@ -128,6 +146,8 @@ class Lead(models.Model):
         indexes = [
             models.Index(fields=['business', 'status']),
             models.Index(fields=['assigned_to']),
+            models.Index(fields=['email']),
+            models.Index(fields=['name'], opclasses=['varchar_pattern_ops'], name='crm_lead_name_like'),
         ]
     
     def __str__(self):
@@ -160,4 +180,72 @@ class Communication(models.Model):
         ordering = ['-created_at']
     
     def __str__(self):
-        return f"{self.type} - {self.subject}"
\ No newline at end of file
+        return f"{self.type} - {self.subject}"
+
+
+class LoyaltyRule(models.Model):
+    """How a business's customers earn points for a completed booking."""
+    business = models.OneToOneField('businesses.Business', on_delete=models.CASCADE, related_name='loyalty_rule')
+    
+    points_per_currency = models.DecimalField(max_digits=8, decimal_places=4, default=Decimal('1.0000'),
+                                              help_text=_('Points per unit of the booking total'))
+    points_per_visit = models.IntegerField(default=0)
+    # customer_type -> multiplier, e.g. {"VIP": 1.5}; missing types earn 1x
+    multipliers = models.JSONField(default=dict, blank=True)
+    is_active = models.BooleanField(default=True)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = _('Loyalty Rule')
+        verbose_name_plural = _('Loyalty Rules')
+    
+    def __str__(self):
+        return f"{self.business_id}: {self.points_per_currency}/unit + {self.points_per_visit}/visit"
+    
+    def points_for(self, amount, customer_type):
+        points = (amount or 0) * self.points_per_currency + self.points_per_visit
+        return int(points * Decimal(str(self.multipliers.get(customer_type, 1))))
+
+
+class LoyaltyLedgerEntry(models.Model):
+    """
+    Append-only record of point changes; ``points`` is never edited.
+    ``Customer.loyalty_points`` is the sum of applied entries, folded in by
+    ``crm.loyalty.apply_pending``.
+    """
+    KIND_CHOICES = [
+        ('EARN', _('Earned')),
+        ('REDEEM', _('Redeemed')),
+        ('ADJUST', _('Adjustment')),
+        ('EXPIRE', _('Expired')),
+    ]
+    
+    business = models.ForeignKey('businesses.Business', on_delete=models.CASCADE, related_name='loyalty_entries')
+    customer = models.ForeignKey(Customer, on_delete=models.CASCADE, related_name='loyalty_entries')
+    booking = models.ForeignKey('bookings.Booking', on_delete=models.SET_NULL, null=True, blank=True,
+                                related_name='loyalty_entries')
+    
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    points = models.IntegerField()
+    description = models.CharField(max_length=200, blank=True)
+    
+    effective_at = models.DateTimeField(default=timezone.now)  # balance queries go by this
+    created_at = models.DateTimeField(auto_now_add=True)
+    applied_at = models.DateTimeField(null=True, blank=True)  # folded into Customer.loyalty_points
+    
+    class Meta:
+        verbose_name = _('Loyalty Ledger Entry')
+        verbose_name_plural = _('Loyalty Ledger Entries')
+        ordering = ['-effective_at']
+        indexes = [
+            models.Index(fields=['customer', 'effective_at']),
+            models.Index(fields=['id'], condition=Q(applied_at__isnull=True), name='crm_loyalty_pending_idx'),
+        ]
+        constraints = [
+            # A booking earns once, however often accrual runs
+            models.UniqueConstraint(fields=['booking'], condition=Q(kind='EARN'), name='crm_loyalty_one_earn_per_booking'),
+        ]
+    
+    def __str__(self):
+        return f"{self.customer_id}: {self.points:+d} ({self.kind})"
@@ -0,0 +1,33 @@
+# apps/crm/signals.py
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .linking import forget_customers
+from .models import Customer
+
+
+def link_key(instance):
+    # Read from __dict__ so deferred fields are never loaded just for this
+    values = instance.__dict__
+    return values.get('business_id'), values.get('email_hash')
+
+
+@receiver(post_init, sender=Customer)
+def remember_link_key(sender, instance, **kwargs):
+    instance._link_key = link_key(instance)
+
+
+@receiver(post_save, sender=Customer)
+def forget_link_on_save(sender, instance, created, raw=False, **kwargs):
+    new_key = link_key(instance)
+    old_key = None if created else getattr(instance, '_link_key', None)
+    if old_key != new_key:
+        # Both: bookings for the old email must stop resolving here, and
+        # the new email may have been cached against another customer
+        forget_customers([key for key in (old_key, new_key) if key])
+    instance._link_key = new_key
+
+
+@receiver(post_delete, sender=Customer)
+def forget_link_on_delete(sender, instance, **kwargs):
+    forget_customers([getattr(instance, '_link_key', None) or link_key(instance)])
@@ -1,3 +1,34 @@
+# apps/crm/tests.py
+from django.contrib import admin
 from django.test import TestCase
 
-# Create your tests here.
+from apps.accounts.models import User
+from apps.businesses.models import Business
+from apps.core.testing import AdminQueryMixin
+
+from .models import Customer, Lead, LoyaltyLedgerEntry
+
+
+class CrmAdminQueryTests(AdminQueryMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        owner = User.objects.create_user('owner@example.com', first_name='Owner')
+        business = Business.objects.create(owner=owner, name='Test Business')
+        for i in range(12):
+            customer = Customer.objects.create(
+                business=business, first_name='Client', last_name=f'Number {i}',
+                email=f'client{i}@example.com', phone='',
+            )
+            Lead.objects.create(business=business, name=f'Lead {i}', email=f'lead{i}@example.com', phone='')
+            LoyaltyLedgerEntry.objects.create(business=business, customer=customer, kind='ADJUST', points=10)
+    
+    def test_changelists_stay_within_budget(self):
+        for model in (Customer, Lead, LoyaltyLedgerEntry):
+            self.assertChangelistWithinBudget(model)
+    
+    def test_bulk_actions_run_constant_queries(self):
+        for model in (Customer, Lead, LoyaltyLedgerEntry):
+            rows = model.objects.order_by('pk')
+            small = model.objects.filter(pk__in=rows.values_list('pk', flat=True)[:1])
+            for action in admin.site._registry[model].actions:
+                self.assertActionQueriesConstant(model, action, small, rows)
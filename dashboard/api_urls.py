@@ -0,0 +1,15 @@
+# apps/dashboard/api_urls.py
+from django.urls import path
+from . import async_views
+from .views import BookingRescheduleView
+
+app_name = 'dashboard_api'
+
+urlpatterns = [
+    path('bookings/<uuid:pk>/update-time/', BookingRescheduleView.as_view(), name='booking_update_time'),
+    
+    # Async (ASGI) read endpoints
+    path('calendar/events/', async_views.calendar_events, name='calendar_events'),
+    path('services/<uuid:service_id>/availability/', async_views.service_availability, name='service_availability'),
+    path('dashboard/stats/', async_views.dashboard_stats, name='dashboard_stats'),
+]
@@ -0,0 +1,118 @@
+# apps/dashboard/async_views.py
+import asyncio
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import login_required
+from django.db.models import F
+from django.http import Http404, JsonResponse
+from django.utils import timezone
+
+from apps.bookings.models import Booking, TimeSlot
+from apps.businesses.timezones import business_timezone
+from apps.core.db_router import read_replica
+from apps.core.tz import isoformat_utc, local_now, to_utc_epoch
+from apps.crm.models import Customer
+from .reports import arevenue_summary
+from .views import bookings_to_events, parse_date_param
+
+BUSINESS_ROLES = ['BUSINESS_ADMIN', 'BUSINESS_STAFF', 'SUPER_ADMIN']
+
+
+async def get_business(request):
+    # Async counterpart of BusinessOwnerMixin + get_business()
+    user = await request.auser()
+    if user.role not in BUSINESS_ROLES:
+        raise Http404
+    business = await user.owned_businesses.afirst()
+    if business is None:
+        raise Http404
+    return business
+
+
+@read_replica
+@login_required
+async def calendar_events(request):
+    business = await get_business(request)
+    today = timezone.now().date()
+    start_date = parse_date_param(request.GET.get('start', '')[:10], today - timedelta(days=30))
+    end_date = parse_date_param(request.GET.get('end', '')[:10], today + timedelta(days=30))
+    
+    bookings = Booking.objects.filter(
+        business=business,
+        date__gte=start_date,
+        date__lte=end_date,
+    ).select_related('service')
+    
+    zone_name = await sync_to_async(business_timezone)(business.pk)
+    events = bookings_to_events([booking async for booking in bookings], zone_name)
+    return JsonResponse(events, safe=False)
+
+
+@read_replica
+@login_required
+async def service_availability(request, service_id):
+    business = await get_business(request)
+    zone_name = await sync_to_async(business_timezone)(business.pk)
+    day = parse_date_param(request.GET.get('date')) or local_now(zone_name).date()
+    
+    slots = TimeSlot.objects.filter(
+        business=business,
+        service_id=service_id,
+        date=day,
+        is_available=True,
+        current_bookings__lt=F('max_bookings'),
+    ).values('id', 'provider_id', 'start_time', 'end_time', 'max_bookings', 'current_bookings')
+    slots = [slot async for slot in slots]
+    starts_at = isoformat_utc(to_utc_epoch(zone_name, [day] * len(slots), [slot['start_time'] for slot in slots]))
+    
+    available = [
+        {
+            'id': str(slot['id']),
+            'provider': str(slot['provider_id']) if slot['provider_id'] else None,
+            'start': slot['start_time'].isoformat(timespec='minutes'),
+            'end': slot['end_time'].isoformat(timespec='minutes'),
+            'starts_at': start_utc,
+            'remaining': slot['max_bookings'] - slot['current_bookings'],
+        }
+        for slot, start_utc in zip(slots, starts_at)
+    ]
+    return JsonResponse({'date': day.isoformat(), 'timezone': zone_name, 'slots': available})
+
+
+@read_replica
+@login_required
+async def dashboard_stats(request):
+    business = await get_business(request)
+    today = timezone.now().date()
+    month_start = today.replace(day=1)
+    
+    today_bookings = Booking.objects.filter(business=business, date=today)
+    monthly_bookings = Booking.objects.filter(business=business, date__gte=month_start)
+    
+    # Independent queries are issued together instead of one after another
+    (
+        today_count,
+        monthly_count,
+        pending_count,
+        revenue_today,
+        revenue_month,
+        new_customers,
+    ) = await asyncio.gather(
+        today_bookings.acount(),
+        monthly_bookings.acount(),
+        today_bookings.filter(status='PENDING').acount(),
+        arevenue_summary(business, today, today),
+        arevenue_summary(business, month_start, today),
+        Customer.objects.filter(business=business, created_at__gte=month_start).acount(),
+    )
+    
+    return JsonResponse({
+        'today_bookings': today_count,
+        'today_revenue': revenue_today['collected'],
+        'monthly_bookings': monthly_count,
+        'monthly_revenue': revenue_month['collected'],
+        'monthly_revenue_breakdown': revenue_month,
+        'new_customers': new_customers,
+        'pending_bookings': pending_count,
+    })
@@ -0,0 +1,209 @@
+# apps/dashboard/charts.py
+import json
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count
+from django.utils import timezone
+
+from apps.bookings.models import Booking
+from apps.bookings.stats import POPULARITY_WINDOWS, top_services, top_services_in_window
+from apps.core.lazy import lazy_import
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# Only chart building needs these; imported on first use
+pd = lazy_import('pandas')
+go = lazy_import('plotly.graph_objects')
+
+CHART_CACHE_TIMEOUT = getattr(settings, 'DASHBOARD_CHART_CACHE_TIMEOUT', 300)
+MAX_RANGE_DAYS = 366
+
+STATUS_COLORS = {
+    'PENDING': '#FFA500',
+    'CONFIRMED': '#4CAF50',
+    'IN_PROGRESS': '#2196F3',
+    'COMPLETED': '#9E9E9E',
+    'CANCELLED': '#F44336',
+    'NO_SHOW': '#795548',
+}
+
+
+def _json_default(obj):
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (date, datetime)):
+        return obj.isoformat()
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    if hasattr(obj, 'item'):
+        return obj.item()
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+class _ChartJSONEncoder(DjangoJSONEncoder):
+    def default(self, obj):
+        try:
+            return _json_default(obj)
+        except TypeError:
+            return super().default(obj)
+
+
+def dumps(payload):
+    """Serialize a chart payload to JSON bytes, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(
+            payload,
+            default=_json_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(payload, cls=_ChartJSONEncoder, separators=(',', ':')).encode()
+
+
+def resolve_range(days=30, end_date=None):
+    end_date = end_date or timezone.now().date()
+    days = max(1, min(int(days), MAX_RANGE_DAYS))
+    return end_date - timedelta(days=days - 1), end_date
+
+
+def _daily_series(rows, value_key, start_date, end_date):
+    # One grouped query per chart; pandas fills the days without bookings
+    index = pd.date_range(start_date, end_date, freq='D')
+    frame = pd.DataFrame.from_records(list(rows), columns=['date', value_key])
+    if frame.empty:
+        return pd.Series(0.0, index=index)
+    series = frame.set_index(pd.to_datetime(frame['date']))[value_key].astype(float)
+    return series.reindex(index, fill_value=0.0)
+
+
+def _figure_payload(fig):
+    return fig.to_plotly_json()
+
+
+def build_trend_figure(business, start_date, end_date):
+    rows = (
+        Booking.objects.filter(business=business, date__range=(start_date, end_date))
+        .order_by()
+        .values_list('date')
+        .annotate(count=Count('id'))
+    )
+    series = _daily_series(rows, 'count', start_date, end_date)
+    
+    fig = go.Figure(go.Scatter(
+        x=series.index.strftime('%Y-%m-%d').tolist(),
+        y=series.astype(int).tolist(),
+        mode='lines+markers',
+        name='Bookings',
+    ))
+    fig.update_layout(margin=dict(l=30, r=10, t=10, b=30))
+    return _figure_payload(fig)
+
+
+def build_revenue_figure(business, start_date, end_date):
+    from .reports import build_revenue_report
+    
+    rows = [
+        (row['key'], row['collected'])
+        for row in build_revenue_report(business, start_date, end_date, group_by='day')
+    ]
+    series = _daily_series(rows, 'total', start_date, end_date)
+    
+    fig = go.Figure(go.Bar(
+        x=series.index.strftime('%Y-%m-%d').tolist(),
+        y=series.round(2).tolist(),
+        name='Revenue',
+    ))
+    fig.update_layout(margin=dict(l=30, r=10, t=10, b=30))
+    return _figure_payload(fig)
+
+
+def build_status_figure(business, start_date, end_date):
+    rows = list(
+        Booking.objects.filter(business=business, date__range=(start_date, end_date))
+        .order_by()
+        .values_list('status')
+        .annotate(count=Count('id'))
+    )
+    labels = [status for status, _ in rows]
+    
+    fig = go.Figure(go.Pie(
+        labels=labels,
+        values=[count for _, count in rows],
+        marker=dict(colors=[STATUS_COLORS.get(status, '#607D8B') for status in labels]),
+        hole=0.4,
+    ))
+    fig.update_layout(margin=dict(l=10, r=10, t=10, b=10))
+    return _figure_payload(fig)
+
+
+def build_services_figure(business, window=None, limit=5, today=None):
+    if window in POPULARITY_WINDOWS:
+        services = top_services_in_window(business, window, limit=limit, today=today)
+    else:
+        services = top_services(business, limit=limit)
+    
+    fig = go.Figure(go.Bar(
+        x=[s['count'] for s in services],
+        y=[s['name'] for s in services],
+        orientation='h',
+    ))
+    fig.update_layout(margin=dict(l=120, r=10, t=10, b=30), yaxis=dict(autorange='reversed'))
+    return _figure_payload(fig)
+
+
+CHART_BUILDERS = {
+    'trend': build_trend_figure,
+    'revenue': build_revenue_figure,
+    'status': build_status_figure,
+}
+
+
+def _cache_version_key(business_id):
+    return f'dashboard:charts:version:{business_id}'
+
+
+def invalidate_business_charts(business_id):
+    cache.set(_cache_version_key(business_id), timezone.now().timestamp(), None)
+
+
+def chart_cache_key(kind, business_id, *parts):
+    version = cache.get(_cache_version_key(business_id), 0)
+    suffix = ':'.join(str(part) for part in parts)
+    return f'dashboard:charts:{business_id}:{version}:{kind}:{suffix}'
+
+
+def get_chart_payload(kind, business, days=30, window=None):
+    """
+    Return the serialized figure for ``kind`` as JSON bytes, built at most
+    once per business/range until the cache entry expires or is invalidated.
+    """
+    if kind == 'services':
+        if window in POPULARITY_WINDOWS:
+            # Window bounds move at midnight, so the day is part of the key
+            today = timezone.now().date()
+            key = chart_cache_key(kind, business.pk, window, today)
+        else:
+            today = None
+            key = chart_cache_key(kind, business.pk, 'all')
+        builder = lambda: build_services_figure(business, window=window, today=today)
+    elif kind in CHART_BUILDERS:
+        start_date, end_date = resolve_range(days)
+        key = chart_cache_key(kind, business.pk, start_date, end_date)
+        builder = lambda: CHART_BUILDERS[kind](business, start_date, end_date)
+    else:
+        raise KeyError(kind)
+    
+    payload = cache.get(key)
+    if payload is None:
+        payload = dumps(builder())
+        cache.set(key, payload, CHART_CACHE_TIMEOUT)
+    return payload
+
+
+CHART_KINDS = tuple(CHART_BUILDERS) + ('services',)
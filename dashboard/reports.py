@@ -0,0 +1,182 @@
+# apps/dashboard/reports.py
+import csv
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, CharField, Count, DecimalField, F, Q, Sum, Value, When
+from django.db.models.functions import Coalesce, Concat, TruncDay, TruncMonth, TruncWeek, TruncYear
+
+from apps.bookings.archive import historical_querysets
+from .charts import chart_cache_key
+
+REPORT_CACHE_TIMEOUT = getattr(settings, 'DASHBOARD_REPORT_CACHE_TIMEOUT', 600)
+
+ZERO = Value(Decimal('0.00'), output_field=DecimalField(max_digits=14, decimal_places=2))
+
+PERIODS = {
+    'day': TruncDay,
+    'week': TruncWeek,
+    'month': TruncMonth,
+    'year': TruncYear,
+}
+
+DIMENSIONS = {
+    'service': {
+        'key': 'service_id',
+        'label': F('service__name'),
+    },
+    'provider': {
+        'key': 'provider_id',
+        'label': Concat(
+            'provider__user__first_name', Value(' '), 'provider__user__last_name',
+            output_field=CharField(),
+        ),
+    },
+}
+
+GROUPINGS = tuple(PERIODS) + tuple(DIMENSIONS)
+
+REPORT_COLUMNS = [
+    'bookings',
+    'gross',
+    'collected',
+    'deposits',
+    'outstanding',
+    'discounts',
+    'tax',
+    'refunded',
+]
+
+
+def _sum(expression, condition=None):
+    if condition is not None:
+        expression = Case(When(condition, then=expression), default=ZERO)
+    return Coalesce(Sum(expression, output_field=ZERO.output_field), ZERO)
+
+
+def revenue_aggregates():
+    """
+    Conditional aggregates for every revenue measure, so a report is a
+    single grouped query regardless of how many measures it returns.
+    """
+    paid = Q(payment_status='PAID')
+    partial = Q(payment_status='PARTIALLY_PAID')
+    refunded = Q(payment_status='REFUNDED')
+    earning = paid | partial
+    
+    return {
+        'bookings': Count('id'),
+        'gross': _sum(F('total_amount'), earning),
+        'collected': _sum(
+            Case(
+                When(paid, then=F('total_amount')),
+                When(partial, then=F('deposit_paid')),
+                default=ZERO,
+            )
+        ),
+        'deposits': _sum(F('deposit_paid'), earning),
+        'outstanding': _sum(F('total_amount') - F('deposit_paid'), partial),
+        'discounts': _sum(F('discount_amount'), earning),
+        'tax': _sum(F('tax_amount'), earning),
+        'refunded': _sum(F('total_amount'), refunded),
+    }
+
+
+def _report_querysets(business, start_date, end_date):
+    # Hot table (served by the (business, payment_status, date) index), plus
+    # the archive when the range reaches past the archive horizon
+    return [
+        queryset.filter(payment_status__in=['PAID', 'PARTIALLY_PAID', 'REFUNDED']).order_by()
+        for queryset in historical_querysets(start_date, end_date, business=business)
+    ]
+
+
+def _grouped_rows(queryset, group_by):
+    if group_by in PERIODS:
+        rows = (
+            queryset.annotate(period=PERIODS[group_by]('date'))
+            .values('period')
+            .annotate(**revenue_aggregates())
+        )
+        return [{'key': row.pop('period').isoformat(), 'label': None, **row} for row in rows]
+    
+    dimension = DIMENSIONS[group_by]
+    rows = (
+        queryset.values(key=F(dimension['key']), label=dimension['label'])
+        .annotate(**revenue_aggregates())
+    )
+    return [{**row, 'key': str(row['key']) if row['key'] else None} for row in rows]
+
+
+def _merge_rows(row_sets):
+    if len(row_sets) == 1:
+        return row_sets[0]
+    merged = {}
+    for rows in row_sets:
+        for row in rows:
+            existing = merged.get(row['key'])
+            if existing is None:
+                merged[row['key']] = dict(row)
+            else:
+                for column in REPORT_COLUMNS:
+                    existing[column] += row[column]
+    return list(merged.values())
+
+
+def build_revenue_report(business, start_date, end_date, group_by='month'):
+    if group_by not in GROUPINGS:
+        raise ValueError(f'Unknown report grouping: {group_by}')
+    
+    rows = _merge_rows([
+        _grouped_rows(queryset, group_by)
+        for queryset in _report_querysets(business, start_date, end_date)
+    ])
+    if group_by in PERIODS:
+        return sorted(rows, key=lambda row: row['key'])
+    return sorted(rows, key=lambda row: row['collected'], reverse=True)
+
+
+def revenue_report(business, start_date, end_date, group_by='month'):
+    key = chart_cache_key('revenue-report', business.pk, start_date, end_date, group_by)
+    rows = cache.get(key)
+    if rows is None:
+        rows = build_revenue_report(business, start_date, end_date, group_by)
+        cache.set(key, rows, REPORT_CACHE_TIMEOUT)
+    return rows
+
+
+def _sum_summaries(summaries):
+    total = summaries[0]
+    for summary in summaries[1:]:
+        total = {column: total[column] + summary[column] for column in total}
+    return total
+
+
+def revenue_summary(business, start_date, end_date):
+    return _sum_summaries([
+        queryset.aggregate(**revenue_aggregates())
+        for queryset in _report_querysets(business, start_date, end_date)
+    ])
+
+
+async def arevenue_summary(business, start_date, end_date):
+    return _sum_summaries([
+        await queryset.aaggregate(**revenue_aggregates())
+        for queryset in _report_querysets(business, start_date, end_date)
+    ])
+
+
+class Echo:
+    # File-like object that hands rows straight back to the csv writer
+    def write(self, value):
+        return value
+
+
+def iter_report_csv(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(['key', 'label'] + REPORT_COLUMNS)
+    for row in rows:
+        yield writer.writerow(
+            [row['key'], row['label'] or ''] + [row[column] for column in REPORT_COLUMNS]
+        )
@@ -0,0 +1,22 @@
+# apps/dashboard/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.bookings.events import bookings_created, bookings_transitioned
+from apps.bookings.models import Booking
+from .charts import invalidate_business_charts
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+def invalidate_charts_on_booking_change(sender, instance, raw=False, **kwargs):
+    if raw or instance.business_id is None:
+        return
+    invalidate_business_charts(instance.business_id)
+
+
+@receiver(bookings_created, sender=Booking)
+@receiver(bookings_transitioned, sender=Booking)
+def invalidate_charts_on_bulk_change(sender, rows, **kwargs):
+    for business_id in {row[1] for row in rows}:
+        invalidate_business_charts(business_id)
@@ -4,6 +4,10 @@ from .views import (
     DashboardHomeView,
     CalendarView,
     BookingListView,
+    ChartDataView,
+    RevenueReportView,
+    RevenueReportExportView,
+    QueryStatsView,
 )
 from django.views.generic import TemplateView
 
@@ -13,6 +17,10 @@ urlpatterns = [
     path('', DashboardHomeView.as_view(), name='home'),
     path('calendar/', CalendarView.as_view(), name='calendar'),
     path('bookings/', BookingListView.as_view(), name='bookings_list'),
+    path('charts/<slug:kind>/', ChartDataView.as_view(), name='chart_data'),
+    path('reports/revenue/', RevenueReportView.as_view(), name='revenue_report'),
+    path('reports/revenue/export/', RevenueReportExportView.as_view(), name='revenue_report_export'),
+    path('debug/queries/', QueryStatsView.as_view(), name='query_stats'),
 
     # Convenience names used in redirects
     path('business/', DashboardHomeView.as_view(), name='business_dashboard'),
@@ -1,20 +1,55 @@
 # apps/dashboard/views.py
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.views import View
 from django.views.generic import TemplateView, ListView, DetailView, CreateView, UpdateView
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.db.models import Count, Sum, Q, Avg
+from django.db.models import Q, Avg
 from django.utils import timezone
-from datetime import datetime, timedelta
-from apps.bookings.models import Booking, Service
+from datetime import datetime
+from apps.bookings.models import Booking
+from apps.bookings.stats import POPULARITY_WINDOWS
 from apps.businesses.models import Business
 from apps.crm.models import Customer, Lead
+from apps.bookings.conflicts import ScheduleConflict
+from apps.bookings.reschedule import BookingNotFound, InvalidEventTimes, RescheduleError, parse_event_times, reschedule_booking
+from apps.businesses.timezones import business_timezone
+from apps.core.instrumentation import request_stats
+from apps.core.tz import isoformat_local, parse_date_param
+from .charts import CHART_KINDS, STATUS_COLORS, get_chart_payload
+from .reports import GROUPINGS, iter_report_csv, revenue_report, revenue_summary
 import json
 
+def booking_to_event(booking, start=None, end=None):
+    return {
+        'id': str(booking.id),
+        'title': f"{booking.service.name} - {booking.customer_name}",
+        'start': start or f"{booking.date}T{booking.start_time}",
+        'end': end or f"{booking.date}T{booking.end_time}",
+        'backgroundColor': STATUS_COLORS.get(booking.status, '#607D8B'),
+        'extendedProps': {
+            'status': booking.status,
+            'customer': booking.customer_name,
+            'phone': booking.customer_phone,
+            'service': booking.service.name,
+        }
+    }
+
+def bookings_to_events(bookings, zone_name):
+    # Times carry the business's UTC offset, converted for the whole list at once
+    dates = [booking.date for booking in bookings]
+    starts = isoformat_local(zone_name, dates, [booking.start_time for booking in bookings])
+    ends = isoformat_local(zone_name, dates, [booking.end_time for booking in bookings])
+    return [booking_to_event(booking, start, end) for booking, start, end in zip(bookings, starts, ends)]
+
 class BusinessOwnerMixin(LoginRequiredMixin, UserPassesTestMixin):
     def test_func(self):
         return self.request.user.role in ['BUSINESS_ADMIN', 'BUSINESS_STAFF', 'SUPER_ADMIN']
 
 class DashboardHomeView(BusinessOwnerMixin, TemplateView):
     template_name = 'dashboard/home.html'
+    use_replica = True
+    query_budget = 15
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -46,13 +81,8 @@ class DashboardHomeView(BusinessOwnerMixin, TemplateView):
         )
         
         # Revenue calculation
-        revenue_today = today_bookings.filter(
-            payment_status='PAID'
-        ).aggregate(total=Sum('total_amount'))['total'] or 0
-        
-        revenue_month = monthly_bookings.filter(
-            payment_status='PAID'
-        ).aggregate(total=Sum('total_amount'))['total'] or 0
+        revenue_today = revenue_summary(business, today, today)
+        revenue_month = revenue_summary(business, month_start, today)
         
         # Customer stats
         new_customers = Customer.objects.filter(
@@ -60,57 +90,25 @@ class DashboardHomeView(BusinessOwnerMixin, TemplateView):
             created_at__gte=month_start
         ).count()
         
-        # Chart data for Plotly
-        chart_data = self.get_chart_data(business)
-        
         return {
             'business': business,
             'today_bookings': today_bookings.count(),
-            'today_revenue': revenue_today,
+            'today_revenue': revenue_today['collected'],
             'monthly_bookings': monthly_bookings.count(),
-            'monthly_revenue': revenue_month,
+            'monthly_revenue': revenue_month['collected'],
+            'monthly_revenue_breakdown': revenue_month,
             'new_customers': new_customers,
             'pending_bookings': today_bookings.filter(status='PENDING').count(),
-            'chart_data': json.dumps(chart_data),
+            # Charts are lazy-loaded by the page from ChartDataView
+            'chart_endpoints': {
+                kind: reverse('dashboard:chart_data', kwargs={'kind': kind})
+                for kind in CHART_KINDS
+            },
             'upcoming_bookings': today_bookings.filter(
                 status__in=['PENDING', 'CONFIRMED']
             ).order_by('start_time')[:5],
         }
     
-    def get_chart_data(self, business):
-        # Last 30 days booking data
-        end_date = timezone.now().date()
-        start_date = end_date - timedelta(days=29)
-        
-        bookings_by_day = []
-        current = start_date
-        
-        while current <= end_date:
-            count = Booking.objects.filter(
-                business=business,
-                date=current
-            ).count()
-            bookings_by_day.append({
-                'date': current.strftime('%Y-%m-%d'),
-                'count': count
-            })
-            current += timedelta(days=1)
-        
-        return {
-            'bookings_trend': bookings_by_day,
-            'services_popularity': self.get_services_popularity(business),
-        }
-    
-    def get_services_popularity(self, business):
-        services = Service.objects.filter(business=business).annotate(
-            booking_count=Count('bookings')
-        ).order_by('-booking_count')[:5]
-        
-        return [
-            {'name': s.name, 'count': s.booking_count}
-            for s in services
-        ]
-    
     def get_client_stats(self, user):
         upcoming_bookings = Booking.objects.filter(
             customer=user,
@@ -131,36 +129,14 @@ class DashboardHomeView(BusinessOwnerMixin, TemplateView):
 
 class CalendarView(BusinessOwnerMixin, TemplateView):
     template_name = 'dashboard/calendar.html'
+    use_replica = True
+    query_budget = 10
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         business = self.get_business()
         
-        # Get bookings for calendar
-        bookings = Booking.objects.filter(
-            business=business,
-            date__gte=timezone.now().date() - timedelta(days=30),
-            date__lte=timezone.now().date() + timedelta(days=30)
-        ).select_related('service', 'customer')
-        
-        # Format for FullCalendar
-        events = []
-        for booking in bookings:
-            events.append({
-                'id': str(booking.id),
-                'title': f"{booking.service.name} - {booking.customer_name}",
-                'start': f"{booking.date}T{booking.start_time}",
-                'end': f"{booking.date}T{booking.end_time}",
-                'backgroundColor': self.get_status_color(booking.status),
-                'extendedProps': {
-                    'status': booking.status,
-                    'customer': booking.customer_name,
-                    'phone': booking.customer_phone,
-                    'service': booking.service.name,
-                }
-            })
-        
-        context['events'] = json.dumps(events)
+        # Events are loaded by the calendar from the async events endpoint
         context['business'] = business
         return context
     
@@ -168,21 +144,15 @@ class CalendarView(BusinessOwnerMixin, TemplateView):
         return self.request.user.owned_businesses.first()
     
     def get_status_color(self, status):
-        colors = {
-            'PENDING': '#FFA500',
-            'CONFIRMED': '#4CAF50',
-            'IN_PROGRESS': '#2196F3',
-            'COMPLETED': '#9E9E9E',
-            'CANCELLED': '#F44336',
-            'NO_SHOW': '#795548',
-        }
-        return colors.get(status, '#607D8B')
+        return STATUS_COLORS.get(status, '#607D8B')
 
 class BookingListView(BusinessOwnerMixin, ListView):
     model = Booking
     template_name = 'dashboard/bookings/list.html'
     context_object_name = 'bookings'
     paginate_by = 20
+    use_replica = True
+    query_budget = 10
     
     def get_queryset(self):
         business = self.get_business()
@@ -213,4 +183,115 @@ class BookingListView(BusinessOwnerMixin, ListView):
         return queryset.select_related('service', 'customer').order_by('-created_at')
     
     def get_business(self):
-        return self.request.user.owned_businesses.first()
\ No newline at end of file
+        return self.request.user.owned_businesses.first()
+
+class ChartDataView(BusinessOwnerMixin, View):
+    use_replica = True
+    
+    def get(self, request, kind):
+        business = self.get_business()
+        if business is None or kind not in CHART_KINDS:
+            raise Http404
+        
+        try:
+            days = int(request.GET.get('days', 30))
+        except ValueError:
+            days = 30
+        try:
+            window = int(request.GET['window'])
+        except (KeyError, ValueError):
+            window = None
+        if window not in POPULARITY_WINDOWS:
+            window = None
+        
+        payload = get_chart_payload(kind, business, days=days, window=window)
+        response = HttpResponse(payload, content_type='application/json')
+        response['Cache-Control'] = 'private, max-age=60'
+        return response
+    
+    def get_business(self):
+        return self.request.user.owned_businesses.first()
+
+class RevenueReportView(BusinessOwnerMixin, View):
+    use_replica = True
+    
+    def get(self, request):
+        business = self.get_business()
+        if business is None:
+            raise Http404
+        
+        start_date, end_date, group_by = self.get_report_params()
+        rows = revenue_report(business, start_date, end_date, group_by)
+        return JsonResponse({
+            'start': start_date.isoformat(),
+            'end': end_date.isoformat(),
+            'group_by': group_by,
+            'rows': rows,
+        })
+    
+    def get_report_params(self):
+        today = timezone.now().date()
+        end_date = parse_date_param(self.request.GET.get('end'), today)
+        start_date = parse_date_param(self.request.GET.get('start'), end_date.replace(month=1, day=1))
+        if start_date > end_date:
+            start_date, end_date = end_date, start_date
+        
+        group_by = self.request.GET.get('group_by', 'month')
+        if group_by not in GROUPINGS:
+            group_by = 'month'
+        return start_date, end_date, group_by
+    
+    def get_business(self):
+        return self.request.user.owned_businesses.first()
+
+class RevenueReportExportView(RevenueReportView):
+    def get(self, request):
+        business = self.get_business()
+        if business is None:
+            raise Http404
+        
+        start_date, end_date, group_by = self.get_report_params()
+        rows = revenue_report(business, start_date, end_date, group_by)
+        
+        response = StreamingHttpResponse(iter_report_csv(rows), content_type='text/csv')
+        response['Content-Disposition'] = (
+            f'attachment; filename="revenue-{group_by}-{start_date}-{end_date}.csv"'
+        )
+        return response
+
+class BookingRescheduleView(BusinessOwnerMixin, View):
+    # Backs the calendar's drag/resize handler; answers in a single round trip
+    http_method_names = ['post']
+    
+    def post(self, request, pk):
+        business = self.request.user.owned_businesses.first()
+        if business is None:
+            raise Http404
+        
+        try:
+            payload = json.loads(request.body)
+            zone_name = business_timezone(business.pk)
+            new_date, start_time, end_time = parse_event_times(payload.get('start'), payload.get('end'), zone_name)
+            booking = reschedule_booking(pk, new_date, start_time, end_time, business=business)
+        except (ValueError, AttributeError):
+            return JsonResponse({'success': False, 'error': 'Invalid request body.'}, status=400)
+        except InvalidEventTimes as exc:
+            return JsonResponse({'success': False, 'error': str(exc)}, status=400)
+        except BookingNotFound as exc:
+            return JsonResponse({'success': False, 'error': str(exc)}, status=404)
+        except ScheduleConflict as exc:
+            return JsonResponse({'success': False, 'error': str(exc.message)}, status=409)
+        except RescheduleError as exc:
+            return JsonResponse({'success': False, 'error': str(exc)}, status=409)
+        
+        return JsonResponse({'success': True, 'event': bookings_to_events([booking], zone_name)[0]})
+
+class QueryStatsView(LoginRequiredMixin, UserPassesTestMixin, View):
+    # Rolling per-URL query stats for this worker process
+    def test_func(self):
+        return self.request.user.role == 'SUPER_ADMIN'
+    
+    def get(self, request):
+        if request.GET.get('reset'):
+            request_stats.reset()
+        return JsonResponse({'views': request_stats.snapshot()})
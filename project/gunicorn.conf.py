@@ -0,0 +1,27 @@
+# gunicorn.conf.py -- picked up automatically when gunicorn runs from this directory:
+#
+#     gunicorn project.wsgi
+#
+# GUNICORN_PRELOAD=1 loads the app (and the heavy analytics modules) once in
+# the master and forks workers from it; see apps.core.warmup.
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', os.cpu_count() * 2 + 1))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = max_requests // 10
+preload_app = os.environ.get('GUNICORN_PRELOAD', '') == '1'
+
+
+def when_ready(server):
+    if preload_app:
+        from apps.core.warmup import warm_up
+        loaded = warm_up()
+        server.log.info('Warm-up done before fork; preloaded lazy modules: %s', ', '.join(loaded) or 'none')
+
+
+def post_fork(server, worker):
+    if preload_app:
+        from apps.core.warmup import after_fork
+        after_fork()
@@ -1,7 +1,9 @@
 # booking_pro/settings.py
 import os
+from importlib.util import find_spec
 from pathlib import Path
 from datetime import timedelta
+from django.core.exceptions import ImproperlyConfigured
 from django.utils.translation import gettext_lazy as _
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -17,6 +19,7 @@ INSTALLED_APPS = [
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
+    'whitenoise.runserver_nostatic',  # runserver serves static like production
     'django.contrib.staticfiles',
     'django.contrib.humanize',
     
@@ -28,16 +31,21 @@ INSTALLED_APPS = [
     'import_export',
     
     # Local apps
+    'apps.core',
     'apps.accounts',
     'apps.businesses',
     'apps.bookings',
     'apps.crm',
     'apps.subscriptions',
     'apps.dashboard',
+    'apps.webhooks',
+    'apps.api',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',  # Static files, hashed + precompressed
+    'apps.core.middleware.QueryInstrumentationMiddleware',  # Query counts / Server-Timing
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',  # For translations
     'django.middleware.common.CommonMiddleware',
@@ -46,6 +54,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'apps.businesses.middleware.BusinessMiddleware',  # Custom middleware
+    'apps.core.middleware.ReplicaRoutingMiddleware',  # Read-only views -> replica
 ]
 
 ROOT_URLCONF = 'booking_pro.urls'
@@ -70,25 +79,128 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'booking_pro.wsgi.application'
 
-# # Database
-# DATABASES = {
-#     'default': {
-#         'ENGINE': 'django.db.backends.postgresql',
-#         'NAME': 'booking_pro_db',
-#         'USER': 'your_db_user',
-#         'PASSWORD': 'your_db_password',
-#         'HOST': 'localhost',
-#         'PORT': '5432',
-#     }
-# }
-
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# Database
+# DB_ENGINE selects the profile: "sqlite" (default) or "postgresql".
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite')
+
+# Persistent connections; health checks drop a stale connection before reuse
+DB_CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', 600))
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME', 'booking_pro_db'),
+            'USER': os.environ.get('DB_USER', 'your_db_user'),
+            'PASSWORD': os.environ.get('DB_PASSWORD', 'your_db_password'),
+            'HOST': os.environ.get('DB_HOST', 'localhost'),
+            'PORT': os.environ.get('DB_PORT', '5432'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+        }
     }
-}
+    
+    # Optional driver-side pool (requires psycopg 3 with the "pool" extra).
+    # Django manages pooled connections itself, so CONN_MAX_AGE must be 0.
+    if os.environ.get('DB_POOL'):
+        if find_spec('psycopg') is None or find_spec('psycopg_pool') is None:
+            raise ImproperlyConfigured('DB_POOL requires psycopg 3 with the pool extra: pip install "psycopg[binary,pool]"')
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+            'timeout': int(os.environ.get('DB_POOL_TIMEOUT', 10)),
+        }
+else:
+    # Run on every new connection: WAL lets dashboard readers proceed while a
+    # booking is being written, NORMAL sync is safe under WAL, and the
+    # mmap/cache sizes keep hot index pages in memory.
+    SQLITE_INIT_COMMAND = ';'.join([
+        'PRAGMA journal_mode=WAL',
+        'PRAGMA synchronous=NORMAL',
+        'PRAGMA busy_timeout=5000',
+        'PRAGMA temp_store=MEMORY',
+        'PRAGMA mmap_size=268435456',
+        'PRAGMA cache_size=-65536',
+    ])
+    
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DB_NAME', BASE_DIR / 'db.sqlite3'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'timeout': 20,
+                # Take the write lock at BEGIN so writers queue on busy_timeout
+                # instead of failing with "database is locked" on upgrade
+                'transaction_mode': 'IMMEDIATE',
+                'init_command': SQLITE_INIT_COMMAND,
+            },
+        }
+    }
+    
+    # DB_SQLITE_TUNING=0 reverts to SQLite defaults (for benchmark comparison)
+    if os.environ.get('DB_SQLITE_TUNING', '1') == '0':
+        DATABASES['default']['OPTIONS'] = {}
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+
+# Optional read replica for dashboards and reports (apps.core.db_router).
+# For local testing point DB_REPLICA_NAME at a second SQLite file and keep
+# it in sync with `manage.py sync_sqlite_replica --interval 2`.
+if os.environ.get('DB_REPLICA_NAME') or os.environ.get('DB_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.environ.get('DB_REPLICA_NAME', DATABASES['default']['NAME']),
+        'TEST': {'MIRROR': 'default'},
+    }
+    if os.environ.get('DB_REPLICA_HOST'):
+        DATABASES['replica']['HOST'] = os.environ['DB_REPLICA_HOST']
+        DATABASES['replica']['PORT'] = os.environ.get('DB_REPLICA_PORT', DATABASES['default'].get('PORT', ''))
+    DATABASE_ROUTERS = ['apps.core.db_router.ReplicaRouter']
+
+DATABASE_REPLICA_MAX_LAG = 5         # seconds of lag before falling back to primary
+DATABASE_REPLICA_CHECK_INTERVAL = 5  # seconds between lag checks
+DATABASE_REPLICA_PIN_SECONDS = 10    # read-your-writes window after a user's write
+
+# Finished bookings older than this move to the archive table (bookings.archive)
+BOOKING_ARCHIVE_AFTER_DAYS = 365
+BOOKING_ARCHIVE_BATCH_SIZE = 5000
+
+# Idempotency-Key handling for booking creation (apps.core.idempotency)
+IDEMPOTENCY_KEY_TTL = timedelta(hours=24)
+IDEMPOTENCY_WAIT_TIMEOUT = 10  # seconds a duplicate waits for the first response
+IDEMPOTENCY_LOCK_TIMEOUT = timedelta(seconds=60)  # unfinished claims older than this are taken over
+
+# Location search (apps.core.geo, businesses.search)
+GEO_SEARCH_MAX_RADIUS_KM = 50
+GEO_SEARCH_CACHE_TIMEOUT = 300          # seconds a geohash block's candidates stay cached
+GEO_SEARCH_CACHE_MAX_CANDIDATES = 20000  # larger blocks are not cached
 
+# Outbound webhooks (apps.webhooks), API-tier plans only
+WEBHOOK_MAX_ATTEMPTS = 8          # then the event is dead-lettered
+WEBHOOK_BACKOFF_BASE = 30         # seconds, doubled per attempt (with jitter)
+WEBHOOK_BATCH_SIZE = 50           # events per request to one endpoint
+WEBHOOK_WORKERS = 16              # concurrent requests per dispatcher
+WEBHOOK_TIMEOUT = 10
+
+# Shared cache; API rate limits are only exact across workers on Redis (apps.api.ratelimit)
+if os.environ.get('CACHE_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['CACHE_URL'],
+        }
+    }
+
+# Public API (apps.api); plans override rates with api_rate_per_minute / api_burst features
+API_DEFAULT_RATE_PER_MINUTE = 600
+API_DEFAULT_BURST = 100
+API_CLIENT_CACHE_TIMEOUT = 60     # seconds a key's plan/limits stay cached
+
+# Minutes a waitlist offer holds freed capacity before it is re-offered (bookings.waitlist)
+WAITLIST_HOLD_MINUTES = 30
 
 # Custom User Model
 AUTH_USER_MODEL = 'accounts.User'
@@ -121,6 +233,17 @@ STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# `manage.py build_assets` vendors CDN assets and compiles Tailwind; collectstatic
+# then writes hashed names with gzip/brotli copies. WhiteNoise serves hashed
+# files with a one-year immutable Cache-Control.
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'},
+}
+WHITENOISE_MAX_AGE = 0 if DEBUG else 3600  # files without a hash in the name
+WHITENOISE_USE_FINDERS = DEBUG
+WHITENOISE_AUTOREFRESH = DEBUG
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
@@ -145,6 +268,43 @@ JWT_REFRESH_TOKEN_LIFETIME = timedelta(days=7)
 CRISPY_ALLOWED_TEMPLATE_PACKS = "tailwind"
 CRISPY_TEMPLATE_PACK = "tailwind"
 
+# Query instrumentation (apps.core.middleware)
+QUERY_INSTRUMENTATION = {
+    'SAMPLE_RATE': 1.0 if DEBUG else 0.0,
+    'CAPTURE_STACKS': DEBUG,
+    'DUPLICATE_THRESHOLD': 3,
+    'SERVER_TIMING': True,
+    'ENFORCE_BUDGETS': False,
+}
+
 # Celery Configuration (for async tasks)
 CELERY_BROKER_URL = 'redis://localhost:6379/0'
-CELERY_RESULT_BACKEND = 'redis://localhost:6379/0'
\ No newline at end of file
+CELERY_RESULT_BACKEND = 'redis://localhost:6379/0'
+# Without a broker (local development), run tasks inline
+CELERY_TASK_ALWAYS_EAGER = os.environ.get('CELERY_TASK_ALWAYS_EAGER', '1' if DEBUG else '0') == '1'
+# Image work runs on its own queue: celery -A project worker -Q images --concurrency 2
+CELERY_TASK_ROUTES = {'apps.core.tasks.process_image_field': {'queue': 'images'}}
+# Recycle workers so Pillow's memory high-water mark never accumulates
+CELERY_WORKER_MAX_TASKS_PER_CHILD = 200
+CELERY_WORKER_MAX_MEMORY_PER_CHILD = 300_000  # KiB
+
+# Uploaded images (apps.core.images)
+IMAGE_VARIANT_WIDTHS = (160, 320, 640, 1280)
+IMAGE_MAX_UPLOAD_BYTES = 20 * 1024 * 1024
+IMAGE_MAX_PIXELS = 40_000_000
+
+# Booking -> CRM customer linking (apps.crm.linking)
+CRM_LINK_CACHE_TIMEOUT = 3600  # seconds a (business, email) -> customer lookup stays cached
+CRM_LINK_CHUNK_SIZE = 5000     # bookings per backfill chunk (one read + one bulk UPDATE)
+
+# Loyalty accrual (apps.crm.loyalty)
+LOYALTY_CHUNK_SIZE = 5000  # ledger entries / bookings per bulk write
+
+# Business timezones (apps.core.tz, businesses.timezones); bookings store local wall times
+BUSINESS_DEFAULT_TIMEZONE = 'UTC'       # for businesses without a configured zone
+BUSINESS_TIMEZONE_CACHE_TIMEOUT = 3600
+BOOKING_REMINDER_LEAD_HOURS = 24        # bookings.reminders
+
+# Modules imported in the gunicorn master before forking when GUNICORN_PRELOAD=1
+# (apps.core.warmup, project/gunicorn.conf.py); elsewhere they load on first use
+WARMUP_MODULES = ('numpy', 'pandas', 'plotly.graph_objects')
@@ -9,6 +9,10 @@ from apps.core.views import HomeView
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('i18n/', include('django.conf.urls.i18n')),
+    path('api/v1/', include('apps.api.urls', namespace='api_v1')),
+    path('api/', include('apps.dashboard.api_urls', namespace='dashboard_api')),
+    path('api/bookings/', include('apps.bookings.api_urls', namespace='bookings_api')),
+    path('api/businesses/', include('apps.businesses.api_urls', namespace='businesses_api')),
 ]
 
 urlpatterns += i18n_patterns(
@@ -22,6 +26,6 @@ urlpatterns += i18n_patterns(
     prefix_default_language=False,
 )
 
+# Static files are served by WhiteNoise; only uploads need this in development
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-    urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
\ No newline at end of file
@@ -75,6 +75,8 @@ class Subscription(models.Model):
         ('CANCELLED', _('Cancelled')),
         ('EXPIRED', _('Expired')),
     ]
+    # Statuses in which the plan's features are available, until end_date
+    ACTIVE_STATUSES = ('TRIAL', 'ACTIVE')
     
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     business = models.OneToOneField('businesses.Business', on_delete=models.CASCADE, related_name='subscription')
@@ -121,7 +123,15 @@ class Subscription(models.Model):
         super().save(*args, **kwargs)
     
     def is_active(self):
-        return self.status in ['TRIAL', 'ACTIVE'] and self.end_date > timezone.now()
+        return self.status in self.ACTIVE_STATUSES and self.end_date > timezone.now()
+    
+    @classmethod
+    def active_lookups(cls, prefix='', now=None):
+        # Filter kwargs for what is_active() accepts, optionally across a relation
+        return {
+            f'{prefix}status__in': cls.ACTIVE_STATUSES,
+            f'{prefix}end_date__gt': now or timezone.now(),
+        }
     
     def can_add_booking(self):
         if self.plan.max_bookings_per_month == -1:  # Unlimited
@@ -0,0 +1,211 @@
+# apps/webhooks/dispatcher.py
+import hashlib
+import hmac
+import http.client
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import WebhookEvent
+
+MAX_ATTEMPTS = getattr(settings, 'WEBHOOK_MAX_ATTEMPTS', 8)
+BACKOFF_BASE = getattr(settings, 'WEBHOOK_BACKOFF_BASE', 30)  # seconds; doubles per attempt
+BACKOFF_MAX = getattr(settings, 'WEBHOOK_BACKOFF_MAX', 6 * 3600)
+BATCH_SIZE = getattr(settings, 'WEBHOOK_BATCH_SIZE', 50)  # events per request
+WORKERS = getattr(settings, 'WEBHOOK_WORKERS', 16)
+TIMEOUT = getattr(settings, 'WEBHOOK_TIMEOUT', 10)
+
+# Claimed events are hidden from other dispatchers for this long
+LEASE = timedelta(seconds=getattr(settings, 'WEBHOOK_LEASE_SECONDS', 120))
+
+SIGNATURE_HEADER = 'X-Webhook-Signature'
+USER_AGENT = 'BookingPro-Webhooks/1.0'
+
+
+def sign(secret, timestamp, body):
+    """``t=<unix time>,v1=<hex HMAC-SHA256 of "<t>.<body>">``, Stripe style."""
+    digest = hmac.new(secret.encode(), f'{timestamp}.'.encode() + body, hashlib.sha256).hexdigest()
+    return f't={timestamp},v1={digest}'
+
+
+def verify(secret, header, body, tolerance=300):
+    try:
+        parts = dict(item.split('=', 1) for item in header.split(','))
+        timestamp = int(parts['t'])
+    except (KeyError, ValueError):
+        return False
+    if abs(time.time() - timestamp) > tolerance:
+        return False
+    return hmac.compare_digest(sign(secret, timestamp, body), header)
+
+
+def backoff(attempts):
+    # Exponential with full jitter, so a recovering endpoint isn't stampeded
+    return timedelta(seconds=random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempts)))
+
+
+class ConnectionPool:
+    """One keep-alive connection per (thread, origin), reused across batches."""
+    
+    def __init__(self, timeout=TIMEOUT):
+        self.timeout = timeout
+        self.local = threading.local()
+    
+    def _connection(self, parts):
+        connections = self.local.__dict__.setdefault('connections', {})
+        key = (parts.scheme, parts.netloc)
+        if key not in connections:
+            factory = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+            connections[key] = factory(parts.netloc, timeout=self.timeout)
+        return key, connections
+    
+    def post(self, url, body, headers):
+        parts = urlsplit(url)
+        path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        key, connections = self._connection(parts)
+        for retry in (True, False):
+            connection = connections[key]
+            try:
+                connection.request('POST', path, body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                if response.will_close:
+                    connection.close()
+                return response.status
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                # The server dropped an idle keep-alive connection; reconnect once
+                connection.close()
+                if not retry:
+                    raise
+
+
+def claim_due(limit, now=None):
+    """
+    Lease up to ``limit`` due events, oldest first. ``skip_locked`` lets
+    several dispatchers run side by side without handing out the same
+    event twice.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        events = list(
+            WebhookEvent.objects.select_for_update(skip_locked=True, of=('self',))
+            .filter(status='PENDING', next_attempt_at__lte=now)
+            .select_related('endpoint')
+            .order_by('id')[:limit]
+        )
+        if events:
+            WebhookEvent.objects.filter(pk__in=[event.pk for event in events]).update(
+                next_attempt_at=now + LEASE
+            )
+    return events
+
+
+def _batches(events, batch_size):
+    by_endpoint = defaultdict(list)
+    for event in events:
+        by_endpoint[event.endpoint_id].append(event)
+    for endpoint_events in by_endpoint.values():
+        for start in range(0, len(endpoint_events), batch_size):
+            yield endpoint_events[start:start + batch_size]
+
+
+def deliver_batch(pool, batch):
+    """POST one endpoint's batch; returns ``(status_code, error)``. No DB access."""
+    endpoint = batch[0].endpoint
+    body = json.dumps({'events': [event.payload for event in batch]}, separators=(',', ':')).encode()
+    headers = {
+        'Content-Type': 'application/json',
+        'User-Agent': USER_AGENT,
+        SIGNATURE_HEADER: sign(endpoint.secret, int(time.time()), body),
+    }
+    try:
+        status = pool.post(endpoint.url, body, headers)
+    except (OSError, http.client.HTTPException) as exc:
+        return None, f'{type(exc).__name__}: {exc}'
+    if 200 <= status < 300:
+        return status, ''
+    return status, f'HTTP {status}'
+
+
+def record_results(results, now=None):
+    """Write delivery outcomes with one UPDATE per outcome, not per event."""
+    now = now or timezone.now()
+    delivered = [event.pk for batch, (_, error) in results if not error for event in batch]
+    if delivered:
+        WebhookEvent.objects.filter(pk__in=delivered).update(
+            status='DELIVERED', delivered_at=now, attempts=F('attempts') + 1, last_error=''
+        )
+    
+    dead = 0
+    for batch, (status, error) in results:
+        if not error:
+            continue
+        attempts = max(event.attempts for event in batch) + 1
+        values = {'attempts': F('attempts') + 1, 'last_status_code': status, 'last_error': error[:1000]}
+        if attempts >= MAX_ATTEMPTS:
+            values['status'] = 'DEAD'
+            dead += len(batch)
+        else:
+            values['next_attempt_at'] = now + backoff(attempts)
+        WebhookEvent.objects.filter(pk__in=[event.pk for event in batch]).update(**values)
+    return len(delivered), dead
+
+
+def dispatch_once(limit=1000, workers=WORKERS, batch_size=BATCH_SIZE, pool=None, executor=None):
+    """
+    Claim due events, deliver them in per-endpoint batches over a bounded
+    thread pool, and record the outcomes. Returns
+    ``{'claimed', 'requests', 'delivered', 'failed', 'dead'}``.
+    """
+    events = claim_due(limit)
+    if not events:
+        return {'claimed': 0, 'requests': 0, 'delivered': 0, 'failed': 0, 'dead': 0}
+    
+    pool = pool or ConnectionPool()
+    batches = list(_batches(events, batch_size))
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            outcomes = list(executor.map(lambda batch: deliver_batch(pool, batch), batches))
+    else:
+        outcomes = list(executor.map(lambda batch: deliver_batch(pool, batch), batches))
+    
+    results = list(zip(batches, outcomes))
+    delivered, dead = record_results(results)
+    return {
+        'claimed': len(events),
+        'requests': len(batches),
+        'delivered': delivered,
+        'failed': len(events) - delivered,
+        'dead': dead,
+    }
+
+
+def requeue_dead(endpoint=None):
+    """Give dead-lettered events a fresh set of attempts, e.g. after an endpoint is fixed."""
+    events = WebhookEvent.objects.filter(status='DEAD')
+    if endpoint is not None:
+        events = events.filter(endpoint=endpoint)
+    return events.update(status='PENDING', attempts=0, next_attempt_at=timezone.now())
+
+
+def run_dispatcher(poll_interval=1.0, limit=1000, workers=WORKERS, stop=None, log=None):
+    """Dispatch until ``stop()`` is true; sleeps only when the outbox is idle."""
+    log = log or (lambda message: None)
+    pool = ConnectionPool()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while not (stop and stop()):
+            counts = dispatch_once(limit=limit, pool=pool, executor=executor)
+            if counts['claimed']:
+                log(counts)
+            else:
+                time.sleep(poll_interval)
@@ -0,0 +1,131 @@
+# apps/webhooks/management/commands/benchmark_webhooks.py
+import random
+import threading
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.bookings.models import Booking
+from apps.webhooks.dispatcher import SIGNATURE_HEADER, WORKERS, dispatch_once, verify
+from apps.webhooks.models import WebhookEndpoint, WebhookEvent
+
+
+class Rollback(Exception):
+    pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Local webhook receiver: verifies signatures, fails a share of requests."""
+    
+    daemon_threads = True
+    
+    def __init__(self, secrets, failure_rate, latency):
+        super().__init__(('127.0.0.1', 0), StandInHandler)
+        self.secrets, self.failure_rate, self.latency = secrets, failure_rate, latency
+        self.lock = threading.Lock()
+        self.counts = {'requests': 0, 'events': 0, 'bad_signatures': 0, 'failed': 0}
+    
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, like a real receiver
+    
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        server = self.server
+        secret = server.secrets.get(self.path.strip('/'))
+        if server.latency:
+            time.sleep(server.latency)
+        
+        if not secret or not verify(secret, self.headers.get(SIGNATURE_HEADER, ''), body):
+            outcome, status = 'bad_signatures', 400
+        elif random.random() < server.failure_rate:
+            outcome, status = 'failed', 503
+        else:
+            outcome, status = 'events', 200
+        with server.lock:
+            server.counts['requests'] += 1
+            server.counts[outcome] += body.count(b'"type"') if outcome == 'events' else 1
+        
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+    
+    def log_message(self, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = 'Deliver generated outbox events to a local stand-in server and report deliveries/second (rolled back)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=20000)
+        parser.add_argument('--endpoints', type=int, default=20)
+        parser.add_argument('--workers', type=int, default=WORKERS)
+        parser.add_argument('--failure-rate', type=float, default=0.05)
+        parser.add_argument('--latency', type=float, default=0.02, help='Seconds per request at the receiver')
+    
+    def handle(self, *args, **options):
+        business_id = Booking.objects.values_list('business_id', flat=True).first()
+        if business_id is None:
+            raise CommandError('No bookings found; generate data first.')
+        
+        server = StandInServer({}, options['failure_rate'], options['latency'])
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            with transaction.atomic():
+                result = self.run(server, business_id, options)
+                raise Rollback
+        except Rollback:
+            pass
+        finally:
+            server.shutdown()
+        
+        self.stdout.write(f"events:              {options['events']} to {options['endpoints']} endpoints")
+        self.stdout.write(f"delivered:           {result['delivered']} in {result['seconds']:.2f}s "
+                          f"({result['delivered'] / result['seconds']:,.0f}/s)")
+        self.stdout.write(f"requests:            {server.counts['requests']} "
+                          f"({server.counts['failed']} failed by the stand-in)")
+        self.stdout.write(f"retried:             {result['retried']}")
+        self.stdout.write(f"bad signatures:      {server.counts['bad_signatures']}")
+    
+    def run(self, server, business_id, options):
+        endpoints = WebhookEndpoint.objects.bulk_create([
+            WebhookEndpoint(business_id=business_id, url='') for _ in range(options['endpoints'])
+        ])
+        for endpoint in endpoints:
+            endpoint.url = f'{server.url}/{endpoint.pk}'
+            server.secrets[str(endpoint.pk)] = endpoint.secret
+        WebhookEndpoint.objects.bulk_update(endpoints, ['url'])
+        
+        now = timezone.now()
+        WebhookEvent.objects.bulk_create([
+            WebhookEvent(
+                endpoint=endpoints[n % len(endpoints)],
+                event_type='booking.created',
+                payload={'id': str(n), 'type': 'booking.created', 'created': now.isoformat(),
+                         'data': {'booking': {'id': str(n)}}},
+                next_attempt_at=now,
+            )
+            for n in range(options['events'])
+        ], batch_size=2000)
+        
+        delivered = retried = 0
+        started = time.perf_counter()
+        while True:
+            counts = dispatch_once(workers=options['workers'])
+            delivered += counts['delivered']
+            retried += counts['failed']
+            if not counts['claimed']:
+                # Pull retries forward instead of waiting out the backoff
+                retry_now = timezone.now() - timedelta(seconds=1)
+                if not WebhookEvent.objects.filter(status='PENDING').update(next_attempt_at=retry_now):
+                    break
+        return {'delivered': delivered, 'retried': retried, 'seconds': time.perf_counter() - started}
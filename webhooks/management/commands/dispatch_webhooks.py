@@ -0,0 +1,35 @@
+# apps/webhooks/management/commands/dispatch_webhooks.py
+from django.core.management.base import BaseCommand
+
+from apps.webhooks.dispatcher import WORKERS, dispatch_once, requeue_dead, run_dispatcher
+
+
+class Command(BaseCommand):
+    help = 'Deliver pending webhook events from the outbox (runs until stopped unless --once)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Dispatch one round and exit')
+        parser.add_argument('--limit', type=int, default=1000, help='Events claimed per round')
+        parser.add_argument('--workers', type=int, default=WORKERS)
+        parser.add_argument('--poll-interval', type=float, default=1.0)
+        parser.add_argument('--requeue-dead', action='store_true',
+                            help='Move dead-lettered events back to pending first')
+    
+    def handle(self, *args, **options):
+        if options['requeue_dead']:
+            self.stdout.write(f'{requeue_dead()} dead events requeued.')
+        
+        if options['once']:
+            counts = dispatch_once(limit=options['limit'], workers=options['workers'])
+            self.stdout.write(str(counts))
+            return
+        
+        try:
+            run_dispatcher(
+                poll_interval=options['poll_interval'],
+                limit=options['limit'],
+                workers=options['workers'],
+                log=lambda counts: self.stdout.write(str(counts)),
+            )
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,81 @@
+# apps/webhooks/models.py
+import secrets
+import uuid
+
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+def generate_secret():
+    return secrets.token_hex(32)
+
+
+class WebhookEndpoint(models.Model):
+    EVENT_TYPES = [
+        ('booking.created', _('Booking created')),
+        ('booking.confirmed', _('Booking confirmed')),
+        ('booking.cancelled', _('Booking cancelled')),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    business = models.ForeignKey('businesses.Business', on_delete=models.CASCADE, related_name='webhook_endpoints')
+    
+    url = models.URLField(_('URL'), max_length=500)
+    secret = models.CharField(max_length=64, default=generate_secret)
+    events = models.JSONField(default=list, blank=True)  # empty = every event type
+    is_active = models.BooleanField(default=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = _('Webhook Endpoint')
+        verbose_name_plural = _('Webhook Endpoints')
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['business', 'is_active']),
+        ]
+    
+    def __str__(self):
+        return self.url
+    
+    def wants(self, event_type):
+        return not self.events or event_type in self.events
+
+
+class WebhookEvent(models.Model):
+    # Outbox row: one event for one endpoint, written in the booking transaction
+    STATUS_CHOICES = [
+        ('PENDING', _('Pending')),
+        ('DELIVERED', _('Delivered')),
+        ('DEAD', _('Dead')),
+    ]
+    
+    id = models.BigAutoField(primary_key=True)
+    event_id = models.UUIDField(default=uuid.uuid4, editable=False)  # shared by every endpoint's copy
+    endpoint = models.ForeignKey(WebhookEndpoint, on_delete=models.CASCADE, related_name='outbox')
+    
+    event_type = models.CharField(max_length=50)
+    payload = models.JSONField()
+    
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        verbose_name = _('Webhook Event')
+        verbose_name_plural = _('Webhook Events')
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+            models.Index(fields=['endpoint', 'status']),
+        ]
+    
+    def __str__(self):
+        return f"{self.event_type} -> {self.endpoint_id} ({self.status})"
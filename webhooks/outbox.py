@@ -0,0 +1,107 @@
+# apps/webhooks/outbox.py
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.subscriptions.models import Subscription
+
+from .models import WebhookEndpoint, WebhookEvent
+
+ENDPOINT_CACHE_TIMEOUT = getattr(settings, 'WEBHOOK_ENDPOINT_CACHE_TIMEOUT', 60)
+
+
+def _cache_key(business_id):
+    return f'webhooks:endpoints:{business_id}'
+
+
+def invalidate_endpoints(business_id):
+    cache.delete(_cache_key(business_id))
+
+
+def active_endpoints(business_ids):
+    """
+    ``{business_id: [(endpoint_id, events), ...]}`` for businesses whose plan
+    has API access. Cached per business, so booking writes for businesses
+    without webhooks cost a cache read, not a query.
+    """
+    business_ids = set(business_ids)
+    keys = {_cache_key(business_id): business_id for business_id in business_ids}
+    found = {keys[key]: value for key, value in cache.get_many(list(keys)).items()}
+    
+    missing = business_ids - found.keys()
+    if missing:
+        loaded = {business_id: [] for business_id in missing}
+        rows = WebhookEndpoint.objects.filter(
+            business_id__in=missing,
+            is_active=True,
+            business__subscription__plan__has_api_access=True,
+            **Subscription.active_lookups('business__subscription__'),
+        ).values_list('business_id', 'pk', 'events')
+        for business_id, endpoint_id, events in rows:
+            loaded[business_id].append((endpoint_id, events))
+        cache.set_many({_cache_key(business_id): value for business_id, value in loaded.items()},
+                       ENDPOINT_CACHE_TIMEOUT)
+        found.update(loaded)
+    return found
+
+
+def record_events(events):
+    """
+    Append ``(business_id, event_type, data)`` events to the outbox, one
+    row per subscribed endpoint, with a single INSERT. Call inside the
+    transaction that made the change so the event commits (or rolls
+    back) with it; delivery happens later in the dispatcher.
+    """
+    events = list(events)
+    if not events:
+        return 0
+    endpoints = active_endpoints(business_id for business_id, _, _ in events)
+    
+    now = timezone.now()
+    rows = []
+    for business_id, event_type, data in events:
+        subscribed = [endpoint_id for endpoint_id, types in endpoints.get(business_id, ())
+                      if not types or event_type in types]
+        if not subscribed:
+            continue
+        event_id = uuid.uuid4()
+        payload = {'id': str(event_id), 'type': event_type, 'created': now.isoformat(), 'data': data}
+        rows.extend(
+            WebhookEvent(event_id=event_id, endpoint_id=endpoint_id, event_type=event_type,
+                         payload=payload, next_attempt_at=now)
+            for endpoint_id in subscribed
+        )
+    WebhookEvent.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def booking_data(booking):
+    return {
+        'id': str(booking.pk),
+        'booking_number': booking.booking_number,
+        'business': str(booking.business_id),
+        'service': str(booking.service_id),
+        'date': booking.date.isoformat(),
+        'start_time': booking.start_time.isoformat(timespec='minutes'),
+        'end_time': booking.end_time.isoformat(timespec='minutes'),
+        'status': booking.status,
+        'total_amount': str(booking.total_amount),
+    }
+
+
+def row_data(row, status):
+    # From a bookings_transitioned / bookings_created row, without a query
+    booking_id, business_id, service_id, _, date, previous_status = row
+    data = {
+        'id': str(booking_id),
+        'business': str(business_id),
+        'service': str(service_id),
+        'date': date.isoformat(),
+        'status': status,
+    }
+    if previous_status != status:
+        data['previous_status'] = previous_status
+    return data
+
@@ -0,0 +1,37 @@
+# apps/webhooks/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.bookings.events import bookings_created, bookings_transitioned
+from apps.bookings.models import Booking
+from .models import WebhookEndpoint
+from .outbox import booking_data, invalidate_endpoints, record_events, row_data
+
+TRANSITION_EVENTS = {
+    'CONFIRMED': 'booking.confirmed',
+    'CANCELLED': 'booking.cancelled',
+}
+
+
+@receiver(post_save, sender=Booking)
+def record_created_event(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        record_events([(instance.business_id, 'booking.created', {'booking': booking_data(instance)})])
+
+
+@receiver(bookings_created, sender=Booking)
+def record_bulk_created_events(sender, rows, **kwargs):
+    record_events((row[1], 'booking.created', {'booking': row_data(row, row[5])}) for row in rows)
+
+
+@receiver(bookings_transitioned, sender=Booking)
+def record_transition_events(sender, rows, status, **kwargs):
+    event_type = TRANSITION_EVENTS.get(status)
+    if event_type:
+        record_events((row[1], event_type, {'booking': row_data(row, status)}) for row in rows)
+
+
+@receiver(post_save, sender=WebhookEndpoint)
+@receiver(post_delete, sender=WebhookEndpoint)
+def invalidate_endpoint_cache(sender, instance, **kwargs):
+    invalidate_endpoints(instance.business_id)